@@ -1,16 +1,22 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from pydantic import BaseModel, EmailStr
-from passlib.context import CryptContext
 from dotenv import load_dotenv
 import os
+import time
 
 from ..domain.user import Learner
-from ..storage import _learners 
+from ..events import LearnerRegistered, events
+from ..hashing import hasher
+from ..login_throttle import login_throttle
+from ..metrics import metrics
+from ..token_cache import token_cache
+from ..repository import store
+from ..repository.base import DuplicateKeyError
 
 load_dotenv()
 
@@ -18,8 +24,6 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-super-secret-key-change-this-in-produ
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 security = HTTPBearer()
 
 
@@ -69,12 +73,12 @@ class LoginResponse(BaseModel):
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-def verify_password(plain_password: str, password_hash: str) -> bool:
-    return pwd_context.verify(plain_password, password_hash)
+async def verify_password(plain_password: str, password_hash: str) -> bool:
+    return await hasher.verify(plain_password, password_hash)
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    return await hasher.hash(password)
 
 
 def create_access_token(
@@ -96,21 +100,30 @@ def create_access_token(
     return encoded_jwt
 
 
-def authenticate_learner(email: str, password: str) -> Optional[Learner]:
-    for learner in _learners.values():
-        if learner.email == email:
-            if verify_password(password, learner.password_hash):
-                return learner
+async def authenticate_learner(email: str, password: str) -> Optional[Learner]:
+    learner = await store.learners.aget_by("email", email)
+    if learner and await verify_password(password, learner.password_hash):
+        return learner
     return None
 
 
+def check_login_throttle(request: Request, email: str) -> None:
+    retry_after = login_throttle.attempt(email, request.client.host if request.client else None)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 @router.post("/register", response_model=LearnerRegisterResponse)
-def register_learner(learner_data: LearnerRegister):
-    for learner in _learners.values():
-        if learner.email == learner_data.email:
-            raise HTTPException(status_code=400, detail="Email already registered")
+async def register_learner(learner_data: LearnerRegister, request: Request):
+    check_login_throttle(request, learner_data.email)
+    if await store.learners.aget_by("email", learner_data.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
     
-    password_hash = get_password_hash(learner_data.password)
+    password_hash = await get_password_hash(learner_data.password)
     
     new_learner = Learner(
         name=learner_data.name,
@@ -118,7 +131,13 @@ def register_learner(learner_data: LearnerRegister):
         password_hash=password_hash
     )
     
-    _learners[new_learner.learner_id] = new_learner
+    try:
+        inserted = await store.learners.ainsert_if_absent(new_learner)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    if not inserted:
+        raise HTTPException(status_code=400, detail="Learner already exists")
+    await events.publish(LearnerRegistered(new_learner.learner_id))
     
     return {
         "learner_id": new_learner.learner_id,
@@ -129,8 +148,9 @@ def register_learner(learner_data: LearnerRegister):
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(login_data: LearnerLogin):
-    learner = authenticate_learner(login_data.email, login_data.password)
+async def login(login_data: LearnerLogin, request: Request):
+    check_login_throttle(request, login_data.email)
+    learner = await authenticate_learner(login_data.email, login_data.password)
     if not learner:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -159,9 +179,19 @@ async def get_current_learner(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    token = credentials.credentials
+    learner_id = token_cache.get(token)
+    if learner_id is not None:
+        learner = await store.learners.aget(learner_id)
+        if learner is None:
+            token_cache.invalidate_learner(learner_id)
+            raise credentials_exception
+        return learner
+
+    start = time.perf_counter()
     try:
         payload = jwt.decode(
-            credentials.credentials, 
+            token, 
             SECRET_KEY, 
             algorithms=[ALGORITHM]
         )
@@ -175,11 +205,14 @@ async def get_current_learner(
         
     except JWTError:
         raise credentials_exception
+    finally:
+        metrics.observe_jwt_decode(time.perf_counter() - start)
 
-    learner = _learners.get(token_data.learner_id)
+    learner = await store.learners.aget(token_data.learner_id)
     if learner is None:
         raise credentials_exception
 
+    token_cache.put(token, learner.learner_id, payload.get("exp", float("inf")))
     return learner
 
 
@@ -0,0 +1,153 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from ..repository.base import Repository
+
+MAX_BATCH_SIZE = 50_000
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class BatchItemError(BaseModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class BatchResult(BaseModel):
+    inserted: int
+    errors: List[BatchItemError] = []
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def _item_error(index: int, error: ValidationError) -> BatchItemError:
+    return BatchItemError(
+        index=index,
+        errors=error.errors(include_url=False, include_context=False, include_input=False),
+    )
+
+
+def parse_batch(
+    body: bytes, content_type: str, model: type
+) -> Tuple[List[Optional[BaseModel]], List[BatchItemError]]:
+    """Validate a JSON array or NDJSON body into ``model`` instances.
+
+    The whole body is first validated in a single pydantic-core pass. Only
+    if that fails is it re-validated item by item, so the caller learns
+    which entries are bad. Invalid positions are ``None`` in the result.
+    """
+    ndjson = content_type.split(";")[0].strip() in NDJSON_TYPES
+    lines = [line for line in body.splitlines() if line.strip()] if ndjson else None
+    payload = b"[" + b",".join(lines) + b"]" if ndjson else body
+
+    try:
+        items = _list_adapter(model).validate_json(payload)
+    except ValidationError:
+        pass
+    else:
+        if len(items) > MAX_BATCH_SIZE:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_SIZE} items")
+        return items, []
+
+    if ndjson:
+        raw_items = lines
+        validate = model.model_validate_json
+    else:
+        try:
+            raw_items = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body is not valid JSON")
+        if not isinstance(raw_items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array")
+        validate = model.model_validate
+    if len(raw_items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_SIZE} items")
+
+    items: List[Optional[BaseModel]] = []
+    errors: List[BatchItemError] = []
+    for index, raw in enumerate(raw_items):
+        try:
+            items.append(validate(raw))
+        except ValidationError as error:
+            items.append(None)
+            errors.append(_item_error(index, error))
+    return items, errors
+
+
+def _duplicate(index: int, repository: Repository) -> BatchItemError:
+    return BatchItemError(
+        index=index,
+        errors=[{"type": "duplicate", "loc": [repository.key_field], "msg": "Already exists"}],
+    )
+
+
+def _rejected(errors: List[BatchItemError]) -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=BatchResult(inserted=0, errors=errors).model_dump(),
+    )
+
+
+def ingest_batch(
+    repository: Repository,
+    body: bytes,
+    content_type: str,
+    atomic: bool,
+    insert_many: Optional[Callable[[Sequence[Any], bool], List[int]]] = None,
+) -> BatchResult:
+    """Validate and store a batch in one insert-only repository write.
+
+    With ``atomic`` nothing is stored unless every item is valid and new;
+    otherwise the valid items are stored and the rest reported by index.
+    Keys taken by another writer after the duplicate check are reported
+    the same way, never overwritten. ``insert_many`` replaces
+    ``repository.insert_many_if_absent`` for callers that keep derived
+    state in step with the write.
+    """
+    items, errors = parse_batch(body, content_type, repository.model)
+
+    seen = set()
+    accepted = []
+    for index, item in enumerate(items):
+        if item is None:
+            continue
+        key = repository.key_of(item)
+        if key in seen or key in repository:
+            errors.append(_duplicate(index, repository))
+            continue
+        seen.add(key)
+        accepted.append((index, item))
+
+    errors.sort(key=lambda e: e.index)
+    if atomic and errors:
+        raise _rejected(errors)
+    taken = (insert_many or repository.insert_many_if_absent)(
+        [item for _, item in accepted], atomic
+    )
+    if taken:
+        errors.extend(_duplicate(accepted[position][0], repository) for position in taken)
+        errors.sort(key=lambda e: e.index)
+        if atomic:
+            raise _rejected(errors)
+    return BatchResult(inserted=len(accepted) - len(taken), errors=errors)
+
+
+async def ingest_request(
+    repository: Repository,
+    request: Request,
+    atomic: bool,
+    insert_many: Optional[Callable[[Sequence[Any], bool], List[int]]] = None,
+) -> BatchResult:
+    """Read the request body and ingest it off the event loop."""
+    body = await request.body()
+    content_type = request.headers.get("content-type", "application/json")
+    return await run_in_threadpool(
+        ingest_batch, repository, body, content_type, atomic, insert_many
+    )
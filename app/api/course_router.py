@@ -1,13 +1,28 @@
-from typing import Dict, List
 from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
+from ..catalog import catalog
 from ..domain.course import Course
+from ..domain.enrollment import Enrollment, EnrollmentStatus
 from ..domain.user import Learner
-from ..storage import _courses, _enrollments, _instructors
+from ..events import EnrollmentCreated, events
+from ..learning_records import learning_records
+from ..ratings import ratings
+from ..repository import store
+from ..search import search_index
+from ..selection import parse_selection
 from .auth_router import get_current_learner   
+from .conditional import json_response
+from .pagination import PageParams, paginate, set_next_cursor
+
+
+# Cancelled enrollments drop off /my-courses, as they do off the learning record.
+LISTED_STATUSES = tuple(s for s in EnrollmentStatus if s != EnrollmentStatus.CANCELLED)
 
 
 class CourseListResponse(BaseModel):
@@ -19,6 +34,24 @@ class CourseListResponse(BaseModel):
     total_modules: int
     total_lessons: int
     total_topics: int
+    total_duration_minutes: int = 0
+    rating_count: Optional[int] = None
+    average_rating: Optional[float] = None
+
+
+class CourseSearchResult(CourseListResponse):
+    score: float
+
+
+class CategoryRatings(BaseModel):
+    count: int
+    average: Optional[float]
+    histogram: Dict[str, int]
+
+
+class CourseRatingsResponse(CategoryRatings):
+    course_id: str
+    categories: Dict[str, CategoryRatings]
 
 
 class EnrollResponse(BaseModel):
@@ -39,96 +72,170 @@ class EnrolledCourseResponse(BaseModel):
     total_modules: int
     total_lessons: int
     total_topics: int
+    total_duration_minutes: int = 0
 
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
 
 @router.get("/", response_model=List[CourseListResponse])
-def list_courses(
+async def list_courses(
+    request: Request,
+    instructor_id: Optional[str] = None,
+    include_ratings: bool = False,
+    page: PageParams = Depends(),
     current_learner: Learner = Depends(get_current_learner)
-) -> List[CourseListResponse]:
-    courses = []
-    for course in _courses.values():
-        instructor = _instructors.get(course.instructor_id, {})
-        courses.append(
-            CourseListResponse(
-                course_id=course.course_id,
-                title=course.title,
-                description=course.description,
-                instructor_id=course.instructor_id,
-                instructor_name=instructor.get("name", "Unknown"),
-                total_modules=len(course.modules),
-                total_lessons=sum(len(m.lessons) for m in course.modules),
-                total_topics=sum(len(l.topics) for m in course.modules for l in m.lessons)
-            )
-        )
-    return courses
+) -> Response:
+    # Ratings may wait on the ratings index lock, so they never run inline.
+    run = run_in_threadpool if include_ratings else store.courses.run_read
+    listing = await run(
+        catalog.listing_json, page.limit, page.after, instructor_id, include_ratings
+    )
+    response = json_response(request, listing.body, listing.etag)
+    set_next_cursor(response, listing.last)
+    return response
 
 @router.get("/my-courses", response_model=List[EnrolledCourseResponse])
-def get_my_courses(
+async def get_my_courses(
+    response: Response,
+    page: PageParams = Depends(),
     current_learner: Learner = Depends(get_current_learner)
 ) -> List[EnrolledCourseResponse]:
+    enrollments = await paginate(
+        store.enrollments, page, response,
+        learner_id=current_learner.learner_id, status=LISTED_STATUSES,
+    )
+    # One hop for the whole page rather than one per course lookup.
+    return await store.courses.run_read(_enrolled_courses, enrollments)
+
+
+def _enrolled_courses(enrollments: List[Enrollment]) -> List[EnrolledCourseResponse]:
     my_courses = []
-    
-    for enrollment in _enrollments.values():
-        if enrollment.get("learner_id") == current_learner.learner_id:
-            course_id = enrollment.get("course_id")
-            course = _courses.get(course_id)
-            if course:
-                instructor = _instructors.get(course.instructor_id, {})
-                my_courses.append(
-                    EnrolledCourseResponse(
-                        enrollment_id=enrollment.get("enrollment_id"),
-                        course_id=course.course_id,
-                        title=course.title,
-                        description=course.description,
-                        instructor_id=course.instructor_id,
-                        instructor_name=instructor.get("name", "Unknown"),
-                        enrolled_at=enrollment.get("enrolled_at"),
-                        total_modules=len(course.modules),
-                        total_lessons=sum(len(m.lessons) for m in course.modules),
-                        total_topics=sum(len(l.topics) for m in course.modules for l in m.lessons)
-                    )
+    for enrollment in enrollments:
+        course = store.courses.get(enrollment.course_id)
+        if course:
+            my_courses.append(
+                EnrolledCourseResponse(
+                    enrollment_id=enrollment.enrollment_id,
+                    enrolled_at=str(enrollment.enrollment_date),
+                    **catalog.summary(course)
                 )
-    
+            )
     return my_courses
 
 
+@router.get("/search", response_model=List[CourseSearchResult])
+async def search_courses(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    current_learner: Learner = Depends(get_current_learner)
+) -> List[CourseSearchResult]:
+    return await run_in_threadpool(_search, q, limit)
+
+
+def _search(q: str, limit: int) -> List[CourseSearchResult]:
+    results = []
+    for course_id, score in search_index.search(q, limit):
+        course = store.courses.get(course_id)
+        if course:
+            results.append(CourseSearchResult(score=score, **catalog.summary(course)))
+    return results
+
+
 @router.get("/{course_id}", response_model=Course)
-def get_course_detail(
+async def get_course_detail(
     course_id: str,
+    request: Request,
+    fields: Optional[str] = Query(None, description="e.g. title,detail,modules.title"),
+    expand: Optional[str] = Query(None, description="modules, modules.lessons or modules.lessons.topics"),
     current_learner: Learner = Depends(get_current_learner)
-) -> Course:
-    course = _courses.get(course_id)
+) -> Response:
+    try:
+        selection = parse_selection(fields, expand)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    course = await store.courses.aget(course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course
+    if selection is None:
+        body, etag = await store.courses.run_read(catalog.detail_json, course)
+    else:
+        body, etag = await store.courses.run_read(catalog.selection_json, course, selection)
+    return json_response(request, body, etag)
+
+
+@router.get("/{course_id}/ratings", response_model=CourseRatingsResponse)
+async def get_course_ratings(
+    course_id: str,
+    current_learner: Learner = Depends(get_current_learner)
+) -> CourseRatingsResponse:
+    if not await store.courses.acontains(course_id):
+        raise HTTPException(status_code=404, detail="Course not found")
+    aggregate = await run_in_threadpool(ratings.get, course_id)
+    return CourseRatingsResponse(course_id=course_id, **aggregate.as_dict())
 
 
 @router.post("/{course_id}/enroll", response_model=EnrollResponse)
-def enroll_course(
+async def enroll_course(
     course_id: str,
     current_learner: Learner = Depends(get_current_learner)
 ) -> EnrollResponse:
-    course = _courses.get(course_id)
+    course = await store.courses.aget(course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
-    enrollment_id = f"{current_learner.learner_id}-{course_id}"
-    if enrollment_id in _enrollments:
+    enrollment = await store.enrollments.run_write(
+        _enroll, current_learner.learner_id, course_id
+    )
+    if enrollment is None:
         raise HTTPException(status_code=400, detail="Already enrolled in this course")
-    
-    _enrollments[enrollment_id] = {
-        "enrollment_id": enrollment_id,
-        "learner_id": current_learner.learner_id,
-        "course_id": course_id,
-        "enrolled_at": str(datetime.now(timezone.utc))
-    }
+    await events.publish(EnrollmentCreated(enrollment))
     
     return EnrollResponse(
         message="Successfully enrolled in course",
-        enrollment_id=enrollment_id,
+        enrollment_id=enrollment.enrollment_id,
         course_id=course_id,
         learner_id=current_learner.learner_id
-    )
\ No newline at end of file
+    )
+
+
+def _enroll(learner_id: str, course_id: str) -> Optional[Enrollment]:
+    """Insert the learner's enrollment, or reactivate a cancelled one.
+
+    Returns ``None`` if the learner is already enrolled.
+    """
+    while True:
+        enrollment_id, current = _own_enrollment(learner_id, course_id)
+        if current is None:
+            enrollment = Enrollment(
+                enrollment_id=enrollment_id, learner_id=learner_id, course_id=course_id
+            )
+            if learning_records.insert_if_absent(enrollment):
+                return enrollment
+        elif current.status != EnrollmentStatus.CANCELLED:
+            return None
+        else:
+            enrollment = current.model_copy(update={
+                "status": EnrollmentStatus.ACTIVE,
+                "enrollment_date": datetime.now(timezone.utc),
+            })
+            if learning_records.compare_and_set(current, enrollment):
+                return enrollment
+
+
+def _own_enrollment(learner_id: str, course_id: str) -> Tuple[str, Optional[Enrollment]]:
+    """The learner's enrollment in the course, and the key it is (or goes) under.
+
+    That key is ``<learner_id>-<course_id>``, but ``POST /enrollments/``
+    takes client-chosen ids, so a row found there only counts if it is this
+    learner's enrollment in this course. Otherwise the indexed lookup
+    decides, and a new enrollment gets a fresh id.
+    """
+    key = f"{learner_id}-{course_id}"
+    current = store.enrollments.get(key)
+    if current is None or (current.learner_id, current.course_id) == (learner_id, course_id):
+        return key, current
+    found, _ = store.enrollments.page(1, learner_id=learner_id, course_id=course_id)
+    if found:
+        return found[0].enrollment_id, found[0]
+    return str(uuid4()), None
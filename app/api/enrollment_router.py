@@ -1,39 +1,87 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 
-from ..domain.enrollment import Enrollment
+from ..domain.enrollment import Enrollment, EnrollmentStatus
 from ..domain.user import Learner
-from ..storage import _enrollments
+from ..events import BatchIngested, EnrollmentCancelled, EnrollmentCreated, events
+from ..learning_records import learning_records
+from ..repository import store
 from .auth_router import get_current_learner   
+from .batch import BatchResult, ingest_request
+from .pagination import PageParams, paginate
 
 router = APIRouter(prefix="/enrollments", tags=["Enrollments"])
 
 
 @router.post("/", response_model=Enrollment)
-def create_enrollment(
+async def create_enrollment(
     enrollment: Enrollment,
     current_learner: Learner = Depends(get_current_learner)  
 ) -> Enrollment:
-    if enrollment.enrollment_id in _enrollments:
+    if not await store.enrollments.run_write(learning_records.insert_if_absent, enrollment):
         raise HTTPException(status_code=400, detail="Enrollment already exists")
-    _enrollments[enrollment.enrollment_id] = enrollment
+    await events.publish(EnrollmentCreated(enrollment))
     return enrollment
 
 
+@router.post("/batch", response_model=BatchResult)
+async def create_enrollments_batch(
+    request: Request,
+    atomic: bool = True,
+    current_learner: Learner = Depends(get_current_learner)
+) -> BatchResult:
+    result = await ingest_request(store.enrollments, request, atomic, learning_records.insert_many_if_absent)
+    if result.inserted:
+        await events.publish(BatchIngested("enrollments", result.inserted))
+    return result
+
+
+def _cancel(enrollment_id: str, learner_id: str) -> Enrollment:
+    while True:
+        current = store.enrollments.get(enrollment_id)
+        if not current:
+            raise HTTPException(status_code=404, detail="Enrollment not found")
+        if current.learner_id != learner_id:
+            raise HTTPException(status_code=403, detail="Not your enrollment")
+        if current.status == EnrollmentStatus.CANCELLED:
+            raise HTTPException(status_code=400, detail="Enrollment already cancelled")
+        cancelled = current.model_copy(update={"status": EnrollmentStatus.CANCELLED})
+        if learning_records.compare_and_set(current, cancelled):
+            return cancelled
+
+
+@router.post("/{enrollment_id}/cancel", response_model=Enrollment)
+async def cancel_enrollment(
+    enrollment_id: str,
+    current_learner: Learner = Depends(get_current_learner)
+) -> Enrollment:
+    cancelled = await store.enrollments.run_write(_cancel, enrollment_id, current_learner.learner_id)
+    await events.publish(EnrollmentCancelled(cancelled))
+    return cancelled
+
+
 @router.get("/", response_model=List[Enrollment])
-def list_enrollments(
+async def list_enrollments(
+    response: Response,
+    learner_id: Optional[str] = None,
+    course_id: Optional[str] = None,
+    status: Optional[EnrollmentStatus] = None,
+    page: PageParams = Depends(),
     current_learner: Learner = Depends(get_current_learner)  
 ) -> List[Enrollment]:
-    return list(_enrollments.values())
+    return await paginate(
+        store.enrollments, page, response,
+        learner_id=learner_id, course_id=course_id, status=status,
+    )
 
 
 @router.get("/{enrollment_id}", response_model=Enrollment)
-def get_enrollment(
+async def get_enrollment(
     enrollment_id: str,
     current_learner: Learner = Depends(get_current_learner)   
 ) -> Enrollment:
-    enrollment = _enrollments.get(enrollment_id)
+    enrollment = await store.enrollments.aget(enrollment_id)
     if not enrollment:
         raise HTTPException(status_code=404, detail="Enrollment not found")
     return enrollment
\ No newline at end of file
@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from ..domain.user import Learner
+from ..repository import store
+from ..repository.base import Repository
+from .auth_router import get_current_learner
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+class ExportCollection(str, Enum):
+    enrollments = "enrollments"
+    progress = "progress"
+    feedback = "feedback"
+
+
+# Repository and the timestamp field ``since`` filters on, per collection.
+EXPORTS = {
+    ExportCollection.enrollments: (store.enrollments, "enrollment_date"),
+    ExportCollection.progress: (store.progress, "last_accessed"),
+    ExportCollection.feedback: (store.feedback, None),
+}
+
+
+def _aware(value: datetime) -> datetime:
+    # Clients may post naive timestamps; they are taken as UTC, like ``since``.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def iter_ndjson(
+    repository: Repository,
+    since_field: Optional[str] = None,
+    since: Optional[datetime] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Yield the collection as NDJSON, one chunk of lines per repository page.
+
+    Only one page is held at a time, so memory stays flat however large the
+    collection is, and the client gets the first chunk immediately.
+    """
+    after = None
+    while True:
+        items, after = repository.page(chunk_size, after)
+        lines = [
+            item.model_dump_json().encode() + b"\n"
+            for item in items
+            if since is None or _aware(getattr(item, since_field)) >= since
+        ]
+        if lines:
+            yield b"".join(lines)
+        if after is None:
+            return
+
+
+@router.get("/{collection}")
+async def export_collection(
+    collection: ExportCollection,
+    since: Optional[datetime] = None,
+    current_learner: Learner = Depends(get_current_learner)
+) -> StreamingResponse:
+    repository, since_field = EXPORTS[collection]
+    if since is not None:
+        if since_field is None:
+            raise HTTPException(
+                status_code=400, detail=f"{collection.value} cannot be filtered by since"
+            )
+        since = _aware(since)
+    # A plain iterator: Starlette pulls each chunk on the threadpool, so the
+    # page reads and the serialization stay off the event loop.
+    return StreamingResponse(
+        iter_ndjson(repository, since_field, since),
+        media_type="application/x-ndjson",
+    )
@@ -1,39 +1,62 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
 
 from ..domain.feedback import Feedback
 from ..domain.user import Learner
-from ..storage import _feedback_store
+from ..events import BatchIngested, FeedbackSubmitted, events
+from ..ratings import ratings
+from ..repository import store
 from .auth_router import get_current_learner   
+from .batch import BatchResult, ingest_request
+from .pagination import PageParams, paginate
 
 router = APIRouter(prefix="/feedback", tags=["Feedback"])
 
 
 @router.post("/", response_model=Feedback)
-def create_feedback(
+async def create_feedback(
     feedback: Feedback,
     current_learner: Learner = Depends(get_current_learner)   
 ) -> Feedback:
-    if feedback.feedback_id in _feedback_store:
+    if not await run_in_threadpool(ratings.insert_if_absent, feedback):
         raise HTTPException(status_code=400, detail="Feedback already exists")
-    _feedback_store[feedback.feedback_id] = feedback
+    await events.publish(FeedbackSubmitted(feedback))
     return feedback
 
 
+@router.post("/batch", response_model=BatchResult)
+async def create_feedback_batch(
+    request: Request,
+    atomic: bool = True,
+    current_learner: Learner = Depends(get_current_learner)
+) -> BatchResult:
+    result = await ingest_request(store.feedback, request, atomic, ratings.insert_many_if_absent)
+    if result.inserted:
+        await events.publish(BatchIngested("feedback", result.inserted))
+    return result
+
+
 @router.get("/", response_model=List[Feedback])
-def list_feedback(
+async def list_feedback(
+    response: Response,
+    learner_id: Optional[str] = None,
+    course_id: Optional[str] = None,
+    page: PageParams = Depends(),
     current_learner: Learner = Depends(get_current_learner)   
 ) -> List[Feedback]:
-    return list(_feedback_store.values())
+    return await paginate(
+        store.feedback, page, response, learner_id=learner_id, course_id=course_id
+    )
 
 
 @router.get("/{feedback_id}", response_model=Feedback)
-def get_feedback(
+async def get_feedback(
     feedback_id: str,
     current_learner: Learner = Depends(get_current_learner)  
 ) -> Feedback:
-    feedback = _feedback_store.get(feedback_id)
+    feedback = await store.feedback.aget(feedback_id)
     if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
     return feedback
\ No newline at end of file
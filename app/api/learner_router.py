@@ -1,16 +1,19 @@
 from typing import Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel, EmailStr
-from passlib.context import CryptContext
 
 from ..domain.user import Learner
-from ..storage import _learners
+from ..events import LearnerRegistered, events
+from ..hashing import hasher
+from ..token_cache import token_cache
+from .auth_router import check_login_throttle, get_current_learner
+from .pagination import PageParams, paginate
+from ..repository import store
+from ..repository.base import DuplicateKeyError
 
 router = APIRouter(prefix="/learners", tags=["Learners"])
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class LearnerCreate(BaseModel):
     name: str
@@ -26,12 +29,12 @@ class LearnerResponse(BaseModel):
 
 
 @router.post("/", response_model=Dict)
-def create_learner(learner_data: LearnerCreate) -> Dict:
-    for learner in _learners.values():
-        if learner.email == learner_data.email:
-            raise HTTPException(status_code=400, detail="Email already registered")
+async def create_learner(learner_data: LearnerCreate, request: Request) -> Dict:
+    check_login_throttle(request, learner_data.email)
+    if await store.learners.aget_by("email", learner_data.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
     
-    password_hash = pwd_context.hash(learner_data.password)
+    password_hash = await hasher.hash(learner_data.password)
     
     new_learner = Learner(
         name=learner_data.name,
@@ -39,7 +42,13 @@ def create_learner(learner_data: LearnerCreate) -> Dict:
         password_hash=password_hash
     )
     
-    _learners[new_learner.learner_id] = new_learner
+    try:
+        inserted = await store.learners.ainsert_if_absent(new_learner)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    if not inserted:
+        raise HTTPException(status_code=400, detail="Learner already exists")
+    await events.publish(LearnerRegistered(new_learner.learner_id))
     
     return {
         "learner_id": new_learner.learner_id,
@@ -51,7 +60,7 @@ def create_learner(learner_data: LearnerCreate) -> Dict:
 
 
 @router.get("/", response_model=List[Dict])
-def list_learners() -> List[Dict]:
+async def list_learners(response: Response, page: PageParams = Depends()) -> List[Dict]:
     return [
         {
             "learner_id": learner.learner_id,
@@ -59,13 +68,13 @@ def list_learners() -> List[Dict]:
             "email": learner.email,
             "join_date": learner.join_date,
         }
-        for learner in _learners.values()
+        for learner in await paginate(store.learners, page, response)
     ]
 
 
 @router.get("/{learner_id}", response_model=Dict)
-def get_learner(learner_id: str) -> Dict:
-    learner = _learners.get(learner_id)
+async def get_learner(learner_id: str) -> Dict:
+    learner = await store.learners.aget(learner_id)
     if not learner:
         raise HTTPException(status_code=404, detail="Learner not found")
     return {
@@ -74,4 +83,16 @@ def get_learner(learner_id: str) -> Dict:
         "email": learner.email,
         "join_date": learner.join_date,
         "profile": learner.profile,
-    }
\ No newline at end of file
+    }
+
+
+@router.delete("/{learner_id}", response_model=Dict)
+async def delete_learner(
+    learner_id: str,
+    current_learner: Learner = Depends(get_current_learner)
+) -> Dict:
+    if learner_id != current_learner.learner_id:
+        raise HTTPException(status_code=403, detail="Cannot delete another learner")
+    await store.learners.adelete(learner_id)
+    token_cache.invalidate_learner(learner_id)
+    return {"learner_id": learner_id, "message": "Learner deleted successfully"}
\ No newline at end of file
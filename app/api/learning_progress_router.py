@@ -1,39 +1,90 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 
-from ..domain.learning_progress import LearningProgress
+from ..domain.learning_progress import LearningProgress, ProgressStatus
 from ..domain.user import Learner
-from ..storage import _progress_store
+from ..events import BatchIngested, ProgressUpdated, events
+from ..learning_records import learning_records
+from ..repository import store
+from ..topic_progress import topic_progress
 from .auth_router import get_current_learner     
+from .batch import BatchResult, ingest_request
+from .pagination import PageParams, paginate
 
 router = APIRouter(prefix="/progress", tags=["Learning Progress"])
 
 
 @router.post("/", response_model=LearningProgress)
-def create_progress(
+async def create_progress(
     progress: LearningProgress,
     current_learner: Learner = Depends(get_current_learner)  
 ) -> LearningProgress:
-    if progress.progress_id in _progress_store:
+    progress = await store.courses.run_read(topic_progress.derive, progress)
+    if not await store.progress.run_write(learning_records.insert_if_absent, progress):
         raise HTTPException(status_code=400, detail="Progress already exists")
-    _progress_store[progress.progress_id] = progress
+    await events.publish(ProgressUpdated(progress))
+    return progress
+
+
+@router.post("/batch", response_model=BatchResult)
+async def create_progress_batch(
+    request: Request,
+    atomic: bool = True,
+    current_learner: Learner = Depends(get_current_learner)
+) -> BatchResult:
+    result = await ingest_request(store.progress, request, atomic, _insert_derived)
+    if result.inserted:
+        await events.publish(BatchIngested("progress", result.inserted))
+    return result
+
+
+def _insert_derived(items: Sequence[LearningProgress], atomic: bool) -> List[int]:
+    return learning_records.insert_many_if_absent(
+        [topic_progress.derive(item) for item in items], atomic
+    )
+
+
+@router.post("/{course_id}/topics/{topic_id}/complete", response_model=LearningProgress)
+async def complete_topic(
+    course_id: str,
+    topic_id: str,
+    current_learner: Learner = Depends(get_current_learner)
+) -> LearningProgress:
+    course = await store.courses.aget(course_id)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    try:
+        progress = await store.progress.run_write(
+            topic_progress.complete, current_learner.learner_id, course, topic_id
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    await events.publish(ProgressUpdated(progress))
     return progress
 
 
 @router.get("/", response_model=List[LearningProgress])
-def list_progress(
+async def list_progress(
+    response: Response,
+    learner_id: Optional[str] = None,
+    course_id: Optional[str] = None,
+    status: Optional[ProgressStatus] = None,
+    page: PageParams = Depends(),
     current_learner: Learner = Depends(get_current_learner)  
 ) -> List[LearningProgress]:
-    return list(_progress_store.values())
+    return await paginate(
+        store.progress, page, response,
+        learner_id=learner_id, course_id=course_id, status=status,
+    )
 
 
 @router.get("/{progress_id}", response_model=LearningProgress)
-def get_progress(
+async def get_progress(
     progress_id: str,
     current_learner: Learner = Depends(get_current_learner)   
 ) -> LearningProgress:
-    progress = _progress_store.get(progress_id)
+    progress = await store.progress.aget(progress_id)
     if not progress:
         raise HTTPException(status_code=404, detail="Progress not found")
     return progress
\ No newline at end of file
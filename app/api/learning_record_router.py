@@ -1,39 +1,40 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 
 from ..domain.learning_record import LearningRecord
 from ..domain.user import Learner
-from ..storage import _records
+from ..learning_records import learning_records
+from ..repository import store
 from .auth_router import get_current_learner     
+from .pagination import PageParams, paginate
 
 router = APIRouter(prefix="/learning-records", tags=["Learning Records"])
 
 
-@router.post("/", response_model=LearningRecord)
-def create_record(
-    record: LearningRecord,
-    current_learner: Learner = Depends(get_current_learner) 
-) -> LearningRecord:
-    if record.record_id in _records:
-        raise HTTPException(status_code=400, detail="Record already exists")
-    _records[record.record_id] = record
-    return record
-
-
 @router.get("/", response_model=List[LearningRecord])
-def list_records(
+async def list_records(
+    response: Response,
+    learner_id: Optional[str] = None,
+    page: PageParams = Depends(),
     current_learner: Learner = Depends(get_current_learner)   
 ) -> List[LearningRecord]:
-    return list(_records.values())
+    return await paginate(store.records, page, response, learner_id=learner_id)
+
+
+@router.get("/me", response_model=LearningRecord)
+async def get_my_record(
+    current_learner: Learner = Depends(get_current_learner)
+) -> LearningRecord:
+    return await store.records.run_read(learning_records.get, current_learner.learner_id)
 
 
 @router.get("/{record_id}", response_model=LearningRecord)
-def get_record(
+async def get_record(
     record_id: str,
     current_learner: Learner = Depends(get_current_learner)   
 ) -> LearningRecord:
-    record = _records.get(record_id)
+    record = await store.records.aget(record_id)
     if not record:
         raise HTTPException(status_code=404, detail="Record not found")
     return record
\ No newline at end of file
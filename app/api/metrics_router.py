@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Response
+
+from ..catalog import catalog
+from ..events import events
+from ..metrics import Exposition, metrics
+from ..repository import store
+from ..token_cache import token_cache
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+CACHES = {"token": token_cache, "catalog": catalog}
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    out = Exposition()
+    metrics.expose(out)
+    out.simple(
+        "lernex_store_items", "gauge", "Items held by each store collection.",
+        [((name,), await repository.acount()) for name, repository in store.repositories().items()],
+        ("collection",),
+    )
+    out.simple(
+        "lernex_event_queue_depth", "gauge", "Events waiting in each consumer's queue.",
+        [((consumer.name,), consumer.depth) for consumer in events.consumers], ("consumer",),
+    )
+    out.simple(
+        "lernex_cache_hits_total", "counter", "Cache lookups served from the cache.",
+        [((name,), cache.hits) for name, cache in CACHES.items()], ("cache",),
+    )
+    out.simple(
+        "lernex_cache_misses_total", "counter", "Cache lookups that had to rebuild.",
+        [((name,), cache.misses) for name, cache in CACHES.items()], ("cache",),
+    )
+    out.simple(
+        "lernex_cache_hit_ratio", "gauge", "Hits over all lookups since start.",
+        [
+            ((name,), cache.hits / (cache.hits + cache.misses) if cache.hits + cache.misses else 0.0)
+            for name, cache in CACHES.items()
+        ],
+        ("cache",),
+    )
+    return Response(content=out.render(), media_type=PROMETHEUS_CONTENT_TYPE)
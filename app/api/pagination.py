@@ -0,0 +1,59 @@
+import base64
+import binascii
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Query, Response
+
+from ..repository.base import Repository
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(f"p:{position}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    if cursor is None:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, position = raw.split(":")
+        if prefix != "p":
+            raise ValueError(cursor)
+        return int(position)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class PageParams:
+    """``limit``/``cursor`` query parameters shared by every list endpoint."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None),
+    ):
+        self.limit = limit
+        self.after = decode_cursor(cursor)
+
+
+def set_next_cursor(response: Response, position: Optional[int]) -> None:
+    if position is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(position)
+
+
+async def paginate(
+    repository: Repository, page: PageParams, response: Response, **filters: Any
+) -> List:
+    """Fetch one page from ``repository`` and advertise the next cursor.
+
+    The body stays a plain JSON list so existing clients keep working; the
+    cursor for the following page is sent in the ``X-Next-Cursor`` header
+    and is absent on the last page.
+    """
+    items, last = await repository.apage(page.limit, page.after, **filters)
+    set_next_cursor(response, last)
+    return items
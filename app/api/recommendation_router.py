@@ -1,41 +1,57 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.concurrency import run_in_threadpool
 
 from ..domain.recommendation import Recommendation
 from ..domain.user import Learner
-from ..storage import _recommendations
+from ..recommender import engine
+from ..repository import store
 from .auth_router import get_current_learner      
+from .pagination import PageParams, paginate
 
 router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
 
 
 @router.post("/", response_model=Recommendation)
-def create_recommendation(
+async def create_recommendation(
     recommendation: Recommendation,
     current_learner: Learner = Depends(get_current_learner)   
 ) -> Recommendation:
-    if recommendation.recommendation_id in _recommendations:
+    if not await store.recommendations.ainsert_if_absent(recommendation):
         raise HTTPException(
             status_code=400, detail="Recommendation already exists"
         )
-    _recommendations[recommendation.recommendation_id] = recommendation
     return recommendation
 
 
 @router.get("/", response_model=List[Recommendation])
-def list_recommendations(
+async def list_recommendations(
+    response: Response,
+    learner_id: Optional[str] = None,
+    page: PageParams = Depends(),
     current_learner: Learner = Depends(get_current_learner)   
 ) -> List[Recommendation]:
-    return list(_recommendations.values())
+    return await paginate(store.recommendations, page, response, learner_id=learner_id)
+
+
+@router.get("/for-me", response_model=Recommendation)
+async def recommend_for_me(
+    k: int = Query(10, ge=1, le=100),
+    current_learner: Learner = Depends(get_current_learner)
+) -> Recommendation:
+    return Recommendation(
+        learner_id=current_learner.learner_id,
+        course_ids=await run_in_threadpool(engine.recommend, current_learner, k),
+    )
 
 
 @router.get("/{recommendation_id}", response_model=Recommendation)
-def get_recommendation(
+async def get_recommendation(
     recommendation_id: str,
     current_learner: Learner = Depends(get_current_learner)  
 ) -> Recommendation:
-    recommendation = _recommendations.get(recommendation_id)
+    recommendation = await store.recommendations.aget(recommendation_id)
     if not recommendation:
         raise HTTPException(status_code=404, detail="Recommendation not found")
     return recommendation
\ No newline at end of file
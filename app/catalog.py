@@ -0,0 +1,167 @@
+import hashlib
+import json
+import threading
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from .domain.course import Course
+from .ratings import RatingsIndex, ratings
+from .repository import store
+from .repository.base import Store
+from .selection import Selection
+
+
+def summarize(course: Course, instructor_name: str) -> Dict:
+    lessons = [lesson for module in course.modules for lesson in module.lessons]
+    topics = [topic for lesson in lessons for topic in lesson.topics]
+    return {
+        "course_id": course.course_id,
+        "title": course.title,
+        "description": course.description,
+        "instructor_id": course.instructor_id,
+        "instructor_name": instructor_name,
+        "total_modules": len(course.modules),
+        "total_lessons": len(lessons),
+        "total_topics": len(topics),
+        "total_duration_minutes": sum(t.estimated_duration_minutes or 0 for t in topics),
+    }
+
+
+def etag(body: bytes) -> str:
+    """Strong entity tag for a serialized response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class CachedPage(NamedTuple):
+    body: bytes
+    last: Optional[int]
+    etag: str
+
+
+class CatalogCache:
+    """Course summaries shared by the catalog listing and /my-courses.
+
+    Each summary is keyed by ``course_id`` and remembers the ``updated_at``
+    and instructor version it was built from, so it is only recomputed after
+    the course or the instructors change. Serialized listing pages are
+    cached as bytes and dropped together whenever the course or instructor
+    repository version moves. Pages that carry rating fields are also
+    dropped when the ratings index version moves. Course detail is cached
+    as serialized bytes per ``updated_at``, and so is each ``fields=`` /
+    ``expand=`` selection of it. Every cached body carries its ETag, so
+    conditional requests never hash or serialize anything.
+    """
+
+    max_pages = 256
+    max_selections = 1024
+
+    def __init__(self, store: Store, ratings: Optional[RatingsIndex] = None):
+        self.store = store
+        self.ratings = ratings
+        self.hits = 0
+        self.misses = 0
+        self._summaries: Dict[str, Tuple[datetime, int, Dict]] = {}
+        self._pages: Dict[Tuple, CachedPage] = {}
+        self._details: Dict[str, Tuple[datetime, bytes, str]] = {}
+        self._selections: Dict[Tuple, Tuple[datetime, bytes, str]] = {}
+        self._pages_version: Optional[Tuple[int, int]] = None
+        self._ratings_version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _instructor_name(self, instructor_id: str) -> str:
+        instructor = self.store.instructors.get(instructor_id)
+        return instructor.name if instructor else "Unknown"
+
+    def summary(self, course: Course) -> Dict:
+        instructors_version = self.store.instructors.version
+        cached = self._summaries.get(course.course_id)
+        if (
+            cached is not None
+            and cached[0] == course.updated_at
+            and cached[1] == instructors_version
+        ):
+            self.hits += 1
+            return cached[2]
+        self.misses += 1
+        summary = summarize(course, self._instructor_name(course.instructor_id))
+        self._summaries[course.course_id] = (course.updated_at, instructors_version, summary)
+        return summary
+
+    def detail_json(self, course: Course) -> Tuple[bytes, str]:
+        """The full course tree as JSON bytes plus its ETag."""
+        cached = self._details.get(course.course_id)
+        if cached is not None and cached[0] == course.updated_at:
+            self.hits += 1
+            return cached[1], cached[2]
+        self.misses += 1
+        body = Course.__pydantic_serializer__.to_json(course)
+        tag = etag(body)
+        self._details[course.course_id] = (course.updated_at, body, tag)
+        return body, tag
+
+    def selection_json(self, course: Course, selection: Selection) -> Tuple[bytes, str]:
+        """Only the selected parts of the course tree, plus their ETag."""
+        key = (course.course_id, selection.key)
+        cached = self._selections.get(key)
+        if cached is not None and cached[0] == course.updated_at:
+            self.hits += 1
+            return cached[1], cached[2]
+        self.misses += 1
+        body = Course.__pydantic_serializer__.to_json(course, include=selection.include)
+        tag = etag(body)
+        if len(self._selections) >= self.max_selections:
+            self._selections.clear()
+        self._selections[key] = (course.updated_at, body, tag)
+        return body, tag
+
+    def listing_json(
+        self,
+        limit: int,
+        after: Optional[int] = None,
+        instructor_id: Optional[str] = None,
+        with_ratings: bool = False,
+    ) -> CachedPage:
+        """One page of the catalog as JSON bytes, the next position and ETag."""
+        with_ratings = with_ratings and self.ratings is not None
+        if with_ratings:
+            self.ratings.sync()
+        version = (self.store.courses.version, self.store.instructors.version)
+        key = (limit, after, instructor_id, with_ratings)
+        with self._lock:
+            if self._pages_version != version:
+                self._pages.clear()
+                self._pages_version = version
+            if with_ratings and self._ratings_version != self.ratings.version:
+                for stale in [k for k in self._pages if k[3]]:
+                    del self._pages[stale]
+                self._ratings_version = self.ratings.version
+            page = self._pages.get(key)
+            if page is not None:
+                self.hits += 1
+                return page
+            courses, last = self.store.courses.page(
+                limit, after, instructor_id=instructor_id
+            )
+            summaries = [self.summary(course) for course in courses]
+            if with_ratings:
+                summaries = [self._with_ratings(summary) for summary in summaries]
+            body = json.dumps(summaries).encode()
+            if len(self._pages) >= self.max_pages:
+                self._pages.clear()
+            page = self._pages[key] = CachedPage(body, last, etag(body))
+            return page
+
+    def _with_ratings(self, summary: Dict) -> Dict:
+        aggregate = self.ratings.get(summary["course_id"])
+        return {**summary, "rating_count": aggregate.count, "average_rating": aggregate.average}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._summaries.clear()
+            self._details.clear()
+            self._selections.clear()
+            self._pages.clear()
+            self._pages_version = None
+
+
+catalog = CatalogCache(store, ratings)
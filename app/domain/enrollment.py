@@ -4,6 +4,8 @@ from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
+from .timestamps import UtcDatetime
+
 
 class EnrollmentStatus(str, Enum):
     ACTIVE = "ACTIVE"
@@ -15,5 +17,5 @@ class Enrollment(BaseModel):
     enrollment_id: str = Field(default_factory=lambda: str(uuid4()))
     learner_id: str
     course_id: str
-    enrollment_date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    enrollment_date: UtcDatetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     status: EnrollmentStatus = EnrollmentStatus.ACTIVE
\ No newline at end of file
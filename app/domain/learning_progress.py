@@ -2,7 +2,9 @@ from datetime import datetime, timezone
 from enum import Enum
 from uuid import uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from .timestamps import UtcDatetime
 
 
 class ProgressStatus(str, Enum):
@@ -12,9 +14,13 @@ class ProgressStatus(str, Enum):
 
 
 class LearningProgress(BaseModel):
+    # completed_topics travels as base64 in JSON (API and SQLite rows).
+    model_config = ConfigDict(ser_json_bytes="base64", val_json_bytes="base64")
+
     progress_id: str = Field(default_factory=lambda: str(uuid4()))
     learner_id: str
     course_id: str
     completion_rate: float = 0.0 
-    last_accessed: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    status: ProgressStatus = ProgressStatus.IN_PROGRESS
\ No newline at end of file
+    last_accessed: UtcDatetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    status: ProgressStatus = ProgressStatus.IN_PROGRESS
+    completed_topics: bytes = b""
\ No newline at end of file
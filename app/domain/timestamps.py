@@ -0,0 +1,16 @@
+from datetime import datetime, timezone
+
+from pydantic import AfterValidator
+from typing import Annotated
+
+
+def as_utc(value: datetime) -> datetime:
+    """``value`` in UTC; a naive value is taken to be UTC already."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+# Timestamps the memory backend keeps as epoch integers. Normalising them
+# on the model means every backend hands back the same value it was given.
+UtcDatetime = Annotated[datetime, AfterValidator(as_utc)]
@@ -0,0 +1,222 @@
+"""In-process domain events.
+
+Routes publish a typed event after each successful write. Work derived
+from a write — refreshing the recommender, analytics, and whatever comes
+next — runs in consumers registered at startup, off the request path.
+Each consumer has its own bounded queue and a task that takes events off
+it in batches, so a slow consumer holds up neither the request nor the
+other consumers.
+"""
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Union
+
+from dotenv import load_dotenv
+
+from .domain.enrollment import Enrollment
+from .domain.feedback import Feedback
+from .domain.learning_progress import LearningProgress
+from .metrics import metrics
+
+load_dotenv()
+
+# Per-consumer queue bound: publishers wait once a consumer is this far behind.
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", 10_000))
+# A batch is handed over at EVENT_BATCH_SIZE events or EVENT_BATCH_SECONDS
+# after its first event, whichever comes first.
+EVENT_BATCH_SIZE = int(os.getenv("EVENT_BATCH_SIZE", 500))
+EVENT_BATCH_SECONDS = float(os.getenv("EVENT_BATCH_SECONDS", 0.05))
+# How long shutdown waits for queued events to be handled.
+EVENT_DRAIN_SECONDS = float(os.getenv("EVENT_DRAIN_SECONDS", 10))
+
+logger = logging.getLogger(__name__)
+
+
+class LearnerRegistered(NamedTuple):
+    learner_id: str
+
+
+class EnrollmentCreated(NamedTuple):
+    enrollment: Enrollment
+
+
+class EnrollmentCancelled(NamedTuple):
+    enrollment: Enrollment
+
+
+class ProgressUpdated(NamedTuple):
+    progress: LearningProgress
+
+
+class FeedbackSubmitted(NamedTuple):
+    feedback: Feedback
+
+
+class BatchIngested(NamedTuple):
+    collection: str
+    inserted: int
+
+
+Event = Union[
+    LearnerRegistered, EnrollmentCreated, EnrollmentCancelled,
+    ProgressUpdated, FeedbackSubmitted, BatchIngested,
+]
+Handler = Callable[[List[Event]], Awaitable[None]]
+
+
+class Consumer:
+    """One subscriber: a bounded queue drained in batches by one task."""
+
+    def __init__(self, name: str, handler: Handler, queue_size: int,
+                 batch_size: int, batch_seconds: float):
+        self.name = name
+        self.handler = handler
+        self.queue_size = max(queue_size, 1)
+        self.batch_size = max(batch_size, 1)
+        self.batch_seconds = batch_seconds
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.draining = False
+        self._wakeup: Optional[asyncio.Future] = None
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize() if self.queue is not None else 0
+
+    async def deliver(self, batch: List[Event]) -> None:
+        try:
+            await self.handler(batch)
+        except Exception:
+            logger.exception("Event consumer %r failed on a batch of %d", self.name, len(batch))
+            metrics.observe_events_handled(self.name, "error", len(batch))
+        else:
+            metrics.observe_events_handled(self.name, "ok", len(batch))
+
+    def wake(self) -> None:
+        """End the current batch's wait early."""
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _next_batch(self) -> List[Event]:
+        queue = self.queue
+        batch = [await queue.get()]
+        if queue.qsize() + 1 < self.batch_size and not self.draining:
+            self._wakeup = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(self._wakeup, self.batch_seconds)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._wakeup = None
+        while len(batch) < self.batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+
+    async def run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self.deliver(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+
+class EventBus:
+    """Routes published events to the consumers subscribed to their type.
+
+    ``publish`` only enqueues, which does not suspend the caller while the
+    queue has room. Once a consumer's queue is full the publisher waits for
+    space: backpressure slows writers down instead of letting a stalled
+    consumer grow memory without bound. Consumers are subscribed once, at
+    import time; ``start`` and ``stop`` run with the application lifespan
+    and may be repeated. ``stop`` waits up to ``drain_seconds`` for queued
+    events to be handled before cancelling the consumer tasks. While the bus
+    is not running, events are handed to their consumers inline, so nothing
+    published outside the lifespan is lost.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = EVENT_QUEUE_SIZE,
+        batch_size: int = EVENT_BATCH_SIZE,
+        batch_seconds: float = EVENT_BATCH_SECONDS,
+        drain_seconds: float = EVENT_DRAIN_SECONDS,
+    ):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_seconds = batch_seconds
+        self.drain_seconds = drain_seconds
+        self.consumers: List[Consumer] = []
+        self.running = False
+        self._routes: Dict[type, List[Consumer]] = {}
+
+    def subscribe(
+        self,
+        name: str,
+        handler: Handler,
+        *event_types: type,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_seconds: Optional[float] = None,
+    ) -> Consumer:
+        if self.running:
+            raise RuntimeError("Subscribe consumers before the event bus starts")
+        consumer = Consumer(
+            name,
+            handler,
+            self.queue_size if queue_size is None else queue_size,
+            self.batch_size if batch_size is None else batch_size,
+            self.batch_seconds if batch_seconds is None else batch_seconds,
+        )
+        self.consumers.append(consumer)
+        for event_type in event_types:
+            self._routes.setdefault(event_type, []).append(consumer)
+        return consumer
+
+    async def publish(self, *events: Event) -> None:
+        for event in events:
+            for consumer in self._routes.get(type(event), ()):
+                if not self.running:
+                    await consumer.deliver([event])
+                    continue
+                if consumer.queue.full():
+                    metrics.observe_event_backpressure(consumer.name)
+                    consumer.wake()
+                await consumer.queue.put(event)
+                if consumer.depth + 1 >= consumer.batch_size:
+                    consumer.wake()
+
+    async def start(self) -> None:
+        for consumer in self.consumers:
+            consumer.draining = False
+            consumer.queue = asyncio.Queue(consumer.queue_size)
+            consumer.task = asyncio.create_task(consumer.run(), name=f"events-{consumer.name}")
+        self.running = True
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self.running = False
+        for consumer in self.consumers:
+            consumer.draining = True
+            consumer.wake()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(consumer.queue.join() for consumer in self.consumers)),
+                self.drain_seconds,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Event bus stopped with %d events undelivered",
+                sum(consumer.depth for consumer in self.consumers),
+            )
+        for consumer in self.consumers:
+            consumer.task.cancel()
+        await asyncio.gather(*(consumer.task for consumer in self.consumers), return_exceptions=True)
+        for consumer in self.consumers:
+            consumer.queue = consumer.task = None
+
+
+events = EventBus()
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+import anyio
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from .metrics import metrics
+
+load_dotenv()
+
+# 0 keeps bcrypt on the AnyIO threadpool instead of a separate process pool.
+# By default the cores are split between the uvicorn workers' pools.
+HASH_WORKERS = int(os.getenv(
+    "HASH_WORKERS", max((os.cpu_count() or 1) // int(os.getenv("WORKERS", 1)), 1)
+))
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", 64))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, password_hash: str) -> bool:
+    return pwd_context.verify(plain_password, password_hash)
+
+
+def _timed(fn: Callable, *args):
+    # Timed where it runs, so queueing for a worker is not counted.
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop with a cap on outstanding work.
+
+    At most ``max_pending`` hash/verify calls may be queued or running at
+    once; anything beyond that is rejected with 503 so a login burst cannot
+    pile up unbounded work behind the pool.
+
+    A pool whose worker died stays broken, so it is dropped and the next
+    call starts a fresh one; the calls it failed get a 503.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, max_pending: int = HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max(max_pending, workers, 1)
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _run(self, operation: str, fn: Callable, *args):
+        if self.pending >= self.max_pending:
+            raise _unavailable("Authentication service is busy, please retry")
+        self.pending += 1
+        try:
+            if self.workers <= 0:
+                result, seconds = await anyio.to_thread.run_sync(_timed, fn, *args)
+            else:
+                executor = self.executor
+                try:
+                    result, seconds = await asyncio.wrap_future(
+                        executor.submit(_timed, fn, *args)
+                    )
+                except BrokenProcessPool:
+                    self._discard(executor)
+                    raise _unavailable("Authentication service is restarting, please retry")
+        finally:
+            self.pending -= 1
+        metrics.observe_password_hashing(operation, seconds)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", _hash, password)
+
+    async def verify(self, plain_password: str, password_hash: str) -> bool:
+        return await self._run("verify", _verify, plain_password, password_hash)
+
+    def _discard(self, executor: Executor) -> None:
+        # Every call in flight on the dead pool lands here; only the first
+        # replaces it.
+        if self._executor is executor:
+            logger.error("Password hashing pool broke; starting a new one")
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def _unavailable(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={"Retry-After": "1"},
+    )
+
+
+hasher = PasswordHasher()
@@ -0,0 +1,176 @@
+"""Learning records kept as a projection of enrollments and progress.
+
+Each learner has one projected record, ``record-<learner_id>``. Every
+enrollment, progress change and cancellation written through
+:class:`LearningRecordProjection` is folded into that learner's record
+straight after the source write, so reading it is a single key lookup
+rather than a scan of both stores. ``python -m app.learning_records``
+regenerates every projected record from the source stores.
+"""
+import sys
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from .domain.enrollment import Enrollment, EnrollmentStatus
+from .domain.learning_progress import LearningProgress, ProgressStatus
+from .domain.learning_record import LearningRecord
+from .repository import store
+from .repository.base import Repository, Store
+
+Source = Union[Enrollment, LearningProgress]
+
+
+def record_id(learner_id: str) -> str:
+    return f"record-{learner_id}"
+
+
+def _add(items: List[str], value: str) -> None:
+    if value not in items:
+        items.append(value)
+
+
+def _discard(items: List[str], value: str) -> None:
+    if value in items:
+        items.remove(value)
+
+
+def _fold(record: LearningRecord, item: Source, cancelled: bool = False) -> None:
+    """Apply the current state of ``item`` to ``record`` in place.
+
+    Folding is keyed on the item's state, not on what changed, so applying
+    the same item twice leaves the record as it was. A completed course
+    stays completed; a cancellation drops the enrollment and takes the
+    course off the ongoing list, and progress on a course whose enrollment
+    is ``cancelled`` does not put it back.
+    """
+    course_id = item.course_id
+    if isinstance(item, Enrollment):
+        if item.status == EnrollmentStatus.CANCELLED:
+            _discard(record.enrollment_ids, item.enrollment_id)
+            _discard(record.ongoing_course_ids, course_id)
+            return
+        _add(record.enrollment_ids, item.enrollment_id)
+        completed = item.status == EnrollmentStatus.COMPLETED
+    else:
+        completed = item.status == ProgressStatus.COMPLETED
+        if cancelled and not completed:
+            return
+    if completed:
+        _discard(record.ongoing_course_ids, course_id)
+        _add(record.completed_course_ids, course_id)
+    elif course_id not in record.completed_course_ids:
+        _add(record.ongoing_course_ids, course_id)
+
+
+class LearningRecordProjection:
+    """Per-learner records kept in step with enrollments and progress.
+
+    Writes go through :meth:`insert_if_absent`, :meth:`compare_and_set`,
+    :meth:`save_many` or :meth:`insert_many_if_absent`, which write the source item and then fold it into
+    its learner's record with compare-and-set, retrying on conflict. The
+    cost is one record read and write per learner touched, independent of
+    how large the stores are. Anything written around the projection is
+    picked up by :meth:`rebuild`.
+    """
+
+    def __init__(self, store: Store):
+        self.store = store
+
+    def _source(self, item: Source) -> Repository:
+        return self.store.enrollments if isinstance(item, Enrollment) else self.store.progress
+
+    def get(self, learner_id: str) -> LearningRecord:
+        return self.store.records.get(record_id(learner_id)) or LearningRecord(
+            record_id=record_id(learner_id), learner_id=learner_id
+        )
+
+    def _cancelled(self, item: Source) -> bool:
+        if isinstance(item, Enrollment) or item.status == ProgressStatus.COMPLETED:
+            return False
+        cancelled, _ = self.store.enrollments.page(
+            1, learner_id=item.learner_id, course_id=item.course_id,
+            status=EnrollmentStatus.CANCELLED,
+        )
+        return bool(cancelled)
+
+    def apply(self, items: Sequence[Source]) -> None:
+        """Fold ``items``, already stored, into their learners' records."""
+        by_learner: Dict[str, List[Tuple[Source, bool]]] = {}
+        for item in items:
+            by_learner.setdefault(item.learner_id, []).append((item, self._cancelled(item)))
+        for learner_id, learner_items in by_learner.items():
+            while True:
+                current = self.store.records.get(record_id(learner_id))
+                record = LearningRecord(
+                    record_id=record_id(learner_id),
+                    learner_id=learner_id,
+                    completed_course_ids=list(current.completed_course_ids) if current else [],
+                    ongoing_course_ids=list(current.ongoing_course_ids) if current else [],
+                    enrollment_ids=list(current.enrollment_ids) if current else [],
+                )
+                for item, cancelled in learner_items:
+                    _fold(record, item, cancelled)
+                if record == current or self.store.records.compare_and_set(current, record):
+                    break
+
+    def insert_if_absent(self, item: Source) -> bool:
+        if not self._source(item).insert_if_absent(item):
+            return False
+        self.apply([item])
+        return True
+
+    def compare_and_set(self, expected: Optional[Source], item: Source) -> bool:
+        if not self._source(item).compare_and_set(expected, item):
+            return False
+        self.apply([item])
+        return True
+
+    def save_many(self, items: Sequence[Source]) -> None:
+        if items:
+            self._source(items[0]).save_many(items)
+            self.apply(items)
+
+    def insert_many_if_absent(self, items: Sequence[Source], atomic: bool = False) -> List[int]:
+        if not items:
+            return []
+        taken = self._source(items[0]).insert_many_if_absent(items, atomic)
+        if not (taken and atomic):
+            skip = set(taken)
+            self.apply([item for i, item in enumerate(items) if i not in skip])
+        return taken
+
+    def rebuild(self) -> int:
+        """Regenerate every projected record from the source stores.
+
+        Enrollments are folded before progress, and progress on a course
+        with a cancelled enrollment is skipped, which is what the writes
+        above produce in whichever order they came. Records of learners with
+        nothing left in either store are deleted; records created through
+        the API under other ids are left alone. Returns the record count.
+        """
+        records: Dict[str, LearningRecord] = {}
+        cancelled: Set[Tuple[str, str]] = set()
+        for source in (self.store.enrollments, self.store.progress):
+            for item in source.list():
+                record = records.get(item.learner_id)
+                if record is None:
+                    record = records[item.learner_id] = LearningRecord(
+                        record_id=record_id(item.learner_id), learner_id=item.learner_id
+                    )
+                key = (item.learner_id, item.course_id)
+                if isinstance(item, Enrollment) and item.status == EnrollmentStatus.CANCELLED:
+                    cancelled.add(key)
+                _fold(record, item, key in cancelled)
+        for stale in self.store.records.list():
+            if stale.record_id == record_id(stale.learner_id) and stale.learner_id not in records:
+                self.store.records.delete(stale.record_id)
+        self.store.records.save_many(list(records.values()))
+        return len(records)
+
+
+learning_records = LearningRecordProjection(store)
+
+
+if __name__ == "__main__":
+    count = learning_records.rebuild()
+    store.close()
+    print(f"Rebuilt {count} learning records", file=sys.stderr)
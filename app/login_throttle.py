@@ -0,0 +1,112 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+
+from .metrics import metrics
+from .repository.base import normalize_email
+
+load_dotenv()
+
+# Attempts refill at RATE per minute up to BURST; a rate of 0 disables that key.
+LOGIN_EMAIL_RATE_PER_MINUTE = float(os.getenv("LOGIN_EMAIL_RATE_PER_MINUTE", 5))
+LOGIN_EMAIL_BURST = int(os.getenv("LOGIN_EMAIL_BURST", 5))
+LOGIN_IP_RATE_PER_MINUTE = float(os.getenv("LOGIN_IP_RATE_PER_MINUTE", 30))
+LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", 30))
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", 100_000))
+
+
+class TokenBuckets:
+    """LRU-bounded token buckets, one per key.
+
+    A bucket is just ``(tokens, updated_at)``; it is refilled lazily when
+    the key is next seen. At most ``maxsize`` keys are kept: the least
+    recently seen is evicted first, and an evicted key simply starts again
+    with a full bucket. Not thread-safe on its own; see ``LoginThrottle``.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, maxsize: int):
+        self.rate = rate_per_minute / 60
+        self.burst = max(burst, 1)
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0 and self.maxsize > 0
+
+    def tokens(self, key: str, now: float) -> float:
+        entry = self._buckets.get(key)
+        if entry is None:
+            return self.burst
+        tokens, updated_at = entry
+        return min(self.burst, tokens + (now - updated_at) * self.rate)
+
+    def wait(self, key: str, now: float) -> float:
+        """Seconds until ``key`` has a whole token; 0 if it has one now."""
+        missing = 1 - self.tokens(key, now)
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, key: str, now: float) -> None:
+        self._buckets[key] = (self.tokens(key, now) - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class LoginThrottle:
+    """Per-email and per-client-IP limits on password attempts.
+
+    Every login or registration costs a full bcrypt round, so each attempt
+    takes a token from both the email's and the client IP's bucket before
+    any hashing happens. If either bucket is empty the attempt is refused
+    with the number of seconds to wait, and neither bucket is charged.
+    """
+
+    def __init__(
+        self,
+        email_rate: float = LOGIN_EMAIL_RATE_PER_MINUTE,
+        email_burst: int = LOGIN_EMAIL_BURST,
+        ip_rate: float = LOGIN_IP_RATE_PER_MINUTE,
+        ip_burst: int = LOGIN_IP_BURST,
+        maxsize: int = LOGIN_THROTTLE_MAX_KEYS,
+    ):
+        self.by_email = TokenBuckets(email_rate, email_burst, maxsize)
+        self.by_ip = TokenBuckets(ip_rate, ip_burst, maxsize)
+        self._lock = threading.Lock()
+
+    def attempt(self, email: str, ip: Optional[str]) -> int:
+        """Charge one attempt; returns 0, or the Retry-After seconds if refused."""
+        checks = [("email", self.by_email, normalize_email(email))]
+        if ip is not None:
+            checks.append(("ip", self.by_ip, ip))
+        checks = [check for check in checks if check[1].enabled]
+        now = time.monotonic()
+        with self._lock:
+            waits = [(scope, buckets.wait(key, now)) for scope, buckets, key in checks]
+            refused = [(scope, wait) for scope, wait in waits if wait > 0]
+            if not refused:
+                for _, buckets, key in checks:
+                    buckets.take(key, now)
+                return 0
+        for scope, _ in refused:
+            metrics.observe_login_throttled(scope)
+        return math.ceil(max(wait for _, wait in refused))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.by_email.clear()
+            self.by_ip.clear()
+
+
+login_throttle = LoginThrottle()
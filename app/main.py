@@ -1,3 +1,10 @@
+import os
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import List
+
+import anyio.to_thread
+from dotenv import load_dotenv
 from fastapi import FastAPI
 
 from .api.auth_router import router as auth_router               
@@ -8,11 +15,61 @@ from .api.learning_progress_router import router as learning_progress_router
 from .api.feedback_router import router as feedback_router
 from .api.recommendation_router import router as recommendation_router
 from .api.learning_record_router import router as learning_record_router
+from .api.export_router import router as export_router
+from .api.metrics_router import router as metrics_router
+from .events import (
+    BatchIngested, EnrollmentCancelled, EnrollmentCreated, Event, FeedbackSubmitted,
+    LearnerRegistered, ProgressUpdated, events,
+)
+from .hashing import hasher
+from .repository import store
+from .metrics import METRICS_ENABLED, MetricsMiddleware, metrics
+from .recommender import engine
+
+load_dotenv()
+
+# Threads for blocking storage calls, the export stream and other offloaded
+# work; AnyIO's default is 40.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", 40))
+
+
+async def count_events(batch: List[Event]) -> None:
+    metrics.observe_domain_events(Counter(type(event).__name__ for event in batch))
+
+
+async def refresh_recommendations(batch: List[Event]) -> None:
+    # Rebuilds only when the model is past its refresh interval, so the
+    # rebuild lands here instead of on the next recommendation request.
+    await anyio.to_thread.run_sync(engine.model)
+
+
+events.subscribe(
+    "analytics", count_events,
+    LearnerRegistered, EnrollmentCreated, EnrollmentCancelled, ProgressUpdated,
+    FeedbackSubmitted, BatchIngested,
+)
+events.subscribe(
+    "recommender", refresh_recommendations,
+    EnrollmentCreated, EnrollmentCancelled, ProgressUpdated, FeedbackSubmitted, BatchIngested,
+    batch_seconds=1.0,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    await events.start()
+    yield
+    await events.stop()
+    hasher.shutdown()
+    store.close()
+
 
 app = FastAPI(
     title="Lernex API",
     description="API dasar untuk Lernex - Digital Learning Marketplace",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.include_router(auth_router)                                  
@@ -23,6 +80,11 @@ app.include_router(learning_progress_router)
 app.include_router(feedback_router)
 app.include_router(recommendation_router)
 app.include_router(learning_record_router)
+app.include_router(export_router)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    app.include_router(metrics_router)
 
 
 @app.get("/")
@@ -0,0 +1,233 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() not in ("0", "false", "no")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# bcrypt sits around 0.1-0.5s per call at the default cost factor.
+HASHING_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0)
+JWT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are stored per bucket, not cumulative."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(names: Sequence[str], values: Sequence) -> str:
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+
+class Exposition:
+    """Builds a Prometheus text-format (0.0.4) document."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def header(self, name: str, kind: str, help_text: str) -> None:
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value: float, names: Sequence[str] = (), values: Sequence = ()) -> None:
+        labels = _labels(names, values)
+        self.lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+
+    def simple(self, name: str, kind: str, help_text: str, samples: Iterable[Tuple[Sequence, float]],
+               names: Sequence[str] = ()) -> None:
+        self.header(name, kind, help_text)
+        for values, value in samples:
+            self.sample(name, value, names, values)
+
+    def histograms(self, name: str, help_text: str, series: Dict[Tuple, Histogram],
+                   names: Sequence[str]) -> None:
+        self.header(name, "histogram", help_text)
+        for values, histogram in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                self.sample(f"{name}_bucket", cumulative, (*names, "le"), (*values, bound))
+            self.sample(f"{name}_bucket", histogram.count, (*names, "le"), (*values, "+Inf"))
+            self.sample(f"{name}_sum", histogram.sum, names, values)
+            self.sample(f"{name}_count", histogram.count, names, values)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+class Metrics:
+    """Process-wide request, hashing and token-decode measurements.
+
+    Updates are a dict lookup and a few integer adds under one lock, cheap
+    enough to run on every request. Series are labelled by route template,
+    never by raw path, so cardinality stays bounded by the route table.
+    """
+
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.in_flight = 0
+        self.password_hashing: Dict[Tuple[str], Histogram] = {}
+        self.jwt_decode = Histogram(JWT_BUCKETS)
+        self.login_throttled: Dict[Tuple[str], int] = {}
+        self.domain_events: Dict[Tuple[str], int] = {}
+        self.events_handled: Dict[Tuple[str, str], int] = {}
+        self.event_backpressure: Dict[Tuple[str], int] = {}
+        self._lock = threading.Lock()
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            key = (method, route, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.latency.get((method, route))
+            if histogram is None:
+                histogram = self.latency[(method, route)] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def observe_password_hashing(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.password_hashing.get((operation,))
+            if histogram is None:
+                histogram = self.password_hashing[(operation,)] = Histogram(HASHING_BUCKETS)
+            histogram.observe(seconds)
+
+    def observe_jwt_decode(self, seconds: float) -> None:
+        with self._lock:
+            self.jwt_decode.observe(seconds)
+
+    def observe_login_throttled(self, scope: str) -> None:
+        with self._lock:
+            self.login_throttled[(scope,)] = self.login_throttled.get((scope,), 0) + 1
+
+    def observe_domain_events(self, counts: Dict[str, int]) -> None:
+        with self._lock:
+            for event, count in counts.items():
+                self.domain_events[(event,)] = self.domain_events.get((event,), 0) + count
+
+    def observe_events_handled(self, consumer: str, outcome: str, count: int) -> None:
+        with self._lock:
+            key = (consumer, outcome)
+            self.events_handled[key] = self.events_handled.get(key, 0) + count
+
+    def observe_event_backpressure(self, consumer: str) -> None:
+        with self._lock:
+            self.event_backpressure[(consumer,)] = self.event_backpressure.get((consumer,), 0) + 1
+
+    def expose(self, out: Exposition) -> None:
+        with self._lock:
+            out.simple(
+                "lernex_http_requests_total", "counter", "Requests served, by route and status.",
+                sorted(self.requests.items()), ("method", "route", "status"),
+            )
+            out.histograms(
+                "lernex_http_request_duration_seconds", "Request latency, by route.",
+                self.latency, ("method", "route"),
+            )
+            out.simple(
+                "lernex_http_requests_in_flight", "gauge", "Requests currently being served.",
+                [((), self.in_flight)],
+            )
+            out.histograms(
+                "lernex_password_hashing_seconds", "bcrypt compute time per hash/verify call.",
+                self.password_hashing, ("operation",),
+            )
+            out.histograms(
+                "lernex_jwt_decode_seconds", "Time spent decoding and verifying bearer tokens.",
+                {(): self.jwt_decode}, (),
+            )
+            out.simple(
+                "lernex_login_throttled_total", "counter",
+                "Login and register attempts refused, by the limit that was hit.",
+                sorted(self.login_throttled.items()), ("scope",),
+            )
+            out.simple(
+                "lernex_domain_events_total", "counter", "Domain events published, by type.",
+                sorted(self.domain_events.items()), ("event",),
+            )
+            out.simple(
+                "lernex_events_handled_total", "counter",
+                "Events handed to each consumer, by whether its handler succeeded.",
+                sorted(self.events_handled.items()), ("consumer", "outcome"),
+            )
+            out.simple(
+                "lernex_event_backpressure_total", "counter",
+                "Publishes that had to wait for room in a consumer's queue.",
+                sorted(self.event_backpressure.items()), ("consumer",),
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.latency.clear()
+            self.password_hashing.clear()
+            self.jwt_decode = Histogram(JWT_BUCKETS)
+            self.login_throttled.clear()
+            self.domain_events.clear()
+            self.events_handled.clear()
+            self.event_backpressure.clear()
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request against its route template."""
+
+    def __init__(self, app, metrics: "Metrics"):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.metrics.request_started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the shared scope.
+            route: Optional[object] = scope.get("route")
+            self.metrics.request_finished(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - start,
+            )
+
+
+metrics = Metrics()
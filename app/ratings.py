@@ -0,0 +1,163 @@
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .domain.feedback import Feedback
+from .repository import store
+from .repository.base import Store
+
+
+class RatingAggregate:
+    """Running rating totals for one course (or one comment category)."""
+
+    __slots__ = ("count", "total", "histogram", "categories")
+
+    def __init__(self, by_category: bool = True):
+        self.count = 0
+        self.total = 0
+        self.histogram = [0, 0, 0, 0, 0]
+        self.categories: Optional[Dict[str, "RatingAggregate"]] = {} if by_category else None
+
+    def add(self, value: int, category: str, sign: int = 1) -> None:
+        self.count += sign
+        self.total += sign * value
+        self.histogram[value - 1] += sign
+        if self.categories is not None:
+            bucket = self.categories.get(category)
+            if bucket is None:
+                bucket = self.categories[category] = RatingAggregate(by_category=False)
+            bucket.add(value, category, sign)
+            if not bucket.count:
+                del self.categories[category]
+
+    @property
+    def average(self) -> Optional[float]:
+        return round(self.total / self.count, 2) if self.count else None
+
+    def as_dict(self) -> Dict:
+        result = {
+            "count": self.count,
+            "average": self.average,
+            "histogram": {str(i + 1): n for i, n in enumerate(self.histogram)},
+        }
+        if self.categories is not None:
+            result["categories"] = {
+                name: bucket.as_dict() for name, bucket in sorted(self.categories.items())
+            }
+        return result
+
+
+class RatingsIndex:
+    """Per-course rating aggregates kept in step with the feedback repository.
+
+    Feedback written through :meth:`insert_if_absent`, :meth:`save`,
+    :meth:`save_many` or :meth:`insert_many_if_absent` is applied as an
+    O(1) delta per item. Any other change to the repository (a clear, a
+    write from another process sharing the SQLite file) shows up as a
+    version the index did not produce and triggers one full rebuild on the
+    next read. ``version`` moves whenever an aggregate does, so caches built
+    from the aggregates can key on it.
+
+    Writes and rebuilds hold the index lock for a whole batch, so callers
+    on the event loop run every index call on the threadpool, even on the
+    memory backend.
+    """
+
+    def __init__(self, store: Store):
+        self.store = store
+        self.version = 0
+        self._aggregates: Dict[str, RatingAggregate] = {}
+        self._synced_version: Optional[int] = None
+        self._lock = threading.RLock()
+
+    def _apply(self, feedback: Feedback, sign: int = 1) -> None:
+        aggregate = self._aggregates.get(feedback.course_id)
+        if aggregate is None:
+            aggregate = self._aggregates[feedback.course_id] = RatingAggregate()
+        aggregate.add(feedback.rating.value, feedback.rating.comment_category, sign)
+        if not aggregate.count:
+            del self._aggregates[feedback.course_id]
+
+    def _write(
+        self, items: Sequence[Feedback], write: Callable[[], Sequence[Feedback]]
+    ) -> Sequence[Feedback]:
+        """Run ``write``, which returns the items it stored, and apply them."""
+        repository = self.store.feedback
+        with self._lock:
+            before = repository.version
+            in_step = before == self._synced_version
+            previous: Dict[str, Feedback] = {}
+            if in_step:
+                for feedback in items:
+                    stored = repository.get(feedback.feedback_id)
+                    if stored is not None:
+                        previous[feedback.feedback_id] = stored
+            written = write()
+            if in_step:
+                for feedback in written:
+                    stored = previous.get(feedback.feedback_id)
+                    if stored is not None:
+                        self._apply(stored, -1)
+                    self._apply(feedback)
+                # Each stored row moves the version by one. Any other
+                # movement is a write this call did not apply (another
+                # process on the same SQLite file), so rebuild on next read.
+                after = repository.version
+                self._synced_version = after if after == before + len(written) else None
+            if written:
+                self.version += 1
+            return written
+
+    def insert_if_absent(self, feedback: Feedback) -> bool:
+        def write() -> Sequence[Feedback]:
+            return [feedback] if self.store.feedback.insert_if_absent(feedback) else []
+
+        return bool(self._write([feedback], write))
+
+    def save(self, feedback: Feedback) -> None:
+        def write() -> Sequence[Feedback]:
+            self.store.feedback.save(feedback)
+            return [feedback]
+
+        self._write([feedback], write)
+
+    def save_many(self, items: Sequence[Feedback]) -> None:
+        def write() -> Sequence[Feedback]:
+            self.store.feedback.save_many(items)
+            return items
+
+        self._write(items, write)
+
+    def insert_many_if_absent(self, items: Sequence[Feedback], atomic: bool = False) -> List[int]:
+        """Insert-only batch write; returns the positions whose ids were taken."""
+        taken: List[int] = []
+
+        def write() -> Sequence[Feedback]:
+            taken.extend(self.store.feedback.insert_many_if_absent(items, atomic))
+            if taken and atomic:
+                return []
+            skip = set(taken)
+            return [feedback for i, feedback in enumerate(items) if i not in skip]
+
+        self._write(items, write)
+        return taken
+
+    def sync(self) -> None:
+        version = self.store.feedback.version
+        if version == self._synced_version:
+            return
+        with self._lock:
+            version = self.store.feedback.version
+            if version == self._synced_version:
+                return
+            self._aggregates = {}
+            for feedback in self.store.feedback.list():
+                self._apply(feedback)
+            self._synced_version = version
+            self.version += 1
+
+    def get(self, course_id: str) -> RatingAggregate:
+        self.sync()
+        return self._aggregates.get(course_id) or RatingAggregate()
+
+
+ratings = RatingsIndex(store)
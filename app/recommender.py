@@ -0,0 +1,257 @@
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from scipy import sparse
+
+from .domain.course import Course
+from .domain.enrollment import EnrollmentStatus
+from .domain.learning_progress import ProgressStatus
+from .domain.user import Learner
+from .repository import store
+from .repository.base import Repository, Store
+
+load_dotenv()
+
+RECOMMENDER_NEIGHBORS = int(os.getenv("RECOMMENDER_NEIGHBORS", 50))
+RECOMMENDER_REFRESH_SECONDS = float(os.getenv("RECOMMENDER_REFRESH_SECONDS", 300))
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _WORD.findall(text.lower()) if text else []
+
+
+@dataclass
+class _Model:
+    learner_index: Dict[str, int]
+    course_ids: List[str]
+    interactions: sparse.csr_matrix
+    similarity: sparse.csr_matrix
+    recommendable: np.ndarray
+    popularity: np.ndarray
+    by_category: Dict[str, np.ndarray]
+    by_keyword: Dict[str, np.ndarray]
+    built_at: float
+
+
+def _iter_all(repository: Repository, chunk_size: int = 10_000) -> Iterable:
+    after = None
+    while True:
+        items, after = repository.page(chunk_size, after)
+        yield from items
+        if after is None:
+            return
+
+
+def _top_n_per_row(matrix: sparse.csr_matrix, n: int) -> sparse.csr_matrix:
+    """Keep only the ``n`` largest entries of every row."""
+    indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+    keep = np.ones(len(data), dtype=bool)
+    for row in range(matrix.shape[0]):
+        start, end = indptr[row], indptr[row + 1]
+        if end - start > n:
+            drop = np.argpartition(data[start:end], end - start - n)[: end - start - n]
+            keep[start + drop] = False
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(indptr))[keep]
+    return sparse.csr_matrix(
+        (data[keep], (rows, indices[keep])), shape=matrix.shape
+    )
+
+
+class RecommendationEngine:
+    """Item-item collaborative filtering over enrollments, progress and ratings.
+
+    Every (learner, course) pair gets an implicit-feedback weight: 1 for an
+    active or completed enrollment, plus the progress completion rate (1 if
+    completed), plus ``(rating - 3) / 2`` from feedback, floored at 0.1. The
+    learner x course matrix is kept sparse; course-course cosine similarity
+    is ``Xn.T @ Xn`` on the column-normalised matrix, pruned to the top
+    ``neighbors`` per course. A learner's scores are then one sparse
+    row-times-matrix product.
+
+    Learners with no interactions fall back to their ``PreferenceProfile``
+    (preferred category and interest keywords matched against the catalog),
+    with course popularity breaking ties.
+
+    The model is rebuilt lazily: when the source repositories have changed
+    and the current model is older than ``refresh_seconds``. Requests never
+    wait for a rebuild another thread is already running.
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        neighbors: int = RECOMMENDER_NEIGHBORS,
+        refresh_seconds: float = RECOMMENDER_REFRESH_SECONDS,
+    ):
+        self.store = store
+        self.neighbors = neighbors
+        self.refresh_seconds = refresh_seconds
+        self._model: Optional[_Model] = None
+        self._source_version: Optional[Tuple[int, ...]] = None
+        self._lock = threading.Lock()
+
+    def _versions(self) -> Tuple[int, ...]:
+        return (
+            self.store.enrollments.version,
+            self.store.progress.version,
+            self.store.feedback.version,
+            self.store.courses.version,
+        )
+
+    def interactions(self) -> Dict[Tuple[str, str], float]:
+        weights: Dict[Tuple[str, str], float] = {}
+        for enrollment in _iter_all(self.store.enrollments):
+            if enrollment.status != EnrollmentStatus.CANCELLED:
+                key = (enrollment.learner_id, enrollment.course_id)
+                weights[key] = weights.get(key, 0.0) + 1.0
+        for progress in _iter_all(self.store.progress):
+            key = (progress.learner_id, progress.course_id)
+            done = progress.status == ProgressStatus.COMPLETED
+            weights[key] = weights.get(key, 0.0) + (1.0 if done else progress.completion_rate)
+        for feedback in _iter_all(self.store.feedback):
+            key = (feedback.learner_id, feedback.course_id)
+            weights[key] = weights.get(key, 0.0) + (feedback.rating.value - 3) / 2
+        return {key: max(weight, 0.1) for key, weight in weights.items()}
+
+    def fit(
+        self,
+        learner_ids: Sequence[str],
+        course_ids: Sequence[str],
+        weights: Sequence[float],
+        catalog: Sequence[Course],
+    ) -> None:
+        """Build the model from parallel arrays of interactions."""
+        learner_index: Dict[str, int] = {}
+        course_index: Dict[str, int] = {}
+        all_courses: List[str] = []
+        for course in catalog:
+            if course.course_id not in course_index:
+                course_index[course.course_id] = len(all_courses)
+                all_courses.append(course.course_id)
+        recommendable_count = len(all_courses)
+
+        rows = np.fromiter(
+            (learner_index.setdefault(l, len(learner_index)) for l in learner_ids),
+            dtype=np.int64, count=len(learner_ids),
+        )
+        cols = np.empty(len(course_ids), dtype=np.int64)
+        for i, course_id in enumerate(course_ids):
+            index = course_index.get(course_id)
+            if index is None:
+                index = course_index[course_id] = len(all_courses)
+                all_courses.append(course_id)
+            cols[i] = index
+
+        shape = (len(learner_index), len(all_courses))
+        matrix = sparse.csr_matrix(
+            (np.asarray(weights, dtype=np.float32), (rows, cols)), shape=shape
+        )
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+        inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        normalised = matrix @ sparse.diags(inverse.astype(np.float32))
+        similarity = (normalised.T @ normalised).tocsr()
+        similarity.setdiag(0)
+        similarity.eliminate_zeros()
+        similarity = _top_n_per_row(similarity, self.neighbors)
+
+        recommendable = np.zeros(len(all_courses), dtype=bool)
+        recommendable[:recommendable_count] = True
+        counts = np.asarray((matrix > 0).sum(axis=0)).ravel().astype(np.float64)
+        popularity = counts / (counts.max() + 1.0) if len(counts) else counts
+
+        by_category: Dict[str, List[int]] = {}
+        by_keyword: Dict[str, List[int]] = {}
+        for course in catalog:
+            index = course_index[course.course_id]
+            category = course.detail.category if course.detail else None
+            if category:
+                by_category.setdefault(category.lower(), []).append(index)
+            words = set(tokenize(course.title)) | set(tokenize(course.description))
+            if category:
+                words |= set(tokenize(category))
+            for word in words:
+                by_keyword.setdefault(word, []).append(index)
+
+        self._model = _Model(
+            learner_index=learner_index,
+            course_ids=all_courses,
+            interactions=matrix,
+            similarity=similarity,
+            recommendable=recommendable,
+            popularity=popularity,
+            by_category={k: np.array(v) for k, v in by_category.items()},
+            by_keyword={k: np.array(v) for k, v in by_keyword.items()},
+            built_at=time.monotonic(),
+        )
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        version = self._versions()
+        weights = self.interactions()
+        learner_ids = [learner_id for learner_id, _ in weights]
+        course_ids = [course_id for _, course_id in weights]
+        self.fit(learner_ids, course_ids, list(weights.values()), self.store.courses.list())
+        self._source_version = version
+
+    def model(self) -> _Model:
+        model = self._model
+        stale = model is None or (
+            self._source_version != self._versions()
+            and time.monotonic() - model.built_at >= self.refresh_seconds
+        )
+        if stale and self._lock.acquire(blocking=model is None):
+            try:
+                if self._model is model:
+                    self._refresh()
+            finally:
+                self._lock.release()
+        return self._model
+
+    def recommend(self, learner: Learner, k: int = 10) -> List[str]:
+        model = self.model()
+        scores = np.zeros(len(model.course_ids))
+        seen = np.zeros(len(model.course_ids), dtype=bool)
+
+        row = model.learner_index.get(learner.learner_id)
+        if row is not None:
+            history = model.interactions[row]
+            seen[history.indices] = True
+            scores += (history @ model.similarity).toarray().ravel()
+
+        if not scores.any():
+            preferences = learner.profile.preferences if learner.profile else None
+            if preferences is not None:
+                category = (preferences.preferred_category or "").lower()
+                if category in model.by_category:
+                    scores[model.by_category[category]] += 2.0
+                for interest in preferences.interests:
+                    for word in tokenize(interest):
+                        if word in model.by_keyword:
+                            scores[model.by_keyword[word]] += 1.0
+
+        scores[seen | ~model.recommendable] = -np.inf
+
+        candidates = int(np.count_nonzero(np.isfinite(scores)))
+        k = min(k, candidates)
+        if k <= 0:
+            return []
+        # Popularity only breaks ties: take every course scoring at least the
+        # k-th best, then order by score and, within a score, by popularity.
+        cutoff = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        top = np.flatnonzero(scores >= cutoff)
+        top = top[np.lexsort((-model.popularity[top], -scores[top]))][:k]
+        return [model.course_ids[i] for i in top]
+
+
+engine = RecommendationEngine(store)
@@ -0,0 +1,36 @@
+import os
+
+from dotenv import load_dotenv
+
+from .base import Store
+
+load_dotenv()
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "memory")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "lernex.db")
+# Number of uvicorn worker processes; more than one needs a shared backend.
+WORKERS = int(os.getenv("WORKERS", 1))
+# Journal directory for the memory backend; empty disables persistence.
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", "")
+JOURNAL_SNAPSHOT_SECONDS = float(os.getenv("JOURNAL_SNAPSHOT_SECONDS", 300))
+JOURNAL_SNAPSHOT_RECORDS = int(os.getenv("JOURNAL_SNAPSHOT_RECORDS", 1_000_000))
+
+
+def create_store(backend: str = STORAGE_BACKEND, workers: int = WORKERS) -> Store:
+    if backend == "memory":
+        if workers > 1:
+            raise RuntimeError(
+                f"WORKERS={workers} needs STORAGE_BACKEND=sqlite: the memory "
+                "backend would give every worker its own copy of the data"
+            )
+        from .memory import create_memory_store
+        return create_memory_store(
+            JOURNAL_DIR, JOURNAL_SNAPSHOT_SECONDS, JOURNAL_SNAPSHOT_RECORDS
+        )
+    if backend == "sqlite":
+        from .sqlite import create_sqlite_store
+        return create_sqlite_store(SQLITE_PATH)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend!r}")
+
+
+store = create_store()
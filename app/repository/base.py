@@ -0,0 +1,244 @@
+import functools
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+import anyio
+from pydantic import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def column_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+class DuplicateKeyError(ValueError):
+    """Raised when a save would break a unique secondary index."""
+
+    def __init__(self, field: str, value: Any):
+        super().__init__(f"{field} {value!r} already exists")
+        self.field = field
+        self.value = value
+
+
+class Repository(ABC, Generic[T]):
+    """Keyed collection of domain models.
+
+    Routers only talk to this interface, so the backing store (plain dicts,
+    SQLite, ...) can be swapped without touching the API layer.
+
+    Every method has an ``a``-prefixed async twin for the routers. A
+    backend whose reads or writes may block on I/O leaves
+    ``blocking_reads`` / ``blocking_writes`` set, and those calls run on
+    the AnyIO threadpool; the rest run inline on the event loop.
+    """
+
+    blocking_reads = True
+    blocking_writes = True
+
+    def __init__(
+        self,
+        model: type,
+        key_field: str,
+        indexed: Sequence[str] = (),
+        unique: Optional[Dict[str, Callable[[Any], Any]]] = None,
+    ):
+        self.model = model
+        self.key_field = key_field
+        # Non-unique secondary indexes used by ``find_by``.
+        self.indexed = tuple(indexed)
+        # Unique secondary indexes: field name -> normaliser applied to the
+        # value before it is indexed or looked up.
+        self.unique = dict(unique or {})
+
+    def key_of(self, item: T) -> str:
+        return getattr(item, self.key_field)
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[T]:
+        ...
+
+    @abstractmethod
+    def get_by(self, field: str, value: Any) -> Optional[T]:
+        """Look ``value`` up through the unique index on ``field``."""
+
+    @abstractmethod
+    def save(self, item: T) -> None:
+        """Insert ``item``, replacing any existing entry with the same key.
+
+        Raises ``DuplicateKeyError`` if another item already holds one of
+        its unique values.
+        """
+
+    def save_many(self, items: Sequence[T]) -> None:
+        for item in items:
+            self.save(item)
+
+    @abstractmethod
+    def insert_if_absent(self, item: T) -> bool:
+        """Atomically insert ``item`` unless its key is taken.
+
+        Returns ``False`` (and writes nothing) if the key already exists.
+        Unique-index clashes still raise ``DuplicateKeyError``.
+        """
+
+    @abstractmethod
+    def insert_many_if_absent(self, items: Sequence[T], atomic: bool = False) -> List[int]:
+        """Insert every item whose key is free, checking each key atomically.
+
+        Returns the positions in ``items`` whose keys were already taken;
+        those items are not written and nothing is overwritten. With
+        ``atomic`` nothing at all is left written if any key is taken.
+        """
+
+    @abstractmethod
+    def compare_and_set(self, expected: Optional[T], item: T) -> bool:
+        """Atomically replace the stored item if it still equals ``expected``.
+
+        ``expected=None`` means the key must be absent, i.e. an insert.
+        Returns ``False`` without writing when another writer got there
+        first; the caller re-reads and retries.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def list(self) -> List[T]:
+        ...
+
+    @abstractmethod
+    def find_by(self, field: str, value: Any) -> List[T]:
+        ...
+
+    @abstractmethod
+    def page(
+        self, limit: int, after: Optional[int] = None, **filters: Any
+    ) -> Tuple[List[T], Optional[int]]:
+        """Return up to ``limit`` items positioned after ``after``.
+
+        Items are ordered by a position assigned on first insert that never
+        changes, so paging stays stable while other rows are written. Filters
+        set to ``None`` are ignored; the rest must be indexed fields. A tuple
+        value matches any of its members. The second element is the position
+        to resume from, or ``None`` when this was the last page.
+        """
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        """Counter bumped once per row written; lets caches detect changes cheaply."""
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return self.count()
+
+    async def _call(self, blocking: bool, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        if not blocking:
+            return fn(*args, **kwargs)
+        return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+
+    async def run_read(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn``, which reads this repository, the way ``aget`` would."""
+        return await self._call(self.blocking_reads, fn, *args, **kwargs)
+
+    async def run_write(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn``, which writes this repository, the way ``asave`` would."""
+        return await self._call(self.blocking_writes, fn, *args, **kwargs)
+
+    async def aget(self, key: str) -> Optional[T]:
+        return await self._call(self.blocking_reads, self.get, key)
+
+    async def aget_by(self, field: str, value: Any) -> Optional[T]:
+        return await self._call(self.blocking_reads, self.get_by, field, value)
+
+    async def acontains(self, key: str) -> bool:
+        return await self.aget(key) is not None
+
+    async def asave(self, item: T) -> None:
+        await self._call(self.blocking_writes, self.save, item)
+
+    async def asave_many(self, items: Sequence[T]) -> None:
+        # A batch is bulk work even in memory, so it never runs inline.
+        await self._call(True, self.save_many, items)
+
+    async def ainsert_if_absent(self, item: T) -> bool:
+        return await self._call(self.blocking_writes, self.insert_if_absent, item)
+
+    async def acompare_and_set(self, expected: Optional[T], item: T) -> bool:
+        return await self._call(self.blocking_writes, self.compare_and_set, expected, item)
+
+    async def adelete(self, key: str) -> bool:
+        return await self._call(self.blocking_writes, self.delete, key)
+
+    async def afind_by(self, field: str, value: Any) -> List[T]:
+        return await self._call(self.blocking_reads, self.find_by, field, value)
+
+    async def apage(
+        self, limit: int, after: Optional[int] = None, **filters: Any
+    ) -> Tuple[List[T], Optional[int]]:
+        return await self._call(self.blocking_reads, self.page, limit, after, **filters)
+
+    async def acount(self) -> int:
+        return await self._call(self.blocking_reads, self.count)
+
+
+class Store:
+    """Bundle of the repositories the routers work against."""
+
+    def __init__(
+        self,
+        learners: Repository,
+        instructors: Repository,
+        courses: Repository,
+        enrollments: Repository,
+        feedback: Repository,
+        progress: Repository,
+        records: Repository,
+        recommendations: Repository,
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        self.learners = learners
+        self.instructors = instructors
+        self.courses = courses
+        self.enrollments = enrollments
+        self.feedback = feedback
+        self.progress = progress
+        self.records = records
+        self.recommendations = recommendations
+        self._on_close = on_close
+
+    def repositories(self) -> Dict[str, Repository]:
+        return {
+            "learners": self.learners,
+            "instructors": self.instructors,
+            "courses": self.courses,
+            "enrollments": self.enrollments,
+            "feedback": self.feedback,
+            "progress": self.progress,
+            "records": self.records,
+            "recommendations": self.recommendations,
+        }
+
+    def close(self) -> None:
+        """Flush and release whatever the backend holds open."""
+        if self._on_close is not None:
+            self._on_close()
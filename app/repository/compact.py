@@ -0,0 +1,162 @@
+"""Compact in-memory records for the high-volume collections.
+
+A pydantic model instance carries a ``__dict__``, a fields-set set and its
+own ``datetime`` object, which is several hundred bytes per enrollment
+before any of the data. The memory backend keeps enrollments, progress and
+feedback as slotted records instead: ids that repeat across records
+(learner, course, category) are interned, timestamps are epoch
+microseconds and enums are the shared enum members. Records are turned
+back into models only when they leave the repository.
+
+For journal snapshots a record also converts to and from a row, a tuple of
+plain values (the enum as its value), so a snapshot is written and loaded
+without going through the models at all.
+
+Each record keeps the model's field names, so the repository indexes and
+filters read them with ``getattr`` exactly as they would a model.
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+
+from ..domain.enrollment import Enrollment, EnrollmentStatus
+from ..domain.feedback import Feedback, Rating
+from ..domain.learning_progress import LearningProgress, ProgressStatus
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+intern = sys.intern
+ENROLLMENT_STATUS = {status.value: status for status in EnrollmentStatus}
+PROGRESS_STATUS = {status.value: status for status in ProgressStatus}
+
+
+def to_micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // MICROSECOND
+
+
+def from_micros(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=value)
+
+
+class EnrollmentRecord:
+    __slots__ = ("enrollment_id", "learner_id", "course_id", "enrollment_date", "status")
+
+    @classmethod
+    def pack(cls, item: Enrollment) -> "EnrollmentRecord":
+        record = cls.__new__(cls)
+        record.enrollment_id = item.enrollment_id
+        record.learner_id = intern(item.learner_id)
+        record.course_id = intern(item.course_id)
+        record.enrollment_date = to_micros(item.enrollment_date)
+        record.status = item.status
+        return record
+
+    def unpack(self) -> Enrollment:
+        return Enrollment.model_construct(
+            enrollment_id=self.enrollment_id,
+            learner_id=self.learner_id,
+            course_id=self.course_id,
+            enrollment_date=from_micros(self.enrollment_date),
+            status=self.status,
+        )
+
+    def row(self) -> tuple:
+        return (
+            self.enrollment_id, self.learner_id, self.course_id,
+            self.enrollment_date, self.status.value,
+        )
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "EnrollmentRecord":
+        record = cls.__new__(cls)
+        record.enrollment_id, learner_id, course_id, record.enrollment_date, status = row
+        record.learner_id = intern(learner_id)
+        record.course_id = intern(course_id)
+        record.status = ENROLLMENT_STATUS[status]
+        return record
+
+
+class ProgressRecord:
+    __slots__ = (
+        "progress_id", "learner_id", "course_id", "completion_rate",
+        "last_accessed", "status", "completed_topics",
+    )
+
+    @classmethod
+    def pack(cls, item: LearningProgress) -> "ProgressRecord":
+        record = cls.__new__(cls)
+        record.progress_id = item.progress_id
+        record.learner_id = intern(item.learner_id)
+        record.course_id = intern(item.course_id)
+        record.completion_rate = item.completion_rate
+        record.last_accessed = to_micros(item.last_accessed)
+        record.status = item.status
+        record.completed_topics = item.completed_topics
+        return record
+
+    def unpack(self) -> LearningProgress:
+        return LearningProgress.model_construct(
+            progress_id=self.progress_id,
+            learner_id=self.learner_id,
+            course_id=self.course_id,
+            completion_rate=self.completion_rate,
+            last_accessed=from_micros(self.last_accessed),
+            status=self.status,
+            completed_topics=self.completed_topics,
+        )
+
+    def row(self) -> tuple:
+        return (
+            self.progress_id, self.learner_id, self.course_id, self.completion_rate,
+            self.last_accessed, self.status.value, self.completed_topics,
+        )
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "ProgressRecord":
+        record = cls.__new__(cls)
+        (record.progress_id, learner_id, course_id, record.completion_rate,
+         record.last_accessed, status, record.completed_topics) = row
+        record.learner_id = intern(learner_id)
+        record.course_id = intern(course_id)
+        record.status = PROGRESS_STATUS[status]
+        return record
+
+
+class FeedbackRecord:
+    __slots__ = ("feedback_id", "learner_id", "course_id", "comment", "value", "category")
+
+    @classmethod
+    def pack(cls, item: Feedback) -> "FeedbackRecord":
+        record = cls.__new__(cls)
+        record.feedback_id = item.feedback_id
+        record.learner_id = intern(item.learner_id)
+        record.course_id = intern(item.course_id)
+        record.comment = item.comment
+        record.value = item.rating.value
+        record.category = intern(item.rating.comment_category)
+        return record
+
+    def unpack(self) -> Feedback:
+        return Feedback.model_construct(
+            feedback_id=self.feedback_id,
+            learner_id=self.learner_id,
+            course_id=self.course_id,
+            comment=self.comment,
+            rating=Rating.model_construct(value=self.value, comment_category=self.category),
+        )
+
+    def row(self) -> tuple:
+        return (
+            self.feedback_id, self.learner_id, self.course_id,
+            self.comment, self.value, self.category,
+        )
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "FeedbackRecord":
+        record = cls.__new__(cls)
+        record.feedback_id, learner_id, course_id, record.comment, record.value, category = row
+        record.learner_id = intern(learner_id)
+        record.course_id = intern(course_id)
+        record.category = intern(category)
+        return record
@@ -0,0 +1,331 @@
+import gc
+import os
+import pickle
+import threading
+import time
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PUT = b"P"
+DELETE = b"D"
+CLEAR = b"C"
+
+# What a snapshot source hands over per collection: the stored values,
+# copied under the locks, and the function turning one into a row (None
+# when the values are pickled as they are).
+Snapshot = Tuple[int, Dict[str, Tuple[list, Optional[Callable[[Any], tuple]]]]]
+
+
+def _segment_name(generation: int) -> str:
+    return f"journal-{generation:08d}.log"
+
+
+def _snapshot_name(generation: int) -> str:
+    return f"snapshot-{generation:08d}.bin"
+
+
+def _lock_exclusive(f) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _generations(directory: str, prefix: str) -> List[int]:
+    found = []
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and not name.endswith(".tmp"):
+            found.append(int(name[len(prefix) + 1:].split(".")[0]))
+    return sorted(found)
+
+
+class JournalError(OSError):
+    """The flusher could not write the journal; nothing after it is durable."""
+
+
+class Journal:
+    """Append-only write-ahead journal with group commit and snapshots.
+
+    Each mutation is one line: ``<collection> <op> <payload>``, where the
+    payload is the model JSON for a put, the key for a delete and empty for
+    a clear. Writers append under the repository lock (so the journal order
+    is the apply order) and then wait, outside it, until a background
+    flusher has fsynced their line; one fsync covers everything appended
+    while the previous one ran.
+
+    Snapshots are taken in generations: the journal rolls over to a new
+    segment at the same instant the collections are copied, so snapshot N
+    plus segments >= N replay to the current state. Older segments and
+    snapshots are deleted once snapshot N is safely renamed into place.
+    Only that copy of the dict values happens under the locks; turning
+    them into rows and pickling them runs afterwards, and loading a
+    snapshot rebuilds the stored values without model validation.
+
+    A journal holds an exclusive lock on its directory until it is closed,
+    so a second process (another server, or a maintenance command) cannot
+    append to segments the first one would never read and then delete.
+    Recovery is meant to run with the directory's journal already open.
+
+    If a write or fsync fails (a full or failing disk) the flusher stops
+    and keeps the error: every :meth:`wait` still pending or made later,
+    and :meth:`rotate`, raise :class:`JournalError` instead of blocking.
+    """
+
+    def __init__(self, directory: str, snapshot_seconds: float = 300, snapshot_records: int = 1_000_000):
+        self.directory = directory
+        self.snapshot_seconds = snapshot_seconds
+        self.snapshot_records = snapshot_records
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(os.path.join(directory, "LOCK"), "a+b")
+        if not _lock_exclusive(self._lock_file):
+            self._lock_file.close()
+            raise JournalError(
+                f"journal directory {directory} is in use by another process; stop it first"
+            )
+        self.generation = max(
+            _generations(directory, "journal") + _generations(directory, "snapshot") + [0]
+        )
+        self._file = open(os.path.join(directory, _segment_name(self.generation)), "ab")
+        self._buffer: List[bytes] = []
+        self._appended = 0
+        self._flushed = 0
+        self._error: Optional[OSError] = None
+        self._since_snapshot = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stop = threading.Event()
+        self._snapshot_source: Optional[Callable[[], Snapshot]] = None
+        self._snapshot_lock = threading.Lock()
+        self._flusher = threading.Thread(target=self._flush_loop, name="journal-flush", daemon=True)
+        self._flusher.start()
+        self._snapshotter: Optional[threading.Thread] = None
+
+    # -- writing ---------------------------------------------------------
+
+    def append(self, collection: str, op: bytes, payload: bytes = b"") -> int:
+        """Queue one record; returns a ticket to pass to :meth:`wait`."""
+        line = collection.encode() + b" " + op + b" " + payload + b"\n"
+        with self._cond:
+            self._buffer.append(line)
+            self._appended += 1
+            self._since_snapshot += 1
+            self._cond.notify_all()
+            return self._appended
+
+    def wait(self, ticket: int) -> None:
+        """Block until the record behind ``ticket`` is on disk."""
+        with self._cond:
+            while self._flushed < ticket and not self._closed and self._error is None:
+                self._cond.wait()
+            self._raise_if_failed(ticket)
+
+    def _raise_if_failed(self, ticket: int) -> None:
+        if self._error is not None and self._flushed < ticket:
+            raise JournalError(f"journal write failed: {self._error}") from self._error
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._buffer and not self._closed:
+                    self._cond.wait()
+                if not self._buffer and self._closed:
+                    return
+                lines, self._buffer = self._buffer, []
+                ticket = self._appended
+                target = self._file
+            try:
+                target.write(b"".join(lines))
+                target.flush()
+                os.fsync(target.fileno())
+            except OSError as error:
+                with self._cond:
+                    self._error = error
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._flushed = ticket
+                self._cond.notify_all()
+
+    # -- snapshots -------------------------------------------------------
+
+    def start_snapshots(self, source: Callable[[], Snapshot]) -> None:
+        """Begin periodic background snapshots of what ``source`` returns.
+
+        ``source`` must, with every repository lock held, call
+        :meth:`rotate` and copy the stored values out, returning
+        ``(generation, {collection: (values, row)})``.
+        """
+        self._snapshot_source = source
+        self._snapshotter = threading.Thread(
+            target=self._snapshot_loop, name="journal-snapshot", daemon=True
+        )
+        self._snapshotter.start()
+
+    def _snapshot_loop(self) -> None:
+        last = time.monotonic()
+        while not self._stop.wait(min(1.0, self.snapshot_seconds)):
+            due = time.monotonic() - last >= self.snapshot_seconds
+            if (due and self._since_snapshot) or self._since_snapshot >= self.snapshot_records:
+                try:
+                    self.snapshot()
+                except JournalError:
+                    # The journal is dead; writers already see the error.
+                    return
+                last = time.monotonic()
+
+    def rotate(self) -> int:
+        """Start a new segment; the caller holds every repository lock."""
+        with self._cond:
+            # Whatever is still buffered belongs to the old segment.
+            while self._flushed < self._appended and not self._closed and self._error is None:
+                self._cond.wait()
+            self._raise_if_failed(self._appended)
+            self._file.close()
+            self.generation += 1
+            self._file = open(os.path.join(self.directory, _segment_name(self.generation)), "ab")
+            self._since_snapshot = 0
+            return self.generation
+
+    def snapshot(self) -> Optional[int]:
+        """Write a compacted snapshot now; returns its generation."""
+        if self._snapshot_source is None:
+            return None
+        with self._snapshot_lock:
+            generation, collections = self._snapshot_source()
+            path = os.path.join(self.directory, _snapshot_name(generation))
+            with open(path + ".tmp", "wb") as f:
+                for name, (values, row) in collections.items():
+                    rows = list(map(row, values)) if row else values
+                    body = pickle.dumps(rows, pickle.HIGHEST_PROTOCOL)
+                    f.write(f"{name} {len(body)}\n".encode())
+                    f.write(body)
+                    f.write(b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + ".tmp", path)
+            self._fsync_directory()
+            for old in _generations(self.directory, "snapshot"):
+                if old < generation:
+                    os.remove(os.path.join(self.directory, _snapshot_name(old)))
+            for old in _generations(self.directory, "journal"):
+                if old < generation:
+                    os.remove(os.path.join(self.directory, _segment_name(old)))
+            return generation
+
+    def _fsync_directory(self) -> None:
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._stop.set()
+        self._flusher.join()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        self._file.close()
+        self._lock_file.close()
+
+    # -- recovery --------------------------------------------------------
+
+    @staticmethod
+    def recover(
+        directory: str, collections: Dict[str, Tuple[dict, type, str, Optional[type]]]
+    ) -> Tuple[bool, int]:
+        """Load the latest snapshot and replay the journal tail in place.
+
+        ``collections`` maps a name to ``(data, model, key_field, record)``,
+        where ``record`` is the compact record type the collection is kept
+        as, or None. With a snapshot every ``data`` dict is replaced by its
+        contents; without one the journal is replayed over whatever ``data``
+        already holds (the catalog seeded in code). Returns
+        ``(from_snapshot, replayed)``.
+        """
+        if not os.path.isdir(directory):
+            return False, 0
+        # Recovery allocates millions of acyclic rows and records; with the
+        # cycle collector running it would rescan them over and over.
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return Journal._recover(directory, collections)
+        finally:
+            gc.freeze()
+            if enabled:
+                gc.enable()
+
+    @staticmethod
+    def _recover(
+        directory: str, collections: Dict[str, Tuple[dict, type, str, Optional[type]]]
+    ) -> Tuple[bool, int]:
+        snapshots = _generations(directory, "snapshot")
+        base = snapshots[-1] if snapshots else 0
+        if snapshots:
+            for data, _, _, _ in collections.values():
+                data.clear()
+            for name, rows in _read_snapshot(os.path.join(directory, _snapshot_name(base)), collections):
+                data, _, key_field, record = collections[name]
+                items = list(map(record.from_row, rows)) if record else rows
+                data.update(zip(map(attrgetter(key_field), items), items))
+        replayed = 0
+        for generation in _generations(directory, "journal"):
+            if generation < base:
+                continue
+            for name, op, payload in _read_segment(os.path.join(directory, _segment_name(generation))):
+                if name not in collections:
+                    continue
+                data, model, key_field, record = collections[name]
+                replayed += 1
+                if op == PUT:
+                    item = model.model_validate_json(payload)
+                    data[getattr(item, key_field)] = record.pack(item) if record else item
+                elif op == DELETE:
+                    data.pop(payload.decode(), None)
+                elif op == CLEAR:
+                    data.clear()
+        return bool(snapshots), replayed
+
+
+def _read_snapshot(path: str, collections: Dict[str, tuple]) -> Iterator[Tuple[str, list]]:
+    with open(path, "rb") as f:
+        while True:
+            header = f.readline()
+            if not header:
+                return
+            name, size = header.decode().split()
+            body = f.read(int(size))
+            f.readline()
+            # Snapshots are only ever read back from our own journal
+            # directory, so unpickling them trusts nothing new.
+            if name in collections:
+                yield name, pickle.loads(body)
+
+
+def _read_segment(path: str) -> Iterator[Tuple[str, bytes, bytes]]:
+    end = 0
+    with open(path, "rb") as f:
+        for line in f:
+            # A crash can leave a torn last line without its newline. It is
+            # cut off, or the next process would append onto it.
+            if not line.endswith(b"\n"):
+                os.truncate(path, end)
+                return
+            end += len(line)
+            name, op, payload = line[:-1].split(b" ", 2)
+            yield name.decode(), op, payload
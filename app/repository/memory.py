@@ -0,0 +1,468 @@
+import itertools
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from contextlib import ExitStack
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .base import DuplicateKeyError, Repository, Store, T, column_value, normalize_email
+from .compact import EnrollmentRecord, FeedbackRecord, ProgressRecord
+from .journal import CLEAR, DELETE, PUT, Journal, Snapshot
+from .. import storage
+from ..domain.course import Course, Instructor
+from ..domain.enrollment import Enrollment
+from ..domain.feedback import Feedback
+from ..domain.learning_progress import LearningProgress
+from ..domain.learning_record import LearningRecord
+from ..domain.recommendation import Recommendation
+from ..domain.user import Learner
+
+
+class MemoryRepository(Repository[T]):
+    """Repository backed by one of the module-level dicts in ``storage.py``.
+
+    Every key gets a position (a sequence number) the first time it is
+    inserted. Unique indexes are plain ``value -> key`` dicts and secondary
+    indexes map a value to the sorted list of positions holding it, which
+    gives both ``find_by`` and cursor paging without scanning the data. All
+    of it is updated under one lock, so a reader never sees an index out of
+    step with the dict.
+
+    Per-key writes additionally hold one of ``stripes`` locks picked by key
+    hash. ``insert_if_absent`` and ``compare_and_set`` do their check under
+    that stripe, so writers racing on the same key serialize there, while
+    duplicates are rejected and stale compares fail without ever taking the
+    shared index lock.
+
+    Batch writes take the index lock one ``chunk_size`` slice at a time, so
+    the inline reads and writes on the event loop wait for at most a chunk,
+    never a whole batch. Readers may therefore see a batch partly written
+    while it runs, and other writers may land between chunks. An atomic
+    ``insert_many_if_absent`` checks every key and reserves them all under
+    one lock hold before it writes any row, so it writes either nothing or
+    every item: a reserved key counts as taken for every other insert, and
+    a plain ``save`` that lands on one is ordered after the batch.
+
+    With a ``journal`` every mutation is appended under the index lock, in
+    apply order, and the writer then waits for the group-commit fsync after
+    releasing its locks.
+
+    With a ``record`` type (see ``compact.py``) the dict holds compact
+    records instead of models; items are packed on the way in and unpacked
+    into models on the way out.
+    """
+
+    stripes = 64
+    chunk_size = 1_000
+    blocking_reads = False
+
+    def __init__(
+        self,
+        data: Dict[str, T],
+        model: type,
+        key_field: str,
+        indexed: Sequence[str] = (),
+        unique: Optional[Dict[str, Callable[[Any], Any]]] = None,
+        journal: Optional[Journal] = None,
+        name: str = "",
+        record: Optional[type] = None,
+    ):
+        super().__init__(model, key_field, indexed, unique)
+        self._data = data
+        self.journal = journal
+        self.name = name
+        self.record = record
+        self._pack = record.pack if record else _same
+        self._unpack = record.unpack if record else _same
+        self._lock = threading.RLock()
+        self._stripe_locks = [threading.Lock() for _ in range(self.stripes)]
+        self._reserved: Set[str] = set()
+        self._version = 0
+        if record is not None:
+            for key, item in data.items():
+                if not isinstance(item, record):
+                    data[key] = record.pack(item)
+        # Whatever ``data`` already holds (a restored snapshot) is indexed in
+        # one pass per field: positions are handed out in order, so every
+        # bucket is built by appending.
+        seqs = range(1, len(data) + 1)
+        self._next_seq = itertools.count(len(data) + 1)
+        self._seq_of: Dict[str, int] = dict(zip(data, seqs))
+        self._key_at: Dict[int, str] = dict(zip(seqs, data))
+        self._order: List[int] = list(seqs)
+        self._unique_index: Dict[str, Dict[Any, str]] = {
+            field: {normalize(getattr(item, field)): key for key, item in data.items()}
+            for field, normalize in self.unique.items()
+        }
+        self._index_by: Dict[str, Dict[Any, List[int]]] = {}
+        for field in self.indexed:
+            buckets = defaultdict(list)
+            for seq, value in zip(seqs, map(attrgetter(field), data.values())):
+                buckets[value].append(seq)
+            index = self._index_by[field] = {}
+            for value, positions in buckets.items():
+                value = column_value(value)
+                if value in index:
+                    positions = sorted(index[value] + positions)
+                index[value] = positions
+
+    def _assign(self, key: str) -> int:
+        seq = next(self._next_seq)
+        self._seq_of[key] = seq
+        self._key_at[seq] = key
+        self._order.append(seq)
+        return seq
+
+    def _release(self, key: str) -> None:
+        seq = self._seq_of.pop(key)
+        del self._key_at[seq]
+        del self._order[bisect_left(self._order, seq)]
+
+    def _index(self, key: str, item: T) -> None:
+        for field, normalize in self.unique.items():
+            self._unique_index[field][normalize(getattr(item, field))] = key
+        seq = self._seq_of[key]
+        for field in self.indexed:
+            value = column_value(getattr(item, field))
+            positions = self._index_by[field].setdefault(value, [])
+            if not positions or positions[-1] < seq:
+                positions.append(seq)
+            else:
+                insort(positions, seq)
+
+    def _unindex(self, key: str, item: T) -> None:
+        for field, normalize in self.unique.items():
+            self._unique_index[field].pop(normalize(getattr(item, field)), None)
+        seq = self._seq_of[key]
+        for field in self.indexed:
+            value = column_value(getattr(item, field))
+            positions = self._index_by[field].get(value)
+            if positions is None:
+                continue
+            i = bisect_left(positions, seq)
+            if i < len(positions) and positions[i] == seq:
+                del positions[i]
+            if not positions:
+                del self._index_by[field][value]
+
+    def _log(self, op: bytes, payload: bytes = b"") -> int:
+        return self.journal.append(self.name, op, payload) if self.journal else 0
+
+    def _log_put(self, item: T) -> int:
+        if not self.journal:
+            return 0
+        return self._log(PUT, self.model.__pydantic_serializer__.to_json(item))
+
+    @property
+    def blocking_writes(self) -> bool:
+        # Without a journal a write never waits on anything but our locks.
+        return self.journal is not None
+
+    def _durable(self, ticket: int) -> None:
+        if ticket:
+            self.journal.wait(ticket)
+
+    def get(self, key: str) -> Optional[T]:
+        item = self._data.get(key)
+        return self._unpack(item) if item is not None else None
+
+    def get_by(self, field: str, value: Any) -> Optional[T]:
+        key = self._unique_index[field].get(self.unique[field](value))
+        return self.get(key) if key is not None else None
+
+    def _unpack_all(self, items) -> List[T]:
+        return list(map(self._unpack, items)) if self.record else list(items)
+
+    def _stripe(self, key: str) -> threading.Lock:
+        return self._stripe_locks[hash(key) % self.stripes]
+
+    def save(self, item: T) -> None:
+        with self._stripe(self.key_of(item)), self._lock:
+            self._save(item)
+            self._version += 1
+            ticket = self._log_put(item)
+        self._durable(ticket)
+
+    def insert_if_absent(self, item: T) -> bool:
+        return self.compare_and_set(None, item)
+
+    def compare_and_set(self, expected: Optional[T], item: T) -> bool:
+        key = self.key_of(item)
+        with self._stripe(key):
+            current = self._data.get(key)
+            if current is not expected and (current is None or self._unpack(current) != expected):
+                return False
+            with self._lock:
+                # save_many and clear skip the stripes, so confirm nothing
+                # moved between the check and taking the index lock.
+                if self._data.get(key) is not current:
+                    return False
+                if current is None and key in self._reserved:
+                    return False
+                self._save(item)
+                self._version += 1
+                ticket = self._log_put(item)
+        self._durable(ticket)
+        return True
+
+    def _chunks(self, count: int):
+        for start in range(0, count, self.chunk_size):
+            yield range(start, min(start + self.chunk_size, count))
+
+    def save_many(self, items: Sequence[T]) -> None:
+        ticket = 0
+        for chunk in self._chunks(len(items)):
+            with self._lock:
+                for i in chunk:
+                    self._save(items[i])
+                    self._version += 1
+                    ticket = self._log_put(items[i])
+        self._durable(ticket)
+
+    def insert_many_if_absent(self, items: Sequence[T], atomic: bool = False) -> List[int]:
+        if atomic:
+            return self._insert_all_or_none(items)
+        # Each key is checked and inserted under the same lock hold.
+        taken: List[int] = []
+        ticket = 0
+        for chunk in self._chunks(len(items)):
+            with self._lock:
+                for i in chunk:
+                    key = self.key_of(items[i])
+                    if key in self._data or key in self._reserved:
+                        taken.append(i)
+                    else:
+                        self._save(items[i])
+                        self._version += 1
+                        ticket = self._log_put(items[i])
+        self._durable(ticket)
+        return taken
+
+    def _insert_all_or_none(self, items: Sequence[T]) -> List[int]:
+        keys = [self.key_of(item) for item in items]
+        with self._lock:
+            taken = self._check_free(items, keys)
+            if taken:
+                return taken
+            self._reserved.update(keys)
+        inserted: List[Tuple[str, Any]] = []
+        ticket = 0
+        try:
+            for chunk in self._chunks(len(items)):
+                with self._lock:
+                    for i in chunk:
+                        self._reserved.discard(keys[i])
+                        # A save that landed on the reservation is ordered
+                        # after the batch, so its row stays.
+                        if keys[i] in self._data:
+                            continue
+                        self._save(items[i])
+                        self._version += 1
+                        ticket = self._log_put(items[i])
+                        inserted.append((keys[i], self._data[keys[i]]))
+        except Exception:
+            # A unique value claimed by another writer since the check.
+            with self._lock:
+                self._reserved.difference_update(keys)
+            self._durable(self._undo(inserted) or ticket)
+            raise
+        self._durable(ticket)
+        return []
+
+    def _check_free(self, items: Sequence[T], keys: Sequence[str]) -> List[int]:
+        """Positions whose key is taken; raise on a unique clash. Needs the lock."""
+        taken: List[int] = []
+        seen = set()
+        claimed: Dict[str, Dict[Any, str]] = {field: {} for field in self.unique}
+        for i, (item, key) in enumerate(zip(items, keys)):
+            if key in self._data or key in self._reserved or key in seen:
+                taken.append(i)
+                continue
+            seen.add(key)
+            for field, normalize in self.unique.items():
+                value = normalize(getattr(item, field))
+                owner = self._unique_index[field].get(value, claimed[field].get(value))
+                if owner is not None and owner != key:
+                    raise DuplicateKeyError(field, value)
+                claimed[field][value] = key
+        return taken
+
+    def _undo(self, inserted: Sequence[Tuple[str, Any]]) -> int:
+        """Remove the ``(key, stored)`` entries nobody has replaced since."""
+        ticket = 0
+        for chunk in self._chunks(len(inserted)):
+            with self._lock:
+                for i in chunk:
+                    key, stored = inserted[i]
+                    if self._data.get(key) is stored:
+                        self._remove(key)
+                        self._version += 1
+                        ticket = self._log(DELETE, key.encode())
+        return ticket
+
+    def _save(self, item: T) -> None:
+        key = self.key_of(item)
+        for field, normalize in self.unique.items():
+            value = normalize(getattr(item, field))
+            owner = self._unique_index[field].get(value)
+            if owner is not None and owner != key:
+                raise DuplicateKeyError(field, value)
+        previous = self._data.get(key)
+        if previous is not None:
+            self._unindex(key, previous)
+        else:
+            self._assign(key)
+        item = self._data[key] = self._pack(item)
+        self._index(key, item)
+
+    def _remove(self, key: str) -> None:
+        self._unindex(key, self._data[key])
+        self._release(key)
+        del self._data[key]
+
+    def delete(self, key: str) -> bool:
+        with self._stripe(key), self._lock:
+            if key not in self._data:
+                return False
+            self._remove(key)
+            self._version += 1
+            ticket = self._log(DELETE, key.encode())
+        self._durable(ticket)
+        return True
+
+    def list(self) -> List[T]:
+        return self._unpack_all(self._data.values())
+
+    def find_by(self, field: str, value: Any) -> List[T]:
+        value = column_value(value)
+        index = self._index_by.get(field)
+        if index is not None:
+            with self._lock:
+                return self._unpack_all(self._data[self._key_at[seq]] for seq in index.get(value, ()))
+        return [
+            item for item in self.list()
+            if column_value(getattr(item, field)) == value
+        ]
+
+    def page(
+        self, limit: int, after: Optional[int] = None, **filters: Any
+    ) -> Tuple[List[T], Optional[int]]:
+        filters = {
+            f: frozenset(map(column_value, v if isinstance(v, tuple) else (v,)))
+            for f, v in filters.items() if v is not None
+        }
+        with self._lock:
+            # Walk the smallest matching index bucket of a single-valued
+            # filter and check every filter against the items it yields.
+            positions = self._order
+            for field, values in filters.items():
+                if field in self._index_by and len(values) == 1:
+                    bucket = self._index_by[field].get(next(iter(values)), [])
+                    if positions is self._order or len(bucket) < len(positions):
+                        positions = bucket
+            items: List[T] = []
+            last: Optional[int] = None
+            start = bisect_right(positions, after) if after is not None else 0
+            for seq in itertools.islice(positions, start, None):
+                item = self._data[self._key_at[seq]]
+                if any(column_value(getattr(item, f)) not in v for f, v in filters.items()):
+                    continue
+                if len(items) == limit:
+                    return items, last
+                items.append(self._unpack(item))
+                last = seq
+            return items, None
+
+    def count(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._seq_of.clear()
+            self._key_at.clear()
+            self._order.clear()
+            for index in self._unique_index.values():
+                index.clear()
+            for index in self._index_by.values():
+                index.clear()
+            self._version += 1
+            ticket = self._log(CLEAR)
+        self._durable(ticket)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+
+def _same(item):
+    return item
+
+
+def create_memory_store(
+    journal_dir: Optional[str] = None,
+    snapshot_seconds: float = 300,
+    snapshot_records: int = 1_000_000,
+) -> Store:
+    """Build the memory store, journaled to ``journal_dir`` when given.
+
+    With a journal directory the dicts in ``storage.py`` are first restored
+    from the latest snapshot plus the journal tail, and every write after
+    that is journaled before it returns.
+    """
+    collections = {
+        "learners": (storage._learners, Learner, "learner_id", None),
+        "instructors": (storage._instructors, Instructor, "instructor_id", None),
+        "courses": (storage._courses, Course, "course_id", None),
+        "enrollments": (storage._enrollments, Enrollment, "enrollment_id", EnrollmentRecord),
+        "feedback": (storage._feedback_store, Feedback, "feedback_id", FeedbackRecord),
+        "progress": (storage._progress_store, LearningProgress, "progress_id", ProgressRecord),
+        "records": (storage._records, LearningRecord, "record_id", None),
+        "recommendations": (storage._recommendations, Recommendation, "recommendation_id", None),
+    }
+    journal = None
+    if journal_dir:
+        # Opening the journal locks the directory, so nothing else recovers
+        # from it or appends to it while this process owns it.
+        journal = Journal(journal_dir, snapshot_seconds, snapshot_records)
+        Journal.recover(journal_dir, collections)
+
+    def repository(name, indexed=(), unique=None):
+        data, model, key_field, record = collections[name]
+        return MemoryRepository(data, model, key_field, indexed, unique, journal, name, record)
+
+    store = Store(
+        learners=repository("learners", unique={"email": normalize_email}),
+        instructors=repository("instructors"),
+        courses=repository("courses", ("instructor_id",)),
+        enrollments=repository("enrollments", ("learner_id", "course_id", "status")),
+        feedback=repository("feedback", ("learner_id", "course_id")),
+        progress=repository("progress", ("learner_id", "course_id", "status")),
+        records=repository("records", ("learner_id",)),
+        recommendations=repository("recommendations", ("learner_id",)),
+        on_close=journal.close if journal else None,
+    )
+    if journal:
+        journal.start_snapshots(lambda: snapshot_source(journal, store.repositories()))
+    return store
+
+
+def snapshot_source(journal: Journal, repositories: Dict[str, MemoryRepository]) -> Snapshot:
+    """Rotate the journal and copy every collection at one instant.
+
+    Only the stored values are copied under the locks, as they are: records
+    and models are replaced on write, never changed in place, so the
+    journal turns them into rows after every lock is released.
+    """
+    with ExitStack() as stack:
+        for repository in repositories.values():
+            stack.enter_context(repository._lock)
+        generation = journal.rotate()
+        return generation, {
+            name: (
+                list(repository._data.values()),
+                repository.record.row if repository.record else None,
+            )
+            for name, repository in repositories.items()
+        }
@@ -0,0 +1,310 @@
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .base import DuplicateKeyError, Repository, Store, T, column_value, normalize_email
+from .. import storage
+from ..domain.course import Course, Instructor
+from ..domain.enrollment import Enrollment
+from ..domain.feedback import Feedback
+from ..domain.learning_progress import LearningProgress
+from ..domain.learning_record import LearningRecord
+from ..domain.recommendation import Recommendation
+from ..domain.user import Learner
+
+
+class SQLiteDatabase:
+    """Per-thread connections to a single SQLite file running in WAL mode.
+
+    Sync endpoints run on the AnyIO threadpool, so every worker thread gets
+    its own connection; WAL lets those readers proceed while a writer commits.
+    The same holds across processes, which is what lets several uvicorn
+    workers share one file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+            # busy_timeout first: switching to WAL needs a lock that another
+            # worker opening the same file may briefly hold.
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _versions "
+                "(name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+
+class SQLiteRepository(Repository[T]):
+    """Repository storing each model as a JSON document in its own table.
+
+    Fields listed in ``indexed`` are copied into real columns with a B-tree
+    index so ``find_by`` on them never scans the table; ``unique`` fields get
+    a UNIQUE index over their normalised value instead. The SQL text is built
+    once per repository; sqlite3 keeps the compiled statements in its
+    per-connection cache, so every call reuses a prepared statement.
+    """
+
+    def __init__(
+        self,
+        db: SQLiteDatabase,
+        table: str,
+        model: type,
+        key_field: str,
+        indexed: Sequence[str] = (),
+        unique: Optional[Dict[str, Callable[[Any], Any]]] = None,
+    ):
+        super().__init__(model, key_field, indexed, unique)
+        self.db = db
+        self.table = table
+        self.columns = self.indexed + tuple(self.unique)
+
+        columns = "".join(f", {col} TEXT" for col in self.columns)
+        placeholders = ", ".join("?" for _ in range(len(self.columns) + 2))
+        column_names = ", ".join(("id",) + self.columns + ("data",))
+
+        conn = db.connection()
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            f"seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            f"id TEXT NOT NULL UNIQUE{columns}, data TEXT NOT NULL)"
+        )
+        for col in self.indexed:
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{col} ON {table} ({col})"
+            )
+        for col in self.unique:
+            conn.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{table}_{col} ON {table} ({col})"
+            )
+        # Triggers bump the table's version inside the writing statement, so
+        # every connection (and every process sharing the file) sees it.
+        conn.execute(
+            "INSERT OR IGNORE INTO _versions (name, version) VALUES (?, 0)", (table,)
+        )
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_version "
+                f"AFTER {event} ON {table} BEGIN "
+                f"UPDATE _versions SET version = version + 1 WHERE name = '{table}'; END"
+            )
+
+        self._sql_get = f"SELECT data FROM {table} WHERE id = ?"
+        # Upsert on the primary key only: a clash on a UNIQUE column must
+        # surface as an error rather than silently replacing the other row.
+        updates = ", ".join(
+            f"{col} = excluded.{col}" for col in self.columns + ("data",)
+        )
+        self._sql_save = (
+            f"INSERT INTO {table} ({column_names}) VALUES ({placeholders}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}"
+        )
+        self._sql_insert = (
+            f"INSERT INTO {table} ({column_names}) VALUES ({placeholders}) "
+            f"ON CONFLICT(id) DO NOTHING"
+        )
+        # Compare on the stored JSON: equal models serialize identically.
+        assignments = ", ".join(f"{col} = ?" for col in self.columns + ("data",))
+        self._sql_compare_and_set = (
+            f"UPDATE {table} SET {assignments} WHERE id = ? AND data = ?"
+        )
+        self._sql_delete = f"DELETE FROM {table} WHERE id = ?"
+        self._sql_list = f"SELECT data FROM {table} ORDER BY seq"
+        self._sql_find = {
+            col: f"SELECT data FROM {table} WHERE {col} = ? ORDER BY seq"
+            for col in self.columns
+        }
+        self._sql_count = f"SELECT COUNT(*) FROM {table}"
+        self._sql_clear = f"DELETE FROM {table}"
+        self._sql_version = "SELECT version FROM _versions WHERE name = ?"
+
+    def _load(self, data: str) -> T:
+        return self.model.model_validate_json(data)
+
+    def _row(self, item: T) -> tuple:
+        values = [column_value(getattr(item, col)) for col in self.indexed]
+        values += [
+            normalize(getattr(item, col)) for col, normalize in self.unique.items()
+        ]
+        return (self.key_of(item), *values, item.model_dump_json())
+
+    def _duplicate(
+        self, error: sqlite3.IntegrityError, item: Optional[T] = None
+    ) -> DuplicateKeyError:
+        for col, normalize in self.unique.items():
+            if f"{self.table}.{col}" in str(error):
+                value = normalize(getattr(item, col)) if item is not None else None
+                return DuplicateKeyError(col, value)
+        raise error
+
+    def get(self, key: str) -> Optional[T]:
+        row = self.db.connection().execute(self._sql_get, (key,)).fetchone()
+        return self._load(row[0]) if row else None
+
+    def get_by(self, field: str, value: Any) -> Optional[T]:
+        value = self.unique[field](value)
+        row = self.db.connection().execute(self._sql_find[field], (value,)).fetchone()
+        return self._load(row[0]) if row else None
+
+    def save(self, item: T) -> None:
+        try:
+            self.db.connection().execute(self._sql_save, self._row(item))
+        except sqlite3.IntegrityError as error:
+            raise self._duplicate(error, item)
+
+    def insert_if_absent(self, item: T) -> bool:
+        try:
+            cursor = self.db.connection().execute(self._sql_insert, self._row(item))
+        except sqlite3.IntegrityError as error:
+            raise self._duplicate(error, item)
+        return cursor.rowcount == 1
+
+    def compare_and_set(self, expected: Optional[T], item: T) -> bool:
+        if expected is None:
+            return self.insert_if_absent(item)
+        key, *values = self._row(item)
+        try:
+            cursor = self.db.connection().execute(
+                self._sql_compare_and_set, (*values, key, expected.model_dump_json())
+            )
+        except sqlite3.IntegrityError as error:
+            raise self._duplicate(error, item)
+        return cursor.rowcount == 1
+
+    def save_many(self, items: Sequence[T]) -> None:
+        conn = self.db.connection()
+        # IMMEDIATE takes the write lock up front (waiting out busy_timeout)
+        # instead of failing mid-transaction when another process writes.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(self._sql_save, [self._row(item) for item in items])
+        except sqlite3.IntegrityError as error:
+            conn.execute("ROLLBACK")
+            raise self._duplicate(error)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def insert_many_if_absent(self, items: Sequence[T], atomic: bool = False) -> List[int]:
+        conn = self.db.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        taken: List[int] = []
+        try:
+            for i, item in enumerate(items):
+                if conn.execute(self._sql_insert, self._row(item)).rowcount != 1:
+                    taken.append(i)
+        except sqlite3.IntegrityError as error:
+            conn.execute("ROLLBACK")
+            raise self._duplicate(error)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("ROLLBACK" if taken and atomic else "COMMIT")
+        return taken
+
+    def delete(self, key: str) -> bool:
+        return self.db.connection().execute(self._sql_delete, (key,)).rowcount > 0
+
+    def list(self) -> List[T]:
+        rows = self.db.connection().execute(self._sql_list)
+        return [self._load(data) for (data,) in rows]
+
+    def find_by(self, field: str, value: Any) -> List[T]:
+        value = column_value(value)
+        sql = self._sql_find.get(field)
+        if sql is None:
+            return [
+                item for item in self.list()
+                if column_value(getattr(item, field)) == value
+            ]
+        rows = self.db.connection().execute(sql, (value,))
+        return [self._load(data) for (data,) in rows]
+
+    def page(
+        self, limit: int, after: Optional[int] = None, **filters: Any
+    ) -> Tuple[List[T], Optional[int]]:
+        # ``seq`` is the position: it aliases the rowid, the upsert in
+        # ``save`` keeps it on update and AUTOINCREMENT never reuses it. Each
+        # column index already ends in the rowid, so a filtered page is a
+        # range scan over that index rather than a table scan.
+        where = ["seq > ?"]
+        params: List[Any] = [after or 0]
+        for field, value in filters.items():
+            if value is None:
+                continue
+            if field not in self.columns:
+                raise ValueError(f"{self.table}.{field} is not indexed")
+            values = value if isinstance(value, tuple) else (value,)
+            where.append(f"{field} IN ({', '.join('?' * len(values))})")
+            params.extend(map(column_value, values))
+        sql = (
+            f"SELECT seq, data FROM {self.table} WHERE {' AND '.join(where)} "
+            f"ORDER BY seq LIMIT ?"
+        )
+        rows = self.db.connection().execute(sql, (*params, limit + 1)).fetchall()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        items = [self._load(data) for _, data in rows]
+        return items, (rows[-1][0] if more else None)
+
+    def count(self) -> int:
+        return self.db.connection().execute(self._sql_count).fetchone()[0]
+
+    def clear(self) -> None:
+        self.db.connection().execute(self._sql_clear)
+
+    @property
+    def version(self) -> int:
+        return self.db.connection().execute(self._sql_version, (self.table,)).fetchone()[0]
+
+
+def create_sqlite_store(path: str) -> Store:
+    db = SQLiteDatabase(path)
+    store = Store(
+        learners=SQLiteRepository(
+            db, "learners", Learner, "learner_id", unique={"email": normalize_email}
+        ),
+        instructors=SQLiteRepository(db, "instructors", Instructor, "instructor_id"),
+        courses=SQLiteRepository(db, "courses", Course, "course_id", ("instructor_id",)),
+        enrollments=SQLiteRepository(
+            db, "enrollments", Enrollment, "enrollment_id",
+            ("learner_id", "course_id", "status"),
+        ),
+        feedback=SQLiteRepository(
+            db, "feedback", Feedback, "feedback_id", ("learner_id", "course_id")
+        ),
+        progress=SQLiteRepository(
+            db, "progress", LearningProgress, "progress_id",
+            ("learner_id", "course_id", "status"),
+        ),
+        records=SQLiteRepository(db, "records", LearningRecord, "record_id", ("learner_id",)),
+        recommendations=SQLiteRepository(
+            db, "recommendations", Recommendation, "recommendation_id", ("learner_id",)
+        ),
+    )
+
+    # The catalog is seeded in code; copy it over the first time a database
+    # file is opened so both backends serve the same courses. Workers may
+    # start together, so only insert what is still missing.
+    if store.instructors.count() == 0:
+        for instructor in storage._instructors.values():
+            store.instructors.insert_if_absent(instructor)
+    if store.courses.count() == 0:
+        for course in storage._courses.values():
+            store.courses.insert_if_absent(course)
+
+    return store
@@ -0,0 +1,189 @@
+import math
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .domain.course import Course
+from .repository import store
+from .repository.base import Store
+
+_WORD = re.compile(r"\w+")
+
+# How much a term occurrence counts towards term frequency, by field.
+TITLE_WEIGHT = 3
+OUTLINE_WEIGHT = 2
+TEXT_WEIGHT = 1
+PREFIX_WEIGHT = 0.5
+MAX_PREFIX_EXPANSIONS = 50
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(text.lower()) if text else []
+
+
+def course_terms(course: Course) -> Counter:
+    """Weighted term frequencies over the whole course tree."""
+    terms: Counter = Counter()
+
+    def add(text, weight):
+        for term in tokenize(text):
+            terms[term] += weight
+
+    add(course.title, TITLE_WEIGHT)
+    add(course.description, TEXT_WEIGHT)
+    for module in course.modules:
+        add(module.title, OUTLINE_WEIGHT)
+        add(module.description, TEXT_WEIGHT)
+        for lesson in module.lessons:
+            add(lesson.title, OUTLINE_WEIGHT)
+            add(lesson.description, TEXT_WEIGHT)
+            for topic in lesson.topics:
+                add(topic.title, OUTLINE_WEIGHT)
+                add(topic.description, TEXT_WEIGHT)
+    return terms
+
+
+class CourseSearchIndex:
+    """In-process inverted index over the course tree with BM25 ranking.
+
+    Postings map each term to ``{course_id: weighted tf}``; a sorted list of
+    all terms answers prefix queries with a bisect. When bound to a store the
+    index follows the course repository version: when it moves, only courses
+    whose ``updated_at`` changed (or that disappeared) are re-indexed.
+
+    Every course gets a small integer ordinal so a query can score postings
+    as numpy arrays instead of walking dicts; a term's arrays are built on
+    first use and dropped whenever that term's postings change.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, store: Optional[Store] = None):
+        self.store = store
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._terms: List[str] = []
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._doc_version: Dict[str, datetime] = {}
+        self._ord_of: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._lengths = np.zeros(1024)
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._total_len = 0
+        self._synced_version = None
+        self._lock = threading.RLock()
+
+    def add(self, course: Course) -> None:
+        with self._lock:
+            self.remove(course.course_id)
+            terms = course_terms(course)
+            for term, tf in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    insort(self._terms, term)
+                else:
+                    self._arrays.pop(term, None)
+                postings[course.course_id] = tf
+            length = sum(terms.values())
+            self._doc_terms[course.course_id] = terms
+            self._doc_len[course.course_id] = length
+            ordinal = self._ordinal(course.course_id)
+            self._lengths[ordinal] = length
+            self._doc_version[course.course_id] = course.updated_at
+            self._total_len += length
+
+    def remove(self, course_id: str) -> None:
+        with self._lock:
+            terms = self._doc_terms.pop(course_id, None)
+            if terms is None:
+                return
+            for term in terms:
+                postings = self._postings[term]
+                del postings[course_id]
+                self._arrays.pop(term, None)
+                if not postings:
+                    del self._postings[term]
+                    del self._terms[bisect_left(self._terms, term)]
+            self._total_len -= self._doc_len.pop(course_id)
+            self._lengths[self._ord_of[course_id]] = 0
+            del self._doc_version[course_id]
+
+    def _ordinal(self, course_id: str) -> int:
+        ordinal = self._ord_of.get(course_id)
+        if ordinal is None:
+            ordinal = self._ord_of[course_id] = len(self._ids)
+            self._ids.append(course_id)
+            if ordinal == len(self._lengths):
+                self._lengths = np.concatenate([self._lengths, np.zeros(len(self._lengths))])
+        return ordinal
+
+    def _postings_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings[term]
+            ords = np.fromiter(
+                (self._ord_of[course_id] for course_id in postings), np.intp, len(postings)
+            )
+            tfs = np.fromiter(postings.values(), np.float64, len(postings))
+            arrays = self._arrays[term] = (ords, tfs)
+        return arrays
+
+    def sync(self) -> None:
+        if self.store is None:
+            return
+        version = self.store.courses.version
+        if version == self._synced_version:
+            return
+        with self._lock:
+            if version == self._synced_version:
+                return
+            live = set()
+            for course in self.store.courses.list():
+                live.add(course.course_id)
+                if self._doc_version.get(course.course_id) != course.updated_at:
+                    self.add(course)
+            for course_id in set(self._doc_terms) - live:
+                self.remove(course_id)
+            self._synced_version = version
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """The token itself plus indexed terms it is a prefix of."""
+        matches = [(token, 1.0)] if token in self._postings else []
+        start = bisect_left(self._terms, token)
+        for term in self._terms[start:start + MAX_PREFIX_EXPANSIONS + 1]:
+            if not term.startswith(token):
+                break
+            if term != token:
+                matches.append((term, PREFIX_WEIGHT))
+        return matches
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        self.sync()
+        with self._lock:
+            docs = len(self._doc_len)
+            if not docs:
+                return []
+            avg_len = self._total_len / docs
+            scores = np.zeros(len(self._ids))
+            for token in set(tokenize(query)):
+                for term, weight in self._expand(token):
+                    ords, tfs = self._postings_arrays(term)
+                    idf = math.log(1 + (docs - len(ords) + 0.5) / (len(ords) + 0.5))
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[ords] / avg_len)
+                    # A term lists each course once, so fancy-index += is safe.
+                    scores[ords] += weight * idf * (self.k1 + 1) * tfs / (tfs + norm)
+            hits = np.flatnonzero(scores)
+            if len(hits) > limit:
+                hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+            hits = hits[np.argsort(-scores[hits], kind="stable")]
+            return [(self._ids[i], float(scores[i])) for i in hits]
+
+
+search_index = CourseSearchIndex(store)
@@ -0,0 +1,73 @@
+"""``fields=`` / ``expand=`` selection for course detail responses.
+
+The course tree is ``course -> modules -> lessons -> topics``. ``expand``
+names how deep to go (``modules``, ``modules.lessons`` or
+``modules.lessons.topics``); ``fields`` lists the fields to keep at any
+level as dotted paths (``title``, ``modules.title``,
+``modules.lessons.topics.content_url``). A level with no listed fields
+keeps all of its own fields, and every object keeps its id. Without
+``expand`` the tree goes as deep as the deepest listed field, and with
+neither parameter the whole course is returned.
+
+The result is a pydantic ``include`` spec, so the serializer writes only
+the selected parts straight from the stored course.
+"""
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from .domain.course import Course, CourseLesson, CourseModule, CourseTopic
+
+TREE = ("modules", "lessons", "topics")
+LEVELS = (
+    (Course, "course_id"),
+    (CourseModule, "module_id"),
+    (CourseLesson, "lesson_id"),
+    (CourseTopic, "topic_id"),
+)
+
+
+class Selection(NamedTuple):
+    key: Tuple
+    include: Dict
+
+
+def _depth(path: List[str], source: str) -> int:
+    if tuple(path) != TREE[:len(path)]:
+        raise ValueError(f"Unknown {source} path: {'.'.join(path)!r}")
+    return len(path)
+
+
+def parse_selection(fields: Optional[str], expand: Optional[str]) -> Optional[Selection]:
+    """Parse the query parameters; ``None`` means the full course."""
+    if fields is None and expand is None:
+        return None
+    selected: List[Set[str]] = [set() for _ in LEVELS]
+    depth = 0
+    for path in filter(None, (fields or "").split(",")):
+        *parents, name = path.strip().split(".")
+        level = _depth(parents, "fields")
+        if level < len(TREE) and name == TREE[level]:
+            depth = max(depth, level + 1)
+            continue
+        model, _ = LEVELS[level]
+        if name not in model.model_fields or name in TREE:
+            raise ValueError(f"Unknown field: {path.strip()!r}")
+        selected[level].add(name)
+        depth = max(depth, level)
+    if expand is not None:
+        depth = max(
+            [_depth(path.strip().split("."), "expand") for path in expand.split(",") if path.strip()],
+            default=0,
+        )
+        if any(selected[level] for level in range(depth + 1, len(LEVELS))):
+            raise ValueError("fields select a level that expand leaves out")
+
+    def include(level: int) -> Dict:
+        model, id_field = LEVELS[level]
+        names = selected[level] or {name for name in model.model_fields if name not in TREE}
+        spec: Dict = {name: True for name in names | {id_field}}
+        if level < depth:
+            spec[TREE[level]] = {"__all__": include(level + 1)}
+        return spec
+
+    key = (depth,) + tuple(tuple(sorted(names)) for names in selected)
+    return Selection(key, include(0))
@@ -1,13 +1,13 @@
 from typing import Dict, Any
 from datetime import datetime, timezone
-from .domain.course import Course, CourseModule, CourseLesson, CourseTopic, CourseDetail
+from .domain.course import Course, CourseModule, CourseLesson, CourseTopic, CourseDetail, Instructor
 
 _learners: Dict[str, Any] = {}
 
 _instructors: Dict[str, Any] = {
-    "instr-001": {"instructor_id": "instr-001", "name": "John Doe", "bio": "Python expert"},
-    "instr-002": {"instructor_id": "instr-002", "name": "Jane Smith", "bio": "FastAPI specialist"},
-    "instr-003": {"instructor_id": "instr-003", "name": "Dr. Emily Chen", "bio": "Data Science researcher"},
+    "instr-001": Instructor(instructor_id="instr-001", name="John Doe", bio="Python expert"),
+    "instr-002": Instructor(instructor_id="instr-002", name="Jane Smith", bio="FastAPI specialist"),
+    "instr-003": Instructor(instructor_id="instr-003", name="Dr. Emily Chen", bio="Data Science researcher"),
 }
 
 _courses: Dict[str, Any] = {
@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", 300))
+
+
+class TokenCache:
+    """LRU of already-verified bearer tokens mapped to their learner_id.
+
+    An entry lives for at most ``ttl`` seconds and never past the token's own
+    ``exp`` claim, so a cached token can't outlive what ``jwt.decode`` would
+    have accepted.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE, ttl: int = TOKEN_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._by_learner: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            learner_id, expires_at = entry
+            if expires_at <= time.time():
+                self._discard(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return learner_id
+
+    def put(self, token: str, learner_id: str, exp: float) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = min(exp, time.time() + self.ttl)
+        with self._lock:
+            self._discard(token)
+            self._entries[token] = (learner_id, expires_at)
+            self._by_learner.setdefault(learner_id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_learner(self, learner_id: str) -> None:
+        with self._lock:
+            for token in list(self._by_learner.get(learner_id, ())):
+                self._discard(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_learner.clear()
+
+    def _discard(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._by_learner.get(entry[0])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_learner[entry[0]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache()
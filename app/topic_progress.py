@@ -0,0 +1,177 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import numpy as np
+
+from .domain.course import Course
+from .domain.learning_progress import LearningProgress, ProgressStatus
+from .learning_records import learning_records
+from .repository import store
+from .repository.base import Store
+
+
+class CourseOutline:
+    """Topic ordinals and completion weights for one version of a course.
+
+    Ordinals follow the module/lesson/topic order of the course tree and
+    index the progress bitset. Weights are ``estimated_duration_minutes``;
+    a course with no durations at all weighs every topic equally.
+    """
+
+    __slots__ = ("ordinals", "weights", "total", "full", "_weights", "_unit")
+
+    def __init__(self, course: Course):
+        topics = [
+            topic
+            for module in course.modules
+            for lesson in module.lessons
+            for topic in lesson.topics
+        ]
+        self.ordinals: Dict[str, int] = {t.topic_id: i for i, t in enumerate(topics)}
+        weights = [t.estimated_duration_minutes or 0 for t in topics]
+        self.weights: List[int] = weights if any(weights) else [1] * len(topics)
+        self.total = sum(self.weights)
+        self.full = bytes(_full_bitset(len(topics)))
+        self._weights = np.array(self.weights, dtype=np.int64)
+        self._unit = self.weights[0] if len(set(self.weights)) == 1 else None
+
+    def rate(self, bits: bytes) -> float:
+        """Completion rate of ``bits``: the weight of its set topics over the total."""
+        if not self.total:
+            return 0.0
+        count = len(self.weights)
+        if self._unit is not None:
+            mask = (1 << count) - 1
+            done = (int.from_bytes(bits, "little") & mask).bit_count() * self._unit
+        else:
+            flags = np.unpackbits(np.frombuffer(bits, dtype=np.uint8), bitorder="little")[:count]
+            done = int(flags @ self._weights[:len(flags)])
+        return done / self.total
+
+    def settle(self, bits: bytes, status: ProgressStatus) -> Tuple[float, ProgressStatus]:
+        """Completion rate and status that ``bits`` (already clipped) stand for.
+
+        Every topic done is COMPLETED; anything less is IN_PROGRESS, or
+        ON_HOLD if the learner had put the course on hold. An outline with
+        no topics is never completed.
+        """
+        if self.full and bits == self.full:
+            return 1.0, ProgressStatus.COMPLETED
+        return self.rate(bits), _unfinished(status)
+
+    def clip(self, bits: bytes) -> bytearray:
+        """``bits`` without any topic past the end of this outline."""
+        clipped = bytearray(bits[:len(self.full)])
+        if len(clipped) == len(self.full) and clipped:
+            clipped[-1] &= self.full[-1]
+        return clipped
+
+
+def _unfinished(status: ProgressStatus) -> ProgressStatus:
+    return ProgressStatus.ON_HOLD if status == ProgressStatus.ON_HOLD else ProgressStatus.IN_PROGRESS
+
+
+def _full_bitset(count: int) -> bytearray:
+    bits = bytearray(b"\xff" * (count // 8))
+    if count % 8:
+        bits.append((1 << (count % 8)) - 1)
+    return bits
+
+
+class TopicProgressTracker:
+    """Records topic completions in a per-(learner, course) bitset.
+
+    Completing a topic sets one bit, and both ``completion_rate`` (in one
+    vectorised pass) and ``status`` are derived from the bitset, so neither
+    carries over from a record written some other way: the status is
+    COMPLETED exactly when every bit is set. :meth:`derive` does the same
+    for progress posted by a client. Bits past the end of the outline, sent
+    by a client or left behind when a course lost topics, are dropped in
+    both places. Records are written with compare-and-set and the update is
+    retried on conflict, so concurrent completions never lose a bit; records
+    created here use the ``<learner_id>-<course_id>`` key, so racing first
+    completions cannot create two of them. A new record or a status change
+    is folded into the learner's learning record.
+    """
+
+    def __init__(self, store: Store):
+        self.store = store
+        self._outlines: Dict[str, Tuple[datetime, CourseOutline]] = {}
+
+    def outline(self, course: Course) -> CourseOutline:
+        cached = self._outlines.get(course.course_id)
+        if cached is not None and cached[0] == course.updated_at:
+            return cached[1]
+        outline = CourseOutline(course)
+        self._outlines[course.course_id] = (course.updated_at, outline)
+        return outline
+
+    def _find(self, learner_id: str, course_id: str) -> Tuple[str, Optional[LearningProgress]]:
+        """The learner's progress on the course, and the key it is (or goes) under.
+
+        ``POST /progress/`` takes client-chosen ids, so the row on
+        ``<learner_id>-<course_id>`` only counts if it is this learner's
+        progress on this course; a new record goes under a fresh id when
+        someone else's row holds that key.
+        """
+        key = f"{learner_id}-{course_id}"
+        progress = self.store.progress.get(key)
+        if progress is not None and (progress.learner_id, progress.course_id) == (learner_id, course_id):
+            return key, progress
+        items, _ = self.store.progress.page(1, learner_id=learner_id, course_id=course_id)
+        if items:
+            return items[0].progress_id, items[0]
+        return (key if progress is None else str(uuid4())), None
+
+    def complete(self, learner_id: str, course: Course, topic_id: str) -> LearningProgress:
+        """Mark ``topic_id`` done; raises KeyError for a topic not in the course."""
+        outline = self.outline(course)
+        ordinal = outline.ordinals[topic_id]
+        while True:
+            progress_id, current = self._find(learner_id, course.course_id)
+            progress = current or LearningProgress(
+                progress_id=progress_id,
+                learner_id=learner_id,
+                course_id=course.course_id,
+            )
+            bits = outline.clip(progress.completed_topics)
+            byte, mask = divmod(ordinal, 8)
+            if byte >= len(bits):
+                bits.extend(bytes(byte + 1 - len(bits)))
+            bits[byte] |= 1 << mask
+            rate, status = outline.settle(bits, progress.status)
+            update = {"last_accessed": datetime.now(timezone.utc)}
+            if bits != progress.completed_topics:
+                update["completed_topics"] = bytes(bits)
+            if rate != progress.completion_rate:
+                update["completion_rate"] = rate
+            if status != progress.status:
+                update["status"] = status
+            updated = progress.model_copy(update=update)
+            if self.store.progress.compare_and_set(current, updated):
+                if current is None or current.status != updated.status:
+                    learning_records.apply([updated])
+                return updated
+
+    def derive(self, progress: LearningProgress) -> LearningProgress:
+        """``progress`` as its bitset has it, whatever rate and status it was sent with.
+
+        Bits past the end of the course outline are dropped. Progress on a
+        course that does not exist has no topics to count, so it stays at 0.
+        """
+        course = self.store.courses.get(progress.course_id)
+        bits = progress.completed_topics
+        if course is None:
+            rate, status = 0.0, _unfinished(progress.status)
+        else:
+            outline = self.outline(course)
+            bits = bytes(outline.clip(bits))
+            rate, status = outline.settle(bits, progress.status)
+        update = {"completed_topics": bits, "completion_rate": rate, "status": status}
+        if all(getattr(progress, field) == value for field, value in update.items()):
+            return progress
+        return progress.model_copy(update=update)
+
+
+topic_progress = TopicProgressTracker(store)
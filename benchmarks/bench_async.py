@@ -0,0 +1,103 @@
+"""Requests/sec and tail latency at high connection counts, before vs after.
+
+Runs a real uvicorn server from each source tree in turn over the same
+seeded SQLite database (the backend whose calls block) and drives it with
+``--connections`` concurrent keep-alive connections spread over
+``--load-procs`` load processes. A tree is either
+``.`` (the working tree) or a git ref, which is checked out into a
+temporary worktree, so the request path from before a change can be
+measured against the current one:
+
+    python -m benchmarks.bench_async --trees <ref-before> . [--connections 1000]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from contextlib import ExitStack
+
+from app.repository.sqlite import create_sqlite_store
+
+from .bench_workers import free_port, load_process, start_server
+from .datagen import SCALES, populate
+from .scenarios import MIXES
+
+
+def worktree(stack: ExitStack, ref: str) -> str:
+    if ref == ".":
+        return os.getcwd()
+    path = stack.enter_context(tempfile.TemporaryDirectory())
+    subprocess.run(["git", "worktree", "add", "--detach", path, ref], check=True,
+                   capture_output=True)
+    stack.callback(subprocess.run, ["git", "worktree", "remove", "--force", path],
+                   capture_output=True)
+    return path
+
+
+def measure(tree: str, label: str, args, path: str) -> dict:
+    port = free_port()
+    server = start_server(1, port, path, cwd=tree, env={"THREADPOOL_SIZE": str(args.threadpool)})
+    per_proc = args.connections // args.load_procs
+    try:
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=load_process, args=(
+                port, args.scale, MIXES[args.mix], per_proc, args.duration,
+                args.seed + i, results,
+            ))
+            for i in range(args.load_procs)
+        ]
+        for proc in procs:
+            proc.start()
+        collected = [results.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies = sorted(value for values, _ in collected for value in values)
+    return {
+        "tree": label,
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in collected),
+        "throughput_rps": round(len(latencies) / args.duration, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+        "p999_ms": round(latencies[int(len(latencies) * 0.999)] * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trees", nargs="+", default=["."])
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--load-procs", type=int, default=4)
+    parser.add_argument("--threadpool", type=int, default=40)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="smoke")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    results = []
+    with ExitStack() as stack:
+        tmp = stack.enter_context(tempfile.TemporaryDirectory())
+        path = os.path.join(tmp, "lernex.db")
+        populate(create_sqlite_store(path), SCALES[args.scale], args.seed,
+                 log=lambda message: print(message, file=sys.stderr))
+        for ref in args.trees:
+            results.append(measure(worktree(stack, ref), ref, args, path))
+            r = results[-1]
+            print(f"{ref:<12} {r['throughput_rps']:>8.1f} req/s  p50 {r['p50_ms']:.1f} ms  "
+                  f"p99 {r['p99_ms']:.1f} ms  p99.9 {r['p999_ms']:.1f} ms  "
+                  f"errors={r['errors']}", file=sys.stderr)
+    print(json.dumps({"cpus": os.cpu_count(), "params": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
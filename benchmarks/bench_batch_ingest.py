@@ -0,0 +1,68 @@
+"""Ingest throughput: one POST per enrollment vs POST /enrollments/batch.
+
+    python -m benchmarks.bench_batch_ingest [--records 10000] [--batch-size 5000]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from app.hashing import hasher
+from app.main import app
+from app.repository import store
+
+CREDENTIALS = {"email": "ingest@example.com", "password": "ingestpassword"}
+
+
+def records(count: int, prefix: str):
+    return [
+        {"enrollment_id": f"{prefix}-{i}", "learner_id": f"l-{i % 1000}", "course_id": f"c-{i % 50}"}
+        for i in range(count)
+    ]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", json={"name": "Ingest", **CREDENTIALS})
+        token = (await client.post("/auth/login", json=CREDENTIALS)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        start = time.perf_counter()
+        for record in records(args.records, "single"):
+            await client.post("/enrollments/", json=record, headers=headers)
+        single = args.records / (time.perf_counter() - start)
+
+        batch = records(args.records, "batch")
+        start = time.perf_counter()
+        for i in range(0, len(batch), args.batch_size):
+            await client.post("/enrollments/batch", json=batch[i:i + args.batch_size], headers=headers)
+        batched = args.records / (time.perf_counter() - start)
+
+        ndjson = records(args.records, "ndjson")
+        start = time.perf_counter()
+        for i in range(0, len(ndjson), args.batch_size):
+            body = "\n".join(json.dumps(r) for r in ndjson[i:i + args.batch_size])
+            await client.post(
+                "/enrollments/batch",
+                content=body,
+                headers={**headers, "Content-Type": "application/x-ndjson"},
+            )
+        streamed = args.records / (time.perf_counter() - start)
+
+    hasher.shutdown()
+    assert store.enrollments.count() == 3 * args.records
+    print(f"single POST:        {single:>10.0f} records/s")
+    print(f"batch (JSON array): {batched:>10.0f} records/s")
+    print(f"batch (NDJSON):     {streamed:>10.0f} records/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
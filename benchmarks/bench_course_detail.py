@@ -0,0 +1,126 @@
+"""Course detail latency: response_model serialization vs cached bytes vs 304.
+
+Serves one large course (``--modules`` x ``--lessons`` x ``--topics``) three
+ways through the in-process ASGI app: a plain ``response_model=Course``
+route (the previous behaviour), the cached route, and the cached route
+with a matching ``If-None-Match``. Then reports payload size and uncached
+serialization time for a few ``fields=`` / ``expand=`` selections.
+
+    python -m benchmarks.bench_course_detail [--modules 10] [--lessons 10] [--topics 10]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.domain.course import Course, CourseLesson, CourseModule, CourseTopic
+from app.main import app
+from app.repository import store
+from app.selection import parse_selection
+
+CREDENTIALS = {"email": "bench@example.com", "password": "benchpassword"}
+SELECTIONS = [
+    (None, None),
+    (None, "modules.lessons"),
+    (None, "modules"),
+    ("title,modules.lessons.topics.title", None),
+    ("title,detail", None),
+]
+
+
+def make_course(modules: int, lessons: int, topics: int) -> Course:
+    return Course(
+        course_id="bench-course",
+        title="Benchmark course",
+        description="A large course tree",
+        instructor_id="instr-001",
+        modules=[
+            CourseModule(title=f"Module {m}", description="About this module", order=m, lessons=[
+                CourseLesson(title=f"Lesson {m}.{l}", description="About this lesson", order=l, topics=[
+                    CourseTopic(
+                        title=f"Topic {m}.{l}.{t}",
+                        description="About this topic",
+                        order=t,
+                        estimated_duration_minutes=10,
+                        content_url="https://example.com/topic",
+                    )
+                    for t in range(topics)
+                ])
+                for l in range(lessons)
+            ])
+            for m in range(modules)
+        ],
+    )
+
+
+def baseline_app(course: Course) -> FastAPI:
+    baseline = FastAPI()
+
+    @baseline.get("/courses/{course_id}", response_model=Course)
+    def get_course_detail(course_id: str) -> Course:
+        return course
+
+    return baseline
+
+
+async def measure(asgi, path: str, headers: dict, requests: int) -> list:
+    transport = httpx.ASGITransport(app=asgi)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert response.status_code in (200, 304)
+    return latencies
+
+
+async def main_async(args) -> None:
+    course = make_course(args.modules, args.lessons, args.topics)
+    store.courses.save(course)
+    path = f"/courses/{course.course_id}"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", json={"name": "Bench", **CREDENTIALS})
+        token = (await client.post("/auth/login", json=CREDENTIALS)).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        first = await client.get(path, headers=auth)
+    print(f"course body: {len(first.content) / 1024:.0f} KiB")
+
+    for label, asgi, headers in [
+        ("response_model", baseline_app(course), {}),
+        ("cached bytes", app, auth),
+        ("304", app, {**auth, "If-None-Match": first.headers["ETag"]}),
+    ]:
+        latencies = await measure(asgi, path, headers, args.requests)
+        latencies.sort()
+        print(f"{label:<15} p50 {statistics.median(latencies):7.2f} ms   "
+              f"p99 {latencies[int(len(latencies) * 0.99)]:7.2f} ms")
+
+    serializer = Course.__pydantic_serializer__
+    for fields, expand in SELECTIONS:
+        selection = parse_selection(fields, expand)
+        include = selection.include if selection else None
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            body = serializer.to_json(course, include=include)
+        per_call = (time.perf_counter() - start) * 1000 / args.requests
+        label = f"fields={fields or ''} expand={expand or ''}"
+        print(f"{label:<50} {len(body) / 1024:8.1f} KiB  {per_call:7.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", type=int, default=10)
+    parser.add_argument("--lessons", type=int, default=10)
+    parser.add_argument("--topics", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=300)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Email lookup cost for login/registration as the learner count grows.
+
+Compares the unique email index against the linear scan over every learner
+that ``authenticate_learner`` used to do. bcrypt is left out on purpose: it
+costs the same at any size, the lookup is what used to grow.
+
+    python -m benchmarks.bench_email_index [--sizes 1000 10000 100000 1000000]
+"""
+import argparse
+import random
+import time
+
+from app.domain.user import Learner
+from app.repository.base import normalize_email
+from app.repository.memory import MemoryRepository
+
+
+def build_repository(size: int) -> MemoryRepository:
+    repo = MemoryRepository({}, Learner, "learner_id", unique={"email": normalize_email})
+    for i in range(size):
+        repo.save(Learner.model_construct(
+            learner_id=f"l-{i}",
+            name=f"Learner {i}",
+            email=f"learner{i}@example.com",
+            password_hash="x",
+        ))
+    return repo
+
+
+def per_call_us(fn, emails) -> float:
+    start = time.perf_counter()
+    for email in emails:
+        fn(email)
+    return (time.perf_counter() - start) / len(emails) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'learners':>10} {'index (us)':>12} {'scan (us)':>12}")
+    for size in args.sizes:
+        repo = build_repository(size)
+        emails = [f"Learner{rng.randrange(size)}@Example.com" for _ in range(args.lookups)]
+
+        indexed = per_call_us(lambda email: repo.get_by("email", email), emails)
+
+        def scan(email):
+            for learner in repo._data.values():
+                if normalize_email(learner.email) == normalize_email(email):
+                    return learner
+        scanned = per_call_us(scan, emails[: max(1, args.lookups * 1_000 // size)])
+
+        print(f"{size:>10} {indexed:>12.2f} {scanned:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Write latency as derived work is added: inline vs. on the event bus.
+
+Adds ``--side-effects`` extra consumers to the application's event bus,
+each costing ``--cost-ms`` of blocking work per batch (standing in for an
+aggregate, a search index update or an analytics call). POST /feedback/
+is then driven in-process by ``--concurrency`` clients, first with the
+bus stopped, where ``publish`` runs every consumer inside the request,
+and then with the bus running, where it only enqueues.
+
+    python -m benchmarks.bench_events [--side-effects 0 1 4] [--cost-ms 2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+import anyio.to_thread
+import httpx
+
+from app.api.auth_router import create_access_token
+from app.domain.user import Learner
+from app.events import EnrollmentCreated, FeedbackSubmitted, events
+from app.main import app
+from app.repository import store
+
+
+def add_side_effects(count: int, cost: float) -> None:
+    async def side_effect(batch) -> None:
+        await anyio.to_thread.run_sync(time.sleep, cost)
+
+    for i in range(count):
+        events.subscribe(f"bench-{i}", side_effect, FeedbackSubmitted, EnrollmentCreated)
+
+
+async def drive(requests: int, concurrency: int, headers: Dict[str, str]) -> List[float]:
+    latencies: List[float] = []
+    counter = iter(range(requests))
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        for i in counter:
+            payload = {
+                "learner_id": "bench", "course_id": "course-001", "comment": "",
+                "rating": {"value": 1 + i % 5, "comment_category": "general"},
+            }
+            start = time.perf_counter()
+            response = await client.post("/feedback/", json=payload, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+    return sorted(latencies)
+
+
+async def measure(mode: str, args, headers: Dict[str, str]) -> Dict:
+    store.feedback.clear()
+    if mode == "bus":
+        await events.start()
+    start = time.perf_counter()
+    latencies = await drive(args.requests, args.concurrency, headers)
+    elapsed = time.perf_counter() - start
+    if mode == "bus":
+        await events.stop()
+    return {
+        "mode": mode,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+    }
+
+
+async def run(args) -> List[Dict]:
+    learner = Learner(name="Bench", email="bench@example.com", password_hash="x")
+    store.learners.save(learner)
+    headers = {"Authorization": "Bearer " + create_access_token(
+        {"sub": learner.learner_id, "email": learner.email}
+    )}
+    results = []
+    added = 0
+    for side_effects in args.side_effects:
+        add_side_effects(side_effects - added, args.cost_ms / 1000)
+        added = side_effects
+        for mode in ("inline", "bus"):
+            result = {"side_effects": side_effects, **await measure(mode, args, headers)}
+            results.append(result)
+            print(f"{side_effects:>3} side effects  {mode:<7} {result['throughput_rps']:>8.1f} req/s  "
+                  f"p50 {result['p50_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--side-effects", type=int, nargs="+", default=[0, 1, 4])
+    parser.add_argument("--cost-ms", type=float, default=2.0)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps({"cpus": os.cpu_count(), "params": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
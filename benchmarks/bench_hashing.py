@@ -0,0 +1,80 @@
+"""Concurrent login throughput: bcrypt on the AnyIO threadpool vs the process pool.
+
+Fires ``--logins`` concurrent logins at the in-process ASGI app while a
+second task keeps probing ``GET /`` to show how much the other routes are
+starved during the burst.
+
+    python -m benchmarks.bench_hashing [--logins 200] [--workers 4]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.hashing import hasher
+from app.main import app
+
+CREDENTIALS = {"email": "bench@example.com", "password": "benchpassword"}
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.005)
+
+
+async def run(workers: int, logins: int) -> dict:
+    hasher.shutdown()
+    hasher.workers = workers
+    hasher.max_pending = max(logins, 1)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", json={"name": "Bench", **CREDENTIALS})
+        await client.post("/auth/login", json=CREDENTIALS)  # warm the pool
+
+        stop = asyncio.Event()
+        probe_latencies: list = []
+        prober = asyncio.create_task(probe(client, stop, probe_latencies))
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.post("/auth/login", json=CREDENTIALS) for _ in range(logins))
+        )
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        await prober
+
+    assert all(r.status_code == 200 for r in responses)
+    probe_latencies.sort()
+    return {
+        "mode": "threadpool" if workers <= 0 else f"process pool ({workers})",
+        "logins_per_sec": logins / elapsed,
+        "probe_p50_ms": statistics.median(probe_latencies) * 1000,
+        "probe_max_ms": probe_latencies[-1] * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=hasher.workers or 1)
+    args = parser.parse_args()
+
+    print(f"{'mode':<20} {'logins/s':>10} {'probe p50 ms':>14} {'probe max ms':>14}")
+    for workers in (0, args.workers):
+        result = await run(workers, args.logins)
+        print(
+            f"{result['mode']:<20} {result['logins_per_sec']:>10.1f} "
+            f"{result['probe_p50_ms']:>14.2f} {result['probe_max_ms']:>14.2f}"
+        )
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""Write throughput with the journal on, and restart time from disk.
+
+Writers are threads saving enrollments concurrently, each waiting for its
+own fsync, so the group commit is what keeps throughput up. Restart is
+measured twice: replaying the whole journal, and loading a snapshot.
+``snapshot_locks_held_ms`` is how long the snapshot stalls writers.
+
+    python -m benchmarks.bench_journal [--records 1000000] [--threads 16]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+
+from app.domain.enrollment import Enrollment, EnrollmentStatus
+from app.repository.compact import EnrollmentRecord
+from app.repository.journal import Journal
+from app.repository.memory import MemoryRepository, snapshot_source
+
+from .datagen import CHUNK, Generator, SCALES
+
+# Seconds each snapshot held the repository locks.
+locks_held = []
+
+
+def enrollments(count: int):
+    now = Generator(SCALES["smoke"]).now
+    return [
+        Enrollment.model_construct(
+            enrollment_id=f"e-{i}", learner_id=f"l-{i % 50_000}", course_id=f"c-{i % 5_000}",
+            enrollment_date=now, status=EnrollmentStatus.ACTIVE,
+        )
+        for i in range(count)
+    ]
+
+
+def open_repository(directory):
+    data = {}
+    start = time.perf_counter()
+    journal = Journal(directory, snapshot_seconds=3600, snapshot_records=10**9)
+    recovered = Journal.recover(
+        directory, {"enrollments": (data, Enrollment, "enrollment_id", EnrollmentRecord)}
+    )
+    repository = MemoryRepository(
+        data, Enrollment, "enrollment_id", ("learner_id", "course_id", "status"),
+        journal=journal, name="enrollments", record=EnrollmentRecord,
+    )
+
+    def source():
+        start = time.perf_counter()
+        try:
+            return snapshot_source(journal, {"enrollments": repository})
+        finally:
+            locks_held.append(time.perf_counter() - start)
+
+    journal.start_snapshots(source)
+    return journal, repository, recovered, time.perf_counter() - start
+
+
+def concurrent_writes(repository, items, threads) -> float:
+    def writer(part):
+        for item in part:
+            repository.save(item)
+
+    workers = [threading.Thread(target=writer, args=(items[i::threads],)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return len(items) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--writes", type=int, default=20_000, help="concurrent single saves")
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    items = enrollments(args.records)
+    report = {"params": vars(args)}
+    plain = MemoryRepository(
+        {}, Enrollment, "enrollment_id", ("learner_id", "course_id", "status"),
+        record=EnrollmentRecord,
+    )
+    report["saves_per_s_no_journal"] = round(
+        concurrent_writes(plain, items[:args.writes], args.threads)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal, repository, _, _ = open_repository(tmp)
+        report["saves_per_s_journal"] = round(
+            concurrent_writes(repository, items[:args.writes], args.threads)
+        )
+        start = time.perf_counter()
+        for i in range(args.writes, args.records, CHUNK):
+            repository.save_many(items[i:i + CHUNK])
+        report["bulk_load_s"] = round(time.perf_counter() - start, 2)
+        journal.close()
+
+        journal, repository, recovered, seconds = open_repository(tmp)
+        report["restart_journal_only_s"] = round(seconds, 2)
+        report["replayed"] = recovered[1]
+        start = time.perf_counter()
+        journal.snapshot()
+        report["snapshot_s"] = round(time.perf_counter() - start, 2)
+        report["snapshot_locks_held_ms"] = round(locks_held[-1] * 1000, 1)
+        journal.close()
+
+        journal, repository, recovered, seconds = open_repository(tmp)
+        report["restart_snapshot_s"] = round(seconds, 2)
+        report["restored"] = repository.count()
+        journal.close()
+
+    for key, value in report.items():
+        if key != "params":
+            print(f"{key:<26} {value}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
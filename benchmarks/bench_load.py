@@ -0,0 +1,191 @@
+"""In-process load test against the ASGI app with a JSON report.
+
+Populates the store with the seeded generator, then runs ``--concurrency``
+virtual users through a scenario mix via httpx's ASGI transport for
+``--requests`` requests (or ``--duration`` seconds). The report holds
+throughput, per-scenario latency percentiles, status counts, load times
+and peak RSS, plus the git commit, so runs can be diffed across commits.
+
+    python -m benchmarks.bench_load --scale smoke --mix mixed --out report.json
+    python -m benchmarks.bench_load --scale small --mix "browse_catalog=3,enroll=1"
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import httpx
+
+from app.api.auth_router import create_access_token
+from app.hashing import hasher
+from app.login_throttle import login_throttle
+from app.main import app
+from app.repository import STORAGE_BACKEND, store
+
+from .datagen import SCALES, populate
+from .scenarios import EXPECTED_STATUS, MIXES, SCENARIOS, VirtualUser
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    if spec in MIXES:
+        return MIXES[spec]
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario {name!r}; choose from {sorted(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(len(sorted_values) * q), len(sorted_values) - 1)]
+
+
+def summarize(latencies: List[float], statuses: Counter, errors: int, seconds: float) -> Dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / seconds, 1) if seconds else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p90": round(percentile(latencies, 0.90) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "status": {str(code): n for code, n in sorted(statuses.items())},
+    }
+
+
+async def run(args, scale, mix: Dict[str, float]) -> Dict:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    users = [
+        VirtualUser(
+            index=i,
+            learner_id=f"l-{i}",
+            headers={"Authorization": "Bearer " + create_access_token(
+                {"sub": f"l-{i}", "email": f"learner{i}@bench.lernex"}
+            )},
+        )
+        for i in random.Random(args.seed).sample(range(scale.learners), min(args.users, scale.learners))
+    ]
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    errors: Counter = Counter()
+    budget = {"left": args.requests}
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    async def virtual_user(worker: int, client: httpx.AsyncClient) -> None:
+        rng = random.Random(args.seed * 1000 + worker)
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    return
+            elif budget["left"] <= 0:
+                return
+            budget["left"] -= 1
+            name = rng.choices(names, weights)[0]
+            user = rng.choice(users)
+            start = time.perf_counter()
+            response = await SCENARIOS[name](client, user, rng, scale)
+            latencies[name].append(time.perf_counter() - start)
+            statuses[name][response.status_code] += 1
+            if response.status_code not in EXPECTED_STATUS.get(name, (200,)):
+                errors[name] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.get("/courses/?limit=1", headers=users[0].headers)  # warm caches
+        start = time.perf_counter()
+        await asyncio.gather(*(virtual_user(w, client) for w in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    all_statuses: Counter = sum(statuses.values(), Counter())
+    return {
+        "seconds": round(elapsed, 2),
+        "total": summarize(all_latencies, all_statuses, sum(errors.values()), elapsed),
+        "scenarios": {
+            name: summarize(latencies[name], statuses[name], errors[name], elapsed)
+            for name in names
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", choices=sorted(SCALES), default="smoke")
+    parser.add_argument("--mix", default="mixed", help=f"one of {sorted(MIXES)} or name=weight,...")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--duration", type=float, default=0, help="seconds; overrides --requests")
+    parser.add_argument("--users", type=int, default=1_000, help="distinct learners acting")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    scale = SCALES[args.scale]
+    mix = parse_mix(args.mix)
+    log = lambda message: print(message, file=sys.stderr)  # noqa: E731
+
+    # Every virtual user shares one client address and logs in far more
+    # often than a person would; throttled, the login mix would be all 429s.
+    login_throttle.by_email.rate = login_throttle.by_ip.rate = 0
+    loaded = populate(store, scale, args.seed, log=log)
+    rss_after_load = peak_rss_mb()
+    try:
+        result = asyncio.run(run(args, scale, mix))
+    finally:
+        hasher.shutdown()
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "storage_backend": STORAGE_BACKEND,
+        "params": {
+            "scale": args.scale, "mix": mix, "concurrency": args.concurrency,
+            "requests": args.requests, "duration": args.duration,
+            "users": args.users, "seed": args.seed,
+        },
+        "load": loaded,
+        "peak_rss_mb": {"after_load": rss_after_load, "end": peak_rss_mb()},
+        **result,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+        log(f"wrote {args.out}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
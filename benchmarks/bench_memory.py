@@ -0,0 +1,90 @@
+"""Resident memory of the memory backend per million records.
+
+Each configuration loads the records into a fresh MemoryRepository in its
+own process, so the peak RSS it reports is not polluted by the others:
+``models`` keeps the pydantic models as before, ``compact`` packs them into
+the slotted records the store now uses. Records are generated in chunks,
+as the load generator does, so the working set is the repository itself.
+
+    python -m benchmarks.bench_memory [--records 1000000] [--collection enrollments]
+"""
+import argparse
+import gc
+import json
+import resource
+import subprocess
+import sys
+
+from app.domain.enrollment import Enrollment
+from app.domain.feedback import Feedback
+from app.domain.learning_progress import LearningProgress
+from app.repository.compact import EnrollmentRecord, FeedbackRecord, ProgressRecord
+from app.repository.memory import MemoryRepository
+
+from .datagen import Generator, Scale, _load
+
+COLLECTIONS = {
+    "enrollments": (Enrollment, "enrollment_id", ("learner_id", "course_id", "status"), EnrollmentRecord),
+    "progress": (LearningProgress, "progress_id", ("learner_id", "course_id", "status"), ProgressRecord),
+    "feedback": (Feedback, "feedback_id", ("learner_id", "course_id"), FeedbackRecord),
+}
+
+
+def rss_kb() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() // 1024
+
+
+def run(collection: str, mode: str, records: int) -> dict:
+    model, key_field, indexed, record = COLLECTIONS[collection]
+    scale = Scale(learners=100_000, courses=10_000, enrollments=records,
+                  progress=records, feedback=records)
+    items = getattr(Generator(scale), collection)()
+    gc.collect()
+    before = rss_kb()
+    repository = MemoryRepository(
+        {}, model, key_field, indexed, record=record if mode == "compact" else None
+    )
+    count = _load(repository.save_many, items)
+    gc.collect()
+    after = rss_kb()
+    return {
+        "collection": collection,
+        "mode": mode,
+        "records": count,
+        "rss_mb": round((after - before) / 1024, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "bytes_per_record": round((after - before) * 1024 / count),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--collection", choices=sorted(COLLECTIONS), nargs="+",
+                        default=["enrollments", "progress", "feedback"])
+    parser.add_argument("--mode", choices=("models", "compact"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run(args.collection[0], args.mode, args.records)))
+        return
+
+    results = []
+    for collection in args.collection:
+        for mode in ("models", "compact"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_memory", "--records", str(args.records),
+                 "--collection", collection, "--mode", mode],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            results.append(json.loads(out))
+            r = results[-1]
+            print(f"{collection:<12} {mode:<8} {r['rss_mb']:>8.1f} MB  "
+                  f"peak {r['peak_rss_mb']:>8.1f} MB  {r['bytes_per_record']:>5} B/record",
+                  file=sys.stderr)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
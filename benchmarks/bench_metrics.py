@@ -0,0 +1,84 @@
+"""Per-request overhead of MetricsMiddleware.
+
+Times the same trivial FastAPI route with and without the middleware, both
+through httpx's ASGI transport (what a client sees) and by calling the
+ASGI app directly (the middleware's own cost, without client overhead).
+
+    python -m benchmarks.bench_metrics [--requests 20000]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.metrics import Exposition, Metrics, MetricsMiddleware
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"item_id": item_id}
+
+    return app
+
+
+async def through_client(asgi, requests: int) -> float:
+    transport = httpx.ASGITransport(app=asgi)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for i in range(requests):
+            await client.get(f"/items/{i}")
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+async def direct(asgi, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for i in range(requests):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": f"/items/{i}", "raw_path": b"",
+            "query_string": b"", "root_path": "", "headers": [], "server": ("bench", 80),
+        }
+        await asgi(scope, receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main_async(requests: int) -> None:
+    plain = make_app()
+    metrics = Metrics()
+    instrumented = make_app()
+    instrumented.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    for label, run in [("httpx client", through_client), ("direct ASGI", direct)]:
+        await run(plain, 500)
+        await run(instrumented, 500)
+        without = await run(plain, requests)
+        with_metrics = await run(instrumented, requests)
+        print(f"{label:<13} without {without:7.1f} us   with {with_metrics:7.1f} us   "
+              f"overhead {with_metrics - without:+6.1f} us ({(with_metrics / without - 1) * 100:+.1f}%)")
+
+    start = time.perf_counter()
+    out = Exposition()
+    metrics.expose(out)
+    body = out.render()
+    print(f"render: {len(body)} bytes in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    asyncio.run(main_async(parser.parse_args().requests))
+
+
+if __name__ == "__main__":
+    main()
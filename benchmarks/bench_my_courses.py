@@ -0,0 +1,60 @@
+"""Cost of finding one learner's enrollments for /courses/my-courses.
+
+Compares the learner_id secondary index against the old scan over every
+enrollment on the platform.
+
+    python -m benchmarks.bench_my_courses [--enrollments 1000000] [--learners 100000]
+"""
+import argparse
+import random
+import time
+
+from app.domain.enrollment import Enrollment, EnrollmentStatus
+from app.repository.memory import MemoryRepository
+
+
+def build_repository(enrollments: int, learners: int, courses: int, rng: random.Random):
+    repo = MemoryRepository({}, Enrollment, "enrollment_id", ("learner_id", "course_id"))
+    for i in range(enrollments):
+        repo.save(Enrollment.model_construct(
+            enrollment_id=f"e-{i}",
+            learner_id=f"l-{rng.randrange(learners)}",
+            course_id=f"c-{rng.randrange(courses)}",
+            status=EnrollmentStatus.ACTIVE,
+        ))
+    return repo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    parser.add_argument("--learners", type=int, default=100_000)
+    parser.add_argument("--courses", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    repo = build_repository(args.enrollments, args.learners, args.courses, rng)
+    print(f"built {args.enrollments} enrollments in {time.perf_counter() - start:.1f}s")
+
+    learner_ids = [f"l-{rng.randrange(args.learners)}" for _ in range(args.lookups)]
+
+    start = time.perf_counter()
+    for learner_id in learner_ids:
+        repo.find_by("learner_id", learner_id)
+    indexed = (time.perf_counter() - start) / len(learner_ids) * 1e6
+
+    scans = learner_ids[:20]
+    start = time.perf_counter()
+    for learner_id in scans:
+        [e for e in repo._data.values() if e.learner_id == learner_id]
+    scanned = (time.perf_counter() - start) / len(scans) * 1e6
+
+    print(f"index: {indexed:.2f} us/lookup")
+    print(f"scan:  {scanned:.0f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
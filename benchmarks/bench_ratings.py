@@ -0,0 +1,68 @@
+"""Cost of a course's rating summary: running aggregate vs. scanning feedback.
+
+    python -m benchmarks.bench_ratings [--feedback 500000] [--courses 5000]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.domain.feedback import Feedback, Rating
+from app.ratings import RatingsIndex
+from app.repository import store
+
+CATEGORIES = ("general", "content", "instructor", "pace")
+
+
+def make_feedback(i: int, courses: int, rng: random.Random) -> Feedback:
+    return Feedback.model_construct(
+        feedback_id=f"f-{i}",
+        learner_id=f"l-{i}",
+        course_id=f"c-{rng.randrange(courses)}",
+        comment="",
+        rating=Rating.model_construct(
+            value=rng.randint(1, 5), comment_category=rng.choice(CATEGORIES)
+        ),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--feedback", type=int, default=500_000)
+    parser.add_argument("--courses", type=int, default=5_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ratings = RatingsIndex(store)
+    ratings.sync()
+    items = [make_feedback(i, args.courses, rng) for i in range(args.feedback)]
+
+    start = time.perf_counter()
+    for item in items[:10_000]:
+        ratings.save(item)
+    per_write = (time.perf_counter() - start) / 10_000 * 1e6
+    start = time.perf_counter()
+    ratings.save_many(items[10_000:])
+    print(f"save: {per_write:.1f} us/item one by one, "
+          f"batch of {args.feedback - 10_000} in {time.perf_counter() - start:.2f}s")
+
+    courses = [f"c-{rng.randrange(args.courses)}" for _ in range(args.lookups)]
+    scan, aggregate = [], []
+    for course_id in courses:
+        start = time.perf_counter()
+        values = [f.rating.value for f in store.feedback.list() if f.course_id == course_id]
+        sum(values) / max(len(values), 1)
+        scan.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        ratings.get(course_id).as_dict()
+        aggregate.append((time.perf_counter() - start) * 1000)
+
+    print(f"scan      median {statistics.median(scan):8.3f} ms")
+    print(f"aggregate median {statistics.median(aggregate):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
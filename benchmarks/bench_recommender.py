@@ -0,0 +1,71 @@
+"""Model build time and per-request latency of the recommendation engine.
+
+Interactions are drawn so that learners cluster around a few "home" topics,
+which is what gives item-item similarity something to find.
+
+    python -m benchmarks.bench_recommender [--learners 100000] [--courses 10000]
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.domain.course import Course
+from app.domain.user import Learner
+from app.recommender import RecommendationEngine
+from app.repository import store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--learners", type=int, default=100_000)
+    parser.add_argument("--courses", type=int, default=10_000)
+    parser.add_argument("--per-learner", type=int, default=12)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    catalog = [
+        Course.model_construct(
+            course_id=f"c-{i}", title=f"Course {i}", description="", instructor_id="i", detail=None
+        )
+        for i in range(args.courses)
+    ]
+    topic_of_course = rng.integers(0, args.topics, args.courses)
+    courses_by_topic = [np.flatnonzero(topic_of_course == t) for t in range(args.topics)]
+
+    learner_ids, course_ids = [], []
+    for learner in range(args.learners):
+        home = courses_by_topic[rng.integers(args.topics)]
+        picks = np.concatenate([
+            rng.choice(home, size=min(len(home), args.per_learner * 3 // 4), replace=False),
+            rng.integers(0, args.courses, args.per_learner // 4),
+        ])
+        learner_ids.extend([f"l-{learner}"] * len(picks))
+        course_ids.extend(f"c-{c}" for c in picks)
+    weights = rng.uniform(0.1, 3.0, len(learner_ids))
+
+    engine = RecommendationEngine(store)
+    start = time.perf_counter()
+    engine.fit(learner_ids, course_ids, weights, catalog)
+    build = time.perf_counter() - start
+
+    latencies = []
+    for learner in rng.integers(0, args.learners, args.queries):
+        query = Learner.model_construct(learner_id=f"l-{learner}", profile=None)
+        start = time.perf_counter()
+        engine.recommend(query, k=10)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    print(f"interactions: {len(learner_ids)}")
+    print(f"model build:  {build:.1f} s")
+    print(f"recommend:    p50 {statistics.median(latencies):.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Index build time and query latency for /courses/search on a large catalog.
+
+    python -m benchmarks.bench_search [--courses 50000]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.domain.course import Course, CourseLesson, CourseModule, CourseTopic
+from app.search import CourseSearchIndex
+
+
+def vocabulary(rng: random.Random, size: int):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(size)]
+
+
+def make_course(i: int, rng: random.Random, words) -> Course:
+    # Zipf-ish word choice so some terms are very common and most are rare.
+    def text(n):
+        return " ".join(words[min(int(rng.paretovariate(1.1)) - 1, len(words) - 1)] for _ in range(n))
+
+    return Course.model_construct(
+        course_id=f"c-{i}",
+        title=text(4),
+        description=text(20),
+        instructor_id="i-1",
+        modules=[
+            CourseModule.model_construct(title=text(3), description=text(10), lessons=[
+                CourseLesson.model_construct(title=text(3), description=text(8), topics=[
+                    CourseTopic.model_construct(title=text(3), description=text(6))
+                    for _ in range(3)
+                ])
+                for _ in range(3)
+            ])
+            for _ in range(3)
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--courses", type=int, default=50_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = vocabulary(rng, args.vocabulary)
+    rng.shuffle(words)
+
+    index = CourseSearchIndex()
+    elapsed = 0.0
+    for i in range(args.courses):
+        course = make_course(i, rng, words)
+        start = time.perf_counter()
+        index.add(course)
+        elapsed += time.perf_counter() - start
+    print(f"indexed {args.courses} courses in {elapsed:.1f}s (excluding data generation)")
+
+    for label, make_query in [
+        ("single term", lambda: words[rng.randrange(2_000)]),
+        ("two terms", lambda: f"{words[rng.randrange(2_000)]} {words[rng.randrange(2_000)]}"),
+        ("prefix", lambda: words[rng.randrange(2_000)][:3]),
+        ("common term", lambda: words[rng.randrange(5)]),
+    ]:
+        latencies = []
+        for _ in range(args.queries):
+            query = make_query()
+            start = time.perf_counter()
+            index.search(query, 20)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        print(f"{label:<12} p50 {statistics.median(latencies):6.2f} ms   "
+              f"p99 {latencies[int(len(latencies) * 0.99)]:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Parallel enrollment writes through insert_if_absent, by thread count.
+
+Each thread enrolls ``--learners`` learners into a course; ``--overlap``
+of the attempts target keys another thread also writes, so duplicates are
+rejected under contention. Runs with the default lock striping and with a
+single stripe (one lock for every key) and checks there are no duplicates.
+
+    python -m benchmarks.bench_striped_writes [--learners 20000] [--threads 1 2 4 8]
+"""
+import argparse
+import threading
+import time
+
+from app.domain.enrollment import Enrollment, EnrollmentStatus
+from app.repository.memory import MemoryRepository
+
+
+def run(threads: int, learners: int, overlap: float, stripes: int) -> dict:
+    repository_class = type("StripedRepository", (MemoryRepository,), {"stripes": stripes})
+    repo = repository_class({}, Enrollment, "enrollment_id", ("learner_id", "course_id", "status"))
+    shared = int(learners * overlap)
+    batches = [
+        [
+            Enrollment.model_construct(
+                enrollment_id=f"l-{key}-c-1", learner_id=f"l-{key}", course_id="c-1",
+                status=EnrollmentStatus.ACTIVE,
+            )
+            for key in (
+                n if n < shared else f"{worker}-{n}" for n in range(learners)
+            )
+        ]
+        for worker in range(threads)
+    ]
+    inserted = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(i: int) -> None:
+        barrier.wait()
+        inserted[i] = sum(repo.insert_if_absent(e) for e in batches[i])
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    expected = shared + (learners - shared) * threads
+    assert sum(inserted) == repo.count() == expected, "duplicate or lost insert"
+    return {"attempts_per_sec": threads * learners / elapsed, "inserted": sum(inserted)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--learners", type=int, default=20_000)
+    parser.add_argument("--overlap", type=float, default=0.5)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    for stripes in (MemoryRepository.stripes, 1):
+        base = None
+        for threads in args.threads:
+            result = run(threads, args.learners, args.overlap, stripes)
+            base = base or result["attempts_per_sec"]
+            print(f"stripes={stripes:<3} threads={threads}  "
+                  f"{result['attempts_per_sec']:>10,.0f} attempts/s  "
+                  f"x{result['attempts_per_sec'] / base:.2f}  inserted={result['inserted']}  duplicates=0")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Throughput scaling of uvicorn --workers N over one shared SQLite/WAL file.
+
+Seeds a SQLite database with the generator, then for each worker count
+starts a real uvicorn server on that file and drives it over TCP from
+``--load-procs`` load-generator processes running a scenario mix.
+
+    python -m benchmarks.bench_workers [--workers 1 2 4] [--mix browse] [--duration 10]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from app.api.auth_router import create_access_token
+from app.repository.sqlite import create_sqlite_store
+
+from .datagen import SCALES, email_of, populate
+from .scenarios import EXPECTED_STATUS, MIXES, SCENARIOS, VirtualUser
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, path: str, cwd=None, env=None) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "STORAGE_BACKEND": "sqlite",
+        "SQLITE_PATH": path,
+        "WORKERS": str(workers),
+        "HASH_WORKERS": "0",
+        # All load comes from one address; see bench_load.
+        "LOGIN_EMAIL_RATE_PER_MINUTE": "0",
+        "LOGIN_IP_RATE_PER_MINUTE": "0",
+        **(env or {}),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env, cwd=cwd,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+def load_process(port, scale_name, mix, concurrency, duration, seed, results):
+    scale = SCALES[scale_name]
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    rng = random.Random(seed)
+    users = [
+        VirtualUser(i, f"l-{i}", {"Authorization": "Bearer " + create_access_token(
+            {"sub": f"l-{i}", "email": email_of(i)}
+        )})
+        for i in rng.sample(range(scale.learners), min(200, scale.learners))
+    ]
+
+    async def run():
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + duration
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30
+        ) as client:
+            async def user(worker):
+                nonlocal errors
+                local = random.Random(seed * 1000 + worker)
+                while time.perf_counter() < deadline:
+                    name = local.choices(names, weights)[0]
+                    start = time.perf_counter()
+                    try:
+                        response = await SCENARIOS[name](client, local.choice(users), local, scale)
+                    except httpx.TransportError:
+                        # Timeouts and refused connections count as failures.
+                        response = None
+                    latencies.append(time.perf_counter() - start)
+                    if response is None or response.status_code not in EXPECTED_STATUS.get(name, (200,)):
+                        errors += 1
+
+            await asyncio.gather(*(user(w) for w in range(concurrency)))
+        return latencies, errors
+
+    results.put(asyncio.run(run()))
+
+
+def measure(workers, args, path) -> dict:
+    port = free_port()
+    server = start_server(workers, port, path)
+    try:
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=load_process, args=(
+                port, args.scale, MIXES[args.mix], args.concurrency, args.duration,
+                args.seed + i, results,
+            ))
+            for i in range(args.load_procs)
+        ]
+        for proc in procs:
+            proc.start()
+        collected = [results.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies = sorted(value for values, _ in collected for value in values)
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in collected),
+        "throughput_rps": round(len(latencies) / args.duration, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="smoke")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="browse")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=16, help="per load process")
+    parser.add_argument("--load-procs", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lernex.db")
+        populate(create_sqlite_store(path), SCALES[args.scale], args.seed,
+                 log=lambda message: print(message, file=sys.stderr))
+        curve = [measure(workers, args, path) for workers in args.workers]
+
+    base = curve[0]["throughput_rps"] or 1
+    for point in curve:
+        print(f"workers={point['workers']:<3} {point['throughput_rps']:>8.1f} req/s  "
+              f"x{point['throughput_rps'] / base:.2f}  p50 {point['p50_ms']:.1f} ms  "
+              f"p99 {point['p99_ms']:.1f} ms  errors={point['errors']}", file=sys.stderr)
+    print(json.dumps({"cpus": os.cpu_count(), "params": vars(args), "curve": curve}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
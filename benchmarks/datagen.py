@@ -0,0 +1,214 @@
+"""Seeded synthetic data for the load tests.
+
+``populate`` fills the repositories behind ``app.repository.store`` with
+deterministic ids, so two runs with the same seed and scale see the same
+data and scenario drivers can address records without looking them up:
+
+    learners     l-<i>           learner<i>@bench.lernex / PASSWORD
+    instructors  bench-i-<i>
+    courses      bench-c-<i>     topics bench-c-<i>-t<m>.<l>.<t>
+    enrollments  <learner_id>-<course_id>   (same id POST /courses/{id}/enroll uses)
+    progress     bench-p-<i>
+    feedback     bench-f-<i>
+
+Course popularity is Zipf-like, so a few courses hold most enrollments.
+Models are built with ``model_construct``; the generator trusts its own
+data instead of paying for validation on millions of records.
+"""
+import itertools
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List
+
+from app.domain.course import Course, CourseLesson, CourseModule, CourseTopic, Instructor
+from app.domain.enrollment import Enrollment, EnrollmentStatus
+from app.domain.feedback import Feedback, Rating
+from app.domain.learning_progress import LearningProgress, ProgressStatus
+from app.domain.user import Learner
+from app.hashing import pwd_context
+from app.repository.base import Store
+
+PASSWORD = "benchpassword"
+CHUNK = 50_000
+CATEGORIES = ("general", "content", "instructor", "pace", "difficulty")
+WORDS = (
+    "python data web cloud security design machine learning statistics api "
+    "testing devops mobile react sql algorithms networks linux rust golang "
+    "marketing finance writing leadership product analytics visualization"
+).split()
+
+
+@dataclass
+class Scale:
+    learners: int
+    courses: int
+    enrollments: int
+    progress: int
+    feedback: int
+    modules: int = 5
+    lessons: int = 4
+    topics: int = 5
+    instructors: int = 500
+
+
+SCALES: Dict[str, Scale] = {
+    "smoke": Scale(learners=1_000, courses=200, enrollments=10_000, progress=5_000,
+                   feedback=2_000, modules=3, lessons=3, topics=3, instructors=20),
+    "small": Scale(learners=50_000, courses=5_000, enrollments=500_000,
+                   progress=250_000, feedback=100_000),
+    # The full target volume; needs tens of GB of RAM with the memory backend.
+    "full": Scale(learners=1_000_000, courses=50_000, enrollments=10_000_000,
+                  progress=10_000_000, feedback=10_000_000),
+}
+
+
+def email_of(i: int) -> str:
+    return f"learner{i}@bench.lernex"
+
+
+def course_id_of(i: int) -> str:
+    return f"bench-c-{i}"
+
+
+def topic_id_of(course: int, module: int, lesson: int, topic: int) -> str:
+    return f"{course_id_of(course)}-t{module}.{lesson}.{topic}"
+
+
+class Generator:
+    def __init__(self, scale: Scale, seed: int = 42):
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        # Zipf-like course popularity, sampled with cumulative weights.
+        weights = [1 / (rank + 1) ** 1.1 for rank in range(scale.courses)]
+        self._course_cum = list(itertools.accumulate(weights))
+        self._course_order = list(range(scale.courses))
+        self.rng.shuffle(self._course_order)
+
+    def text(self, words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=words))
+
+    def popular_courses(self, k: int) -> List[int]:
+        ranks = self.rng.choices(range(self.scale.courses), cum_weights=self._course_cum, k=k)
+        return [self._course_order[rank] for rank in ranks]
+
+    def learners(self) -> Iterator[Learner]:
+        password_hash = pwd_context.hash(PASSWORD)
+        for i in range(self.scale.learners):
+            yield Learner.model_construct(
+                learner_id=f"l-{i}", name=f"Learner {i}", email=email_of(i),
+                password_hash=password_hash, join_date=self.now, profile=None,
+            )
+
+    def instructors(self) -> Iterator[Instructor]:
+        for i in range(self.scale.instructors):
+            yield Instructor.model_construct(
+                instructor_id=f"bench-i-{i}", name=f"Instructor {i}", bio=None
+            )
+
+    def courses(self) -> Iterator[Course]:
+        s = self.scale
+        for c in range(s.courses):
+            modules = []
+            for m in range(s.modules):
+                lessons = []
+                for l in range(s.lessons):
+                    topics = [
+                        CourseTopic.model_construct(
+                            topic_id=topic_id_of(c, m, l, t), title=self.text(3),
+                            description=self.text(8), order=t + 1,
+                            estimated_duration_minutes=self.rng.randint(5, 30),
+                            content_url=None, created_at=self.now,
+                        )
+                        for t in range(s.topics)
+                    ]
+                    lessons.append(CourseLesson.model_construct(
+                        lesson_id=f"{course_id_of(c)}-l{m}.{l}", title=self.text(3),
+                        description=self.text(8), order=l + 1, topics=topics,
+                        estimated_duration_minutes=None, created_at=self.now,
+                    ))
+                modules.append(CourseModule.model_construct(
+                    module_id=f"{course_id_of(c)}-m{m}", title=self.text(3),
+                    description=self.text(10), order=m + 1, lessons=lessons,
+                    estimated_duration_minutes=None, created_at=self.now,
+                ))
+            yield Course.model_construct(
+                course_id=course_id_of(c), title=self.text(4), description=self.text(20),
+                instructor_id=f"bench-i-{self.rng.randrange(s.instructors)}",
+                modules=modules, detail=None, created_at=self.now, updated_at=self.now,
+            )
+
+    def enrollments(self) -> Iterator[Enrollment]:
+        s = self.scale
+        seen = set()
+        produced = 0
+        while produced < s.enrollments:
+            batch = min(CHUNK, s.enrollments - produced)
+            for course in self.popular_courses(batch):
+                learner = self.rng.randrange(s.learners)
+                key = (learner, course)
+                if key in seen:
+                    continue
+                seen.add(key)
+                produced += 1
+                yield Enrollment.model_construct(
+                    enrollment_id=f"l-{learner}-{course_id_of(course)}",
+                    learner_id=f"l-{learner}", course_id=course_id_of(course),
+                    enrollment_date=self.now - timedelta(minutes=self.rng.randrange(500_000)),
+                    status=EnrollmentStatus.ACTIVE,
+                )
+
+    def progress(self) -> Iterator[LearningProgress]:
+        s = self.scale
+        for i, course in enumerate(self.popular_courses(s.progress)):
+            rate = round(self.rng.random(), 2)
+            yield LearningProgress.model_construct(
+                progress_id=f"bench-p-{i}", learner_id=f"l-{self.rng.randrange(s.learners)}",
+                course_id=course_id_of(course), completion_rate=rate,
+                last_accessed=self.now - timedelta(minutes=self.rng.randrange(500_000)),
+                status=ProgressStatus.COMPLETED if rate == 1.0 else ProgressStatus.IN_PROGRESS,
+                completed_topics=b"",
+            )
+
+    def feedback(self) -> Iterator[Feedback]:
+        s = self.scale
+        for i, course in enumerate(self.popular_courses(s.feedback)):
+            yield Feedback.model_construct(
+                feedback_id=f"bench-f-{i}", learner_id=f"l-{self.rng.randrange(s.learners)}",
+                course_id=course_id_of(course), comment=self.text(12),
+                rating=Rating.model_construct(
+                    value=self.rng.choices((1, 2, 3, 4, 5), (1, 1, 3, 6, 9))[0],
+                    comment_category=self.rng.choice(CATEGORIES),
+                ),
+            )
+
+
+def _load(save_many: Callable, items: Iterator) -> int:
+    count = 0
+    while True:
+        chunk = list(itertools.islice(items, CHUNK))
+        if not chunk:
+            return count
+        save_many(chunk)
+        count += len(chunk)
+
+
+def populate(store: Store, scale: Scale, seed: int = 42, log: Callable = print) -> Dict:
+    """Fill ``store`` and return what was loaded and how long each part took."""
+    generator = Generator(scale, seed)
+    report = {"scale": asdict(scale), "seed": seed, "seconds": {}}
+    for name, repository, items in [
+        ("learners", store.learners, generator.learners()),
+        ("instructors", store.instructors, generator.instructors()),
+        ("courses", store.courses, generator.courses()),
+        ("enrollments", store.enrollments, generator.enrollments()),
+        ("progress", store.progress, generator.progress()),
+        ("feedback", store.feedback, generator.feedback()),
+    ]:
+        start = time.perf_counter()
+        count = _load(repository.save_many, items)
+        report["seconds"][name] = round(time.perf_counter() - start, 2)
+        log(f"loaded {count} {name} in {report['seconds'][name]}s")
+    return report
@@ -0,0 +1,78 @@
+"""Scenario drivers for the load test.
+
+A scenario is one user action: an async function taking the client, the
+acting virtual user and a seeded ``random.Random``, and returning the
+response. A mix assigns weights to scenarios; each virtual user picks its
+next action from the mix.
+"""
+import random
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict
+
+import httpx
+
+from .datagen import PASSWORD, Scale, course_id_of, email_of, topic_id_of
+
+
+@dataclass
+class VirtualUser:
+    index: int
+    learner_id: str
+    headers: Dict[str, str]
+
+
+Scenario = Callable[[httpx.AsyncClient, VirtualUser, random.Random, Scale], Awaitable[httpx.Response]]
+
+
+async def login(client, user, rng, scale):
+    return await client.post(
+        "/auth/login", json={"email": email_of(user.index), "password": PASSWORD}
+    )
+
+
+async def browse_catalog(client, user, rng, scale):
+    if rng.random() < 0.5:
+        return await client.get("/courses/?limit=20", headers=user.headers)
+    course = course_id_of(rng.randrange(scale.courses))
+    return await client.get(f"/courses/{course}", headers=user.headers)
+
+
+async def my_courses(client, user, rng, scale):
+    return await client.get("/courses/my-courses?limit=50", headers=user.headers)
+
+
+async def enroll(client, user, rng, scale):
+    course = course_id_of(rng.randrange(scale.courses))
+    return await client.post(f"/courses/{course}/enroll", headers=user.headers)
+
+
+async def progress_update(client, user, rng, scale):
+    c = rng.randrange(scale.courses)
+    topic = topic_id_of(
+        c, rng.randrange(scale.modules), rng.randrange(scale.lessons), rng.randrange(scale.topics)
+    )
+    return await client.post(
+        f"/progress/{course_id_of(c)}/topics/{topic}/complete", headers=user.headers
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "login": login,
+    "browse_catalog": browse_catalog,
+    "my_courses": my_courses,
+    "enroll": enroll,
+    "progress_update": progress_update,
+}
+
+MIXES: Dict[str, Dict[str, float]] = {
+    "mixed": {
+        "login": 0.02, "browse_catalog": 0.45, "my_courses": 0.25,
+        "enroll": 0.08, "progress_update": 0.20,
+    },
+    "browse": {"browse_catalog": 0.8, "my_courses": 0.2},
+    "write": {"enroll": 0.5, "progress_update": 0.5},
+    "login": {"login": 1.0},
+}
+
+# Expected outcomes: re-enrolling returns 400, which is not a failure.
+EXPECTED_STATUS = {"enroll": (200, 400)}
@@ -1,14 +1,8 @@
 import pytest
 from fastapi.testclient import TestClient
+from app.login_throttle import login_throttle
 from app.main import app
-from app.storage import (
-    _learners, 
-    _enrollments, 
-    _feedback_store, 
-    _progress_store, 
-    _records, 
-    _recommendations
-)
+from app.repository import store
 
 @pytest.fixture(scope="module")
 def client():
@@ -17,12 +11,13 @@ def client():
 
 @pytest.fixture(scope="function", autouse=True)
 def reset_db():
-    _learners.clear()
-    _enrollments.clear()
-    _feedback_store.clear()
-    _progress_store.clear()
-    _records.clear()
-    _recommendations.clear()
+    store.learners.clear()
+    store.enrollments.clear()
+    store.feedback.clear()
+    store.progress.clear()
+    store.records.clear()
+    store.recommendations.clear()
+    login_throttle.clear()
     
     yield
 
@@ -1,3 +1,5 @@
+from app.metrics import metrics
+
 def test_register_learner(client):
     response = client.post("/auth/register", json={
         "name": "New User",
@@ -15,6 +17,14 @@ def test_register_duplicate_email(client, test_learner_payload):
     assert response.status_code == 400
     assert response.json()["detail"] == "Email already registered"
 
+def test_register_duplicate_email_different_case(client, test_learner_payload):
+    client.post("/auth/register", json=test_learner_payload)
+    response = client.post("/auth/register", json={
+        **test_learner_payload,
+        "email": test_learner_payload["email"].upper(),
+    })
+    assert response.status_code == 400
+
 def test_login_success(client, test_learner_payload):
     client.post("/auth/register", json=test_learner_payload)
     
@@ -39,4 +49,81 @@ def test_login_invalid_credentials(client, test_learner_payload):
 def test_get_current_user(client, auth_headers):
     response = client.get("/auth/me", headers=auth_headers)
     assert response.status_code == 200
-    assert "email" in response.json()
\ No newline at end of file
+    assert "email" in response.json()
+
+def test_login_rejected_when_hasher_saturated(client, test_learner_payload, monkeypatch):
+    from app.hashing import hasher
+
+    client.post("/auth/register", json=test_learner_payload)
+    monkeypatch.setattr(hasher, "pending", hasher.max_pending)
+
+    response = client.post("/auth/login", json={
+        "email": test_learner_payload["email"],
+        "password": test_learner_payload["password"]
+    })
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_broken_hash_pool_is_replaced(client, test_learner_payload, monkeypatch):
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+    from app.hashing import hasher
+
+    class BrokenPool:
+        shut_down = False
+
+        def submit(self, *args):
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut_down = True
+
+    broken = BrokenPool()
+    monkeypatch.setattr(hasher, "workers", 1)
+    monkeypatch.setattr(hasher, "_executor", broken)
+
+    response = client.post("/auth/register", json=test_learner_payload)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert broken.shut_down
+    assert hasher._executor is None
+    assert hasher.pending == 0
+
+def test_repeated_requests_hit_token_cache(client, auth_headers):
+    from app.token_cache import token_cache
+
+    client.get("/auth/me", headers=auth_headers)
+    hits = token_cache.hits
+    response = client.get("/auth/me", headers=auth_headers)
+    assert response.status_code == 200
+    assert token_cache.hits == hits + 1
+
+def test_cached_token_rejected_after_learner_deleted(client, auth_headers):
+    learner_id = client.get("/auth/me", headers=auth_headers).json()["learner_id"]
+
+    response = client.delete(f"/learners/{learner_id}", headers=auth_headers)
+    assert response.status_code == 200
+
+    response = client.get("/auth/me", headers=auth_headers)
+    assert response.status_code == 401
+
+
+def test_login_is_throttled_per_email(client, test_learner_payload):
+    client.post("/auth/register", json=test_learner_payload)
+    bad_login = {"email": test_learner_payload["email"], "password": "wrong"}
+    metrics.reset()
+
+    # Registering took the first of the email's five attempts.
+    statuses = [client.post("/auth/login", json=bad_login).status_code for _ in range(4)]
+    assert statuses == [401] * 4
+    response = client.post("/auth/login", json={**bad_login, "email": bad_login["email"].upper()})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    # The refused attempt never reached bcrypt.
+    assert metrics.password_hashing[("verify",)].count == 4
+    assert 'lernex_login_throttled_total{scope="email"}' in client.get("/metrics").text
+
+    other = client.post("/auth/login", json={"email": "other@example.com", "password": "x"})
+    assert other.status_code == 401
@@ -4,6 +4,20 @@ def test_list_courses(client, auth_headers):
     data = response.json()
     assert isinstance(data, list)
     assert len(data) >= 3 
+    python_course = next(c for c in data if c["course_id"] == "course-001")
+    assert python_course["total_topics"] == 2
+    assert python_course["total_duration_minutes"] == 30
+
+def test_list_courses_paginates(client, auth_headers):
+    response = client.get("/courses/?limit=2", headers=auth_headers)
+    assert len(response.json()) == 2
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get(f"/courses/?limit=2&cursor={cursor}", headers=auth_headers)
+    assert [c["course_id"] for c in response.json()] == ["course-003"]
+
+    response = client.get("/courses/?instructor_id=instr-002", headers=auth_headers)
+    assert [c["course_id"] for c in response.json()] == ["course-002"]
 
 def test_get_course_detail(client, auth_headers):
     course_id = "course-001"
@@ -13,6 +27,124 @@ def test_get_course_detail(client, auth_headers):
     assert data["course_id"] == course_id
     assert "modules" in data
 
+def test_course_detail_fields(client, auth_headers):
+    response = client.get("/courses/course-001?fields=title,detail", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"course_id", "title", "detail"}
+    assert data["detail"]["total_topics"] == 2
+
+def test_course_detail_expand(client, auth_headers):
+    response = client.get("/courses/course-001?expand=modules.lessons", headers=auth_headers)
+    data = response.json()
+    assert data["description"] == "Learn Python basics from scratch"
+    lesson = data["modules"][0]["lessons"][0]
+    assert lesson["title"] == "Variables and Data Types"
+    assert "topics" not in lesson
+
+    response = client.get(
+        "/courses/course-001?fields=title,modules.lessons.topics.title", headers=auth_headers
+    )
+    topic = response.json()["modules"][0]["lessons"][0]["topics"][0]
+    assert topic == {"topic_id": "top-001", "title": "String Variables"}
+    assert response.headers["ETag"] != client.get(
+        "/courses/course-001", headers=auth_headers
+    ).headers["ETag"]
+
+def test_course_detail_rejects_unknown_selection(client, auth_headers):
+    response = client.get("/courses/course-001?fields=price", headers=auth_headers)
+    assert response.status_code == 400
+    response = client.get("/courses/course-001?expand=topics", headers=auth_headers)
+    assert response.status_code == 400
+
+def test_course_detail_conditional_get(client, auth_headers):
+    response = client.get("/courses/course-001", headers=auth_headers)
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        "/courses/course-001", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get(
+        "/courses/course-001", headers={**auth_headers, "If-None-Match": '"stale"'}
+    )
+    assert response.status_code == 200
+
+def test_list_courses_conditional_get(client, auth_headers):
+    response = client.get("/courses/?limit=2", headers=auth_headers)
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        "/courses/?limit=2", headers={**auth_headers, "If-None-Match": f"W/{etag}"}
+    )
+    assert response.status_code == 304
+    assert response.headers["X-Next-Cursor"]
+
+    response = client.get(
+        "/courses/?limit=1", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+def test_search_courses(client, auth_headers):
+    response = client.get("/courses/search?q=datafr", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [c["course_id"] for c in data] == ["course-003"]
+    assert data[0]["score"] > 0
+
+def test_course_ratings(client, auth_headers):
+    client.post("/feedback/batch", json=[
+        {"learner_id": "l-1", "course_id": "course-001", "comment": "Good",
+         "rating": {"value": 4, "comment_category": "content"}},
+        {"learner_id": "l-2", "course_id": "course-001", "comment": "Meh", "rating": {"value": 2}},
+    ], headers=auth_headers)
+
+    response = client.get("/courses/course-001/ratings", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 2
+    assert data["average"] == 3.0
+    assert data["histogram"] == {"1": 0, "2": 1, "3": 0, "4": 1, "5": 0}
+    assert data["categories"]["content"]["count"] == 1
+
+    listing = client.get("/courses/?include_ratings=true", headers=auth_headers).json()
+    rated = next(c for c in listing if c["course_id"] == "course-001")
+    assert (rated["rating_count"], rated["average_rating"]) == (2, 3.0)
+    assert "rating_count" not in client.get("/courses/", headers=auth_headers).json()[0]
+
+    client.post("/feedback/", json={
+        "learner_id": "l-3", "course_id": "course-001", "comment": "Top", "rating": {"value": 5},
+    }, headers=auth_headers)
+    listing = client.get("/courses/?include_ratings=true", headers=auth_headers).json()
+    rated = next(c for c in listing if c["course_id"] == "course-001")
+    assert rated["rating_count"] == 3
+
+def test_ratings_wait_for_the_index_lock_off_the_event_loop(client, auth_headers, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from app.ratings import ratings
+
+    client.get("/auth/me", headers=auth_headers)
+    monkeypatch.setattr(ratings, "_synced_version", None)
+    with ThreadPoolExecutor(3) as pool:
+        with ratings._lock:
+            # A feedback batch holds the lock; these calls wait for it...
+            waiting = [
+                pool.submit(client.get, "/courses/course-001/ratings", headers=auth_headers),
+                pool.submit(client.get, "/courses/?include_ratings=true", headers=auth_headers),
+            ]
+            # ...while the event loop keeps serving everything else.
+            other = pool.submit(client.get, "/auth/me", headers=auth_headers)
+            assert other.result(timeout=5).status_code == 200
+            assert not any(call.done() for call in waiting)
+        assert [call.result(timeout=5).status_code for call in waiting] == [200, 200]
+
+def test_course_ratings_not_found(client, auth_headers):
+    response = client.get("/courses/non-existent-id/ratings", headers=auth_headers)
+    assert response.status_code == 404
+
 def test_get_course_not_found(client, auth_headers):
     response = client.get("/courses/non-existent-id", headers=auth_headers)
     assert response.status_code == 404
@@ -32,6 +164,32 @@ def test_enroll_already_exists(client, auth_headers):
     assert response.status_code == 400
     assert response.json()["detail"] == "Already enrolled in this course"
 
+def test_reenroll_after_cancel(client, auth_headers):
+    enrollment_id = client.post("/courses/course-001/enroll", headers=auth_headers).json()["enrollment_id"]
+    client.post(f"/enrollments/{enrollment_id}/cancel", headers=auth_headers)
+
+    response = client.post("/courses/course-001/enroll", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["enrollment_id"] == enrollment_id
+    assert client.get(f"/enrollments/{enrollment_id}", headers=auth_headers).json()["status"] == "ACTIVE"
+    record = client.get("/learning-records/me", headers=auth_headers).json()
+    assert (record["enrollment_ids"], record["ongoing_course_ids"]) == ([enrollment_id], ["course-001"])
+    response = client.post("/courses/course-001/enroll", headers=auth_headers)
+    assert response.status_code == 400
+
+def test_enroll_ignores_a_row_planted_on_the_learners_key(client, auth_headers):
+    learner_id = client.get("/auth/me", headers=auth_headers).json()["learner_id"]
+    planted = {"enrollment_id": f"{learner_id}-course-003", "learner_id": "attacker", "course_id": "course-003"}
+    client.post("/enrollments/", json=planted, headers=auth_headers)
+
+    response = client.post("/courses/course-003/enroll", headers=auth_headers)
+    assert response.status_code == 200
+    enrollment_id = response.json()["enrollment_id"]
+    assert enrollment_id != planted["enrollment_id"]
+    assert client.get(f"/enrollments/{enrollment_id}", headers=auth_headers).json()["learner_id"] == learner_id
+    response = client.post("/courses/course-003/enroll", headers=auth_headers)
+    assert response.json()["detail"] == "Already enrolled in this course"
+
 def test_get_my_courses(client, auth_headers):
     client.post("/courses/course-001/enroll", headers=auth_headers)
     
@@ -39,4 +197,32 @@ def test_get_my_courses(client, auth_headers):
     assert response.status_code == 200
     data = response.json()
     assert len(data) > 0
-    assert data[0]["course_id"] == "course-001"
\ No newline at end of file
+    assert data[0]["course_id"] == "course-001"
+
+def test_my_courses_leave_out_cancelled_enrollments(client, auth_headers):
+    enrollment_id = client.post("/courses/course-001/enroll", headers=auth_headers).json()["enrollment_id"]
+    client.post("/courses/course-002/enroll", headers=auth_headers)
+    client.post(f"/enrollments/{enrollment_id}/cancel", headers=auth_headers)
+
+    response = client.get("/courses/my-courses", headers=auth_headers)
+    assert [c["course_id"] for c in response.json()] == ["course-002"]
+    record = client.get("/learning-records/me", headers=auth_headers).json()
+    assert record["ongoing_course_ids"] == ["course-002"]
+
+def test_my_courses_include_direct_enrollments(client, auth_headers):
+    learner_id = client.get("/auth/me", headers=auth_headers).json()["learner_id"]
+    client.post("/courses/course-001/enroll", headers=auth_headers)
+    client.post(
+        "/enrollments/",
+        json={"learner_id": learner_id, "course_id": "course-002"},
+        headers=auth_headers,
+    )
+    client.post(
+        "/enrollments/",
+        json={"learner_id": "someone-else", "course_id": "course-003"},
+        headers=auth_headers,
+    )
+
+    response = client.get("/courses/my-courses", headers=auth_headers)
+    assert response.status_code == 200
+    assert sorted(c["course_id"] for c in response.json()) == ["course-001", "course-002"]
\ No newline at end of file
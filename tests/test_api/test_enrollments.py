@@ -9,6 +9,12 @@ def test_create_enrollment_direct(client, auth_headers):
     assert response.status_code == 200
     assert response.json()["course_id"] == "course-002"
 
+def test_enrollment_date_reads_back_as_posted(client, auth_headers):
+    payload = {"learner_id": "l-1", "course_id": "course-001", "enrollment_date": "2024-01-01T00:00:00"}
+    created = client.post("/enrollments/", json=payload, headers=auth_headers).json()
+    fetched = client.get(f"/enrollments/{created['enrollment_id']}", headers=auth_headers).json()
+    assert created["enrollment_date"] == fetched["enrollment_date"] == "2024-01-01T00:00:00Z"
+
 def test_list_enrollments(client, auth_headers):
     response = client.get("/enrollments/", headers=auth_headers)
     assert response.status_code == 200
@@ -21,4 +27,111 @@ def test_get_enrollment_by_id(client, auth_headers):
     
     response = client.get(f"/enrollments/{enrollment_id}", headers=auth_headers)
     assert response.status_code == 200
-    assert response.json()["enrollment_id"] == enrollment_id
\ No newline at end of file
+    assert response.json()["enrollment_id"] == enrollment_id
+
+def test_list_enrollments_paginates_with_cursor(client, auth_headers):
+    for course_id in ["course-001", "course-002", "course-003"]:
+        client.post(
+            "/enrollments/",
+            json={"learner_id": "l-1", "course_id": course_id},
+            headers=auth_headers,
+        )
+    client.post("/enrollments/", json={"learner_id": "l-2", "course_id": "course-001"}, headers=auth_headers)
+
+    response = client.get("/enrollments/?learner_id=l-1&limit=2", headers=auth_headers)
+    assert [e["course_id"] for e in response.json()] == ["course-001", "course-002"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get(f"/enrollments/?learner_id=l-1&limit=2&cursor={cursor}", headers=auth_headers)
+    assert [e["course_id"] for e in response.json()] == ["course-003"]
+    assert "X-Next-Cursor" not in response.headers
+
+def test_list_enrollments_rejects_bad_cursor(client, auth_headers):
+    response = client.get("/enrollments/?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == 400
+
+def test_batch_enrollments_json_array(client, auth_headers):
+    payload = [
+        {"learner_id": "l-1", "course_id": "course-001"},
+        {"learner_id": "l-2", "course_id": "course-002"},
+    ]
+    response = client.post("/enrollments/batch", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 2, "errors": []}
+    assert len(client.get("/enrollments/", headers=auth_headers).json()) == 2
+
+def test_batch_enrollments_atomic_rejects_whole_batch(client, auth_headers):
+    payload = [
+        {"learner_id": "l-1", "course_id": "course-001"},
+        {"learner_id": "l-2"},
+    ]
+    response = client.post("/enrollments/batch", json=payload, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"]["errors"][0]["index"] == 1
+    assert client.get("/enrollments/", headers=auth_headers).json() == []
+
+def test_batch_enrollments_ndjson_partial(client, auth_headers):
+    body = "\n".join([
+        '{"enrollment_id": "e-1", "learner_id": "l-1", "course_id": "course-001"}',
+        '{"enrollment_id": "e-1", "learner_id": "l-1", "course_id": "course-002"}',
+        '{"learner_id": "l-3", "course_id": "course-003", "status": "UNKNOWN"}',
+        '{"learner_id": "l-4", "course_id": "course-003"}',
+    ])
+    response = client.post(
+        "/enrollments/batch?atomic=false",
+        content=body,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["inserted"] == 2
+    assert [e["index"] for e in data["errors"]] == [1, 2]
+
+def test_cancel_enrollment(client, auth_headers):
+    enrollment_id = client.post("/courses/course-001/enroll", headers=auth_headers).json()["enrollment_id"]
+
+    response = client.post(f"/enrollments/{enrollment_id}/cancel", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "CANCELLED"
+
+    response = client.post(f"/enrollments/{enrollment_id}/cancel", headers=auth_headers)
+    assert response.status_code == 400
+    assert client.post("/enrollments/missing/cancel", headers=auth_headers).status_code == 404
+
+    other = client.post("/enrollments/", json={"learner_id": "l-2", "course_id": "c-1"}, headers=auth_headers)
+    response = client.post(f"/enrollments/{other.json()['enrollment_id']}/cancel", headers=auth_headers)
+    assert response.status_code == 403
+
+
+def test_batch_reports_keys_taken_after_duplicate_check(client, auth_headers, monkeypatch):
+    from app.api import enrollment_router
+
+    insert_many = enrollment_router.learning_records.insert_many_if_absent
+    racing_ids = iter(["e-2", "e-4"])
+
+    def racing_insert(items, atomic):
+        # A single POST lands between the duplicate check and the write.
+        client.post("/enrollments/", json={"enrollment_id": next(racing_ids), "learner_id": "l-9",
+                                           "course_id": "course-003"}, headers=auth_headers)
+        return insert_many(items, atomic)
+
+    monkeypatch.setattr(enrollment_router.learning_records, "insert_many_if_absent", racing_insert)
+    payload = [
+        {"enrollment_id": "e-1", "learner_id": "l-1", "course_id": "course-001"},
+        {"enrollment_id": "e-2", "learner_id": "l-2", "course_id": "course-002"},
+    ]
+    response = client.post("/enrollments/batch", json=payload, headers=auth_headers)
+    assert response.status_code == 400
+    assert [e["index"] for e in response.json()["detail"]["errors"]] == [1]
+    assert client.get("/enrollments/e-1", headers=auth_headers).status_code == 404
+
+    payload = [
+        {"enrollment_id": "e-3", "learner_id": "l-1", "course_id": "course-001"},
+        {"enrollment_id": "e-4", "learner_id": "l-2", "course_id": "course-002"},
+    ]
+    response = client.post("/enrollments/batch?atomic=false", json=payload, headers=auth_headers)
+    assert response.json()["inserted"] == 1
+    assert [e["index"] for e in response.json()["errors"]] == [1]
+    for enrollment_id in ("e-2", "e-4"):
+        response = client.get(f"/enrollments/{enrollment_id}", headers=auth_headers)
+        assert response.json()["learner_id"] == "l-9"
@@ -0,0 +1,67 @@
+import json
+from datetime import datetime, timezone
+
+from app.api.export_router import iter_ndjson
+from app.domain.enrollment import Enrollment
+from app.repository import store
+from app.repository.sqlite import create_sqlite_store
+
+
+def test_export_enrollments_as_ndjson(client, auth_headers):
+    for course_id in ["course-001", "course-002"]:
+        client.post(
+            "/enrollments/",
+            json={"learner_id": "l-1", "course_id": course_id},
+            headers=auth_headers,
+        )
+
+    response = client.get("/export/enrollments", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["course_id"] for row in rows] == ["course-001", "course-002"]
+
+def test_export_progress_since(client, auth_headers):
+    client.post("/progress/", json={
+        "learner_id": "l-1",
+        "course_id": "course-001",
+        "last_accessed": "2024-01-01T00:00:00Z"
+    }, headers=auth_headers)
+    client.post("/progress/", json={
+        "learner_id": "l-1",
+        "course_id": "course-002",
+        "last_accessed": "2025-06-01T00:00:00Z"
+    }, headers=auth_headers)
+
+    response = client.get("/export/progress?since=2025-01-01T00:00:00", headers=auth_headers)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["course_id"] for row in rows] == ["course-002"]
+
+def test_export_feedback_rejects_since(client, auth_headers):
+    response = client.get("/export/feedback?since=2025-01-01T00:00:00", headers=auth_headers)
+    assert response.status_code == 400
+
+def test_export_unknown_collection(client, auth_headers):
+    response = client.get("/export/learners", headers=auth_headers)
+    assert response.status_code == 422
+
+def test_iter_ndjson_yields_one_chunk_per_page(client, auth_headers):
+    for course_id in ["course-001", "course-002", "course-003"]:
+        client.post(
+            "/enrollments/",
+            json={"learner_id": "l-1", "course_id": course_id},
+            headers=auth_headers,
+        )
+
+    chunks = list(iter_ndjson(store.enrollments, chunk_size=2))
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 1]
+
+def test_iter_ndjson_compares_naive_stored_timestamps_as_utc(tmp_path):
+    repository = create_sqlite_store(str(tmp_path / "lernex.db")).enrollments
+    for course_id, date in [("course-001", "2024-06-01T00:00:00"), ("course-002", "2025-06-01T00:00:00")]:
+        repository.save(Enrollment(learner_id="l-1", course_id=course_id, enrollment_date=date))
+
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = [json.loads(line) for chunk in iter_ndjson(repository, "enrollment_date", since)
+            for line in chunk.splitlines()]
+    assert [row["course_id"] for row in rows] == ["course-002"]
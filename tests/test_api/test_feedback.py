@@ -15,4 +15,13 @@ def test_create_feedback(client, auth_headers):
 def test_list_feedback(client, auth_headers):
     response = client.get("/feedback/", headers=auth_headers)
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
\ No newline at end of file
+    assert isinstance(response.json(), list)
+
+def test_batch_feedback(client, auth_headers):
+    payload = [
+        {"learner_id": "l-1", "course_id": "course-001", "comment": "Good", "rating": {"value": 4}},
+        {"learner_id": "l-2", "course_id": "course-001", "comment": "Great", "rating": {"value": 5}},
+    ]
+    response = client.post("/feedback/batch", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 2
\ No newline at end of file
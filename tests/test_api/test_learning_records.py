@@ -1,14 +1,33 @@
-def test_create_record(client, auth_headers):
+def test_records_cannot_be_written_by_clients(client, auth_headers):
+    me = client.get("/auth/me", headers=auth_headers).json()["learner_id"]
     payload = {
-        "learner_id": "l-1",
-        "completed_course_ids": ["c-1"],
-        "ongoing_course_ids": ["c-2"]
+        "record_id": f"record-{me}",
+        "learner_id": me,
+        "completed_course_ids": ["course-003"],
+        "enrollment_ids": ["bogus"]
     }
     response = client.post("/learning-records/", json=payload, headers=auth_headers)
-    assert response.status_code == 200
-    assert len(response.json()["completed_course_ids"]) == 1
+    assert response.status_code == 405
+
+    client.post("/courses/course-001/enroll", headers=auth_headers)
+    record = client.get("/learning-records/me", headers=auth_headers).json()
+    assert record["completed_course_ids"] == []
+    assert record["enrollment_ids"] == [f"{me}-course-001"]
 
 def test_list_records(client, auth_headers):
     response = client.get("/learning-records/", headers=auth_headers)
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
\ No newline at end of file
+    assert isinstance(response.json(), list)
+
+def test_my_record_follows_enrollments(client, auth_headers):
+    response = client.get("/learning-records/me", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["enrollment_ids"] == []
+
+    enrollment_id = client.post("/courses/course-001/enroll", headers=auth_headers).json()["enrollment_id"]
+    client.post("/courses/course-002/enroll", headers=auth_headers)
+    client.post(f"/enrollments/{enrollment_id}/cancel", headers=auth_headers)
+
+    record = client.get("/learning-records/me", headers=auth_headers).json()
+    assert record["ongoing_course_ids"] == ["course-002"]
+    assert len(record["enrollment_ids"]) == 1
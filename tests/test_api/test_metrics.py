@@ -0,0 +1,35 @@
+import time
+
+
+def test_metrics_exposition(client, auth_headers):
+    client.get("/courses/course-001", headers=auth_headers)
+    client.get("/courses/course-002", headers=auth_headers)
+    client.get("/no-such-path")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+
+    assert 'lernex_http_requests_total{method="GET",route="/courses/{course_id}",status="200"}' in body
+    assert 'route="<unmatched>",status="404"' in body
+    assert 'lernex_http_request_duration_seconds_bucket{method="GET",route="/courses/{course_id}",le="+Inf"}' in body
+    assert "lernex_http_requests_in_flight 1" in body
+    assert 'lernex_password_hashing_seconds_count{operation="hash"}' in body
+    assert "lernex_jwt_decode_seconds_count" in body
+    assert 'lernex_store_items{collection="courses"} 3' in body
+    assert 'lernex_cache_hit_ratio{cache="token"}' in body
+
+
+def test_domain_events_are_counted_off_the_request_path(client, auth_headers):
+    client.post("/courses/course-001/enroll", headers=auth_headers)
+
+    deadline = time.monotonic() + 5
+    while True:
+        body = client.get("/metrics").text
+        if 'lernex_domain_events_total{event="EnrollmentCreated"}' in body or time.monotonic() > deadline:
+            break
+        time.sleep(0.02)
+    assert 'lernex_domain_events_total{event="EnrollmentCreated"}' in body
+    assert 'lernex_events_handled_total{consumer="analytics",outcome="ok"}' in body
+    assert 'lernex_event_queue_depth{consumer="recommender"}' in body
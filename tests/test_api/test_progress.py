@@ -7,7 +7,8 @@ def test_create_progress(client, auth_headers):
     }
     response = client.post("/progress/", json=payload, headers=auth_headers)
     assert response.status_code == 200
-    assert response.json()["completion_rate"] == 0.5
+    # Rate and status follow the (empty) topic bitset, not the client.
+    assert response.json()["completion_rate"] == 0.0
 
 def test_get_progress_by_id(client, auth_headers):
     payload = {
@@ -20,4 +21,92 @@ def test_get_progress_by_id(client, auth_headers):
     
     response = client.get(f"/progress/{progress_id}", headers=auth_headers)
     assert response.status_code == 200
-    assert response.json()["progress_id"] == progress_id
\ No newline at end of file
+    assert response.json()["progress_id"] == progress_id
+
+def test_complete_topics(client, auth_headers):
+    response = client.post("/progress/course-001/topics/top-001/complete", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["completion_rate"] == 0.5
+    assert data["status"] == "IN_PROGRESS"
+
+    client.post("/progress/course-001/topics/top-001/complete", headers=auth_headers)
+    response = client.post("/progress/course-001/topics/top-002/complete", headers=auth_headers)
+    data = response.json()
+    assert data["completion_rate"] == 1.0
+    assert data["status"] == "COMPLETED"
+
+    listed = client.get("/progress/?course_id=course-001", headers=auth_headers).json()
+    assert [p["progress_id"] for p in listed] == [data["progress_id"]]
+
+def test_posted_status_and_rate_are_derived_from_topics(client, auth_headers):
+    learner_id = client.get("/auth/me", headers=auth_headers).json()["learner_id"]
+    payload = {
+        "learner_id": learner_id,
+        "course_id": "course-001",
+        "completion_rate": 1.0,
+        "status": "COMPLETED"
+    }
+    data = client.post("/progress/", json=payload, headers=auth_headers).json()
+    assert (data["completion_rate"], data["status"]) == (0.0, "IN_PROGRESS")
+
+    data = client.post("/progress/course-001/topics/top-001/complete", headers=auth_headers).json()
+    assert (data["completion_rate"], data["status"]) == (0.5, "IN_PROGRESS")
+    record = client.get("/learning-records/me", headers=auth_headers).json()
+    assert record["completed_course_ids"] == []
+
+    batch = [{"learner_id": "l-2", "course_id": "course-001", "status": "COMPLETED", "completed_topics": "Aw=="}]
+    client.post("/progress/batch", json=batch, headers=auth_headers)
+    stored = client.get("/progress/?learner_id=l-2", headers=auth_headers).json()[0]
+    assert (stored["completion_rate"], stored["status"]) == (1.0, "COMPLETED")
+
+def test_complete_unknown_topic(client, auth_headers):
+    response = client.post("/progress/course-001/topics/top-003/complete", headers=auth_headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Topic not found"
+    response = client.post("/progress/nope/topics/top-001/complete", headers=auth_headers)
+    assert response.json()["detail"] == "Course not found"
+
+def test_batch_progress(client, auth_headers):
+    payload = [
+        {"learner_id": "l-1", "course_id": "course-001", "completion_rate": 0.2},
+        {"learner_id": "l-1", "course_id": "course-002", "completion_rate": 0.9},
+    ]
+    response = client.post("/progress/batch", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 2
+
+
+def test_topic_bits_past_the_outline_are_dropped(client, auth_headers):
+    from app.repository import store
+
+    learner_id = client.get("/auth/me", headers=auth_headers).json()["learner_id"]
+    payload = {"learner_id": learner_id, "course_id": "course-001", "completed_topics": "Bg=="}
+    response = client.post("/progress/", json=payload, headers=auth_headers)
+    assert response.json()["completed_topics"] == "Ag=="
+    batch = [{"learner_id": "l-2", "course_id": "course-001", "completed_topics": "/w=="}]
+    client.post("/progress/batch", json=batch, headers=auth_headers)
+    assert store.progress.find_by("learner_id", "l-2")[0].completed_topics == b"\x03"
+
+    # Bits stored before the outline got shorter.
+    progress = store.progress.get(response.json()["progress_id"])
+    store.progress.save(progress.model_copy(update={"completed_topics": b"\x06"}))
+    response = client.post("/progress/course-001/topics/top-001/complete", headers=auth_headers)
+    data = response.json()
+    assert (data["completed_topics"], data["completion_rate"], data["status"]) == ("Aw==", 1.0, "COMPLETED")
+    record = client.get("/learning-records/me", headers=auth_headers).json()
+    assert record["completed_course_ids"] == ["course-001"]
+
+
+def test_complete_topic_ignores_a_row_planted_on_the_learners_key(client, auth_headers):
+    learner_id = client.get("/auth/me", headers=auth_headers).json()["learner_id"]
+    planted = {"progress_id": f"{learner_id}-course-001", "learner_id": "attacker", "course_id": "course-001"}
+    client.post("/progress/", json=planted, headers=auth_headers)
+
+    data = client.post("/progress/course-001/topics/top-001/complete", headers=auth_headers).json()
+    assert data["learner_id"] == learner_id
+    assert data["progress_id"] != planted["progress_id"]
+    data = client.post("/progress/course-001/topics/top-002/complete", headers=auth_headers).json()
+    assert (data["learner_id"], data["status"]) == (learner_id, "COMPLETED")
+    attacker = client.get(f"/progress/{planted['progress_id']}", headers=auth_headers).json()
+    assert (attacker["learner_id"], attacker["status"]) == ("attacker", "IN_PROGRESS")
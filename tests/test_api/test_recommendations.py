@@ -17,4 +17,22 @@ def test_get_recommendation_by_id(client, auth_headers):
     
     response = client.get(f"/recommendations/{rec_id}", headers=auth_headers)
     assert response.status_code == 200
-    assert response.json()["recommendation_id"] == rec_id
\ No newline at end of file
+    assert response.json()["recommendation_id"] == rec_id
+
+def test_recommendations_for_me(client, auth_headers, monkeypatch):
+    from app.recommender import engine
+
+    monkeypatch.setattr(engine, "refresh_seconds", 0)
+    learner_id = client.get("/auth/me", headers=auth_headers).json()["learner_id"]
+    client.post("/courses/course-001/enroll", headers=auth_headers)
+    client.post("/enrollments/batch", json=[
+        {"learner_id": "peer", "course_id": "course-001"},
+        {"learner_id": "peer", "course_id": "course-002"},
+    ], headers=auth_headers)
+
+    response = client.get("/recommendations/for-me?k=2", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["learner_id"] == learner_id
+    assert data["course_ids"][0] == "course-002"
+    assert "course-001" not in data["course_ids"]
\ No newline at end of file
@@ -0,0 +1,89 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.catalog import CatalogCache
+from app.repository import store
+from app.selection import parse_selection
+
+
+@pytest.fixture
+def catalog():
+    return CatalogCache(store)
+
+
+@pytest.fixture
+def restore_catalog():
+    course = store.courses.get("course-001")
+    instructor = store.instructors.get("instr-001")
+    yield
+    store.courses.save(course)
+    store.instructors.save(instructor)
+
+
+def listing(catalog):
+    body = catalog.listing_json(100).body
+    return {c["course_id"]: c for c in json.loads(body)}
+
+
+def test_listing_is_served_from_cache(catalog):
+    first = catalog.listing_json(100).body
+    misses = catalog.misses
+
+    assert catalog.listing_json(100).body is first
+    assert catalog.misses == misses
+
+
+def test_course_change_rebuilds_only_that_summary(catalog, restore_catalog):
+    listing(catalog)
+    misses = catalog.misses
+
+    course = store.courses.get("course-001")
+    store.courses.save(course.model_copy(update={
+        "title": "Python Fundamentals II",
+        "updated_at": datetime.now(timezone.utc),
+    }))
+
+    assert listing(catalog)["course-001"]["title"] == "Python Fundamentals II"
+    assert catalog.misses == misses + 1
+
+
+def test_instructor_change_invalidates_summaries(catalog, restore_catalog):
+    listing(catalog)
+
+    instructor = store.instructors.get("instr-001")
+    store.instructors.save(instructor.model_copy(update={"name": "John Renamed"}))
+
+    assert listing(catalog)["course-001"]["instructor_name"] == "John Renamed"
+
+
+def test_detail_bytes_and_etag_follow_updated_at(catalog, restore_catalog):
+    course = store.courses.get("course-001")
+    body, tag = catalog.detail_json(course)
+    assert json.loads(body)["course_id"] == "course-001"
+    assert catalog.detail_json(course)[0] is body
+
+    changed = course.model_copy(update={
+        "title": "Python Fundamentals II",
+        "updated_at": datetime.now(timezone.utc),
+    })
+    new_body, new_tag = catalog.detail_json(changed)
+    assert json.loads(new_body)["title"] == "Python Fundamentals II"
+    assert new_tag != tag
+
+
+def test_selection_is_cached_per_selection_and_updated_at(catalog):
+    course = store.courses.get("course-001")
+    outline = parse_selection(None, "modules")
+    body, tag = catalog.selection_json(course, outline)
+    assert catalog.selection_json(course, parse_selection(None, "modules"))[0] is body
+    assert set(json.loads(body)["modules"][0]) == {
+        "module_id", "title", "description", "order", "estimated_duration_minutes", "created_at",
+    }
+
+    titles, _ = catalog.selection_json(course, parse_selection("title", None))
+    assert json.loads(titles) == {"course_id": "course-001", "title": "Python Fundamentals"}
+
+    changed = course.model_copy(update={"updated_at": datetime.now(timezone.utc)})
+    assert catalog.selection_json(changed, outline)[0] is not body
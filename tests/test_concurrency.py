@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+import httpx
+
+from app.domain.course import Course, CourseLesson, CourseModule, CourseTopic
+from app.domain.enrollment import Enrollment
+from app.main import app
+from app.repository import store
+from app.topic_progress import TopicProgressTracker
+
+
+def run_threads(count, target):
+    barrier = threading.Barrier(count)
+
+    def worker(i):
+        barrier.wait()
+        target(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_parallel_inserts_never_duplicate():
+    wins = []
+
+    def enroll(worker):
+        for n in range(500):
+            enrollment = Enrollment(
+                enrollment_id=f"l-{n}-course-001", learner_id=f"l-{n}", course_id="course-001"
+            )
+            if store.enrollments.insert_if_absent(enrollment):
+                wins.append(enrollment.enrollment_id)
+
+    run_threads(8, enroll)
+
+    assert len(wins) == len(set(wins)) == 500
+    assert len(store.enrollments.find_by("course_id", "course-001")) == 500
+
+
+def test_parallel_topic_completions_keep_every_bit():
+    course = Course(
+        course_id="wide", title="Wide", description="", instructor_id="i-1",
+        modules=[CourseModule(title="M", order=1, lessons=[
+            CourseLesson(title="L", order=1, topics=[
+                CourseTopic(topic_id=f"t-{i}", title="T", order=i) for i in range(64)
+            ]),
+        ])],
+    )
+    tracker = TopicProgressTracker(store)
+
+    run_threads(8, lambda worker: [
+        tracker.complete("l-1", course, f"t-{i}") for i in range(worker, 64, 8)
+    ])
+
+    records = store.progress.find_by("learner_id", "l-1")
+    assert len(records) == 1
+    assert records[0].completed_topics == b"\xff" * 8
+    assert records[0].status == "COMPLETED"
+
+
+def test_parallel_enroll_requests(client, auth_headers):
+    async def hammer():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*(
+                http.post("/courses/course-002/enroll", headers=auth_headers) for _ in range(40)
+            ))
+
+    responses = asyncio.run(hammer())
+
+    assert sorted(r.status_code for r in responses) == [200] + [400] * 39
+    assert len(store.enrollments.find_by("course_id", "course-002")) == 1
@@ -0,0 +1,91 @@
+import asyncio
+
+from app.events import EventBus, LearnerRegistered
+from app.metrics import metrics
+
+
+def registered(n):
+    return [LearnerRegistered(f"l-{i}") for i in range(n)]
+
+
+def test_events_are_batched_and_drained_on_stop():
+    bus = EventBus(batch_size=3, batch_seconds=5)
+    batches = []
+
+    async def handler(batch):
+        batches.append([event.learner_id for event in batch])
+
+    bus.subscribe("collector", handler, LearnerRegistered)
+
+    async def scenario():
+        await bus.start()
+        await bus.publish(*registered(7))
+        await bus.stop()
+
+    asyncio.run(scenario())
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert sum(batches, []) == [f"l-{i}" for i in range(7)]
+
+
+def test_full_queue_makes_publisher_wait():
+    metrics.reset()
+    bus = EventBus(queue_size=2, batch_size=1, batch_seconds=0)
+    release = asyncio.Event()
+    handled = []
+
+    async def handler(batch):
+        await release.wait()
+        handled.extend(batch)
+
+    bus.subscribe("slow", handler, LearnerRegistered)
+
+    async def scenario():
+        await bus.start()
+        publisher = asyncio.create_task(bus.publish(*registered(5)))
+        await asyncio.sleep(0.05)
+        # One event is being handled, two are queued, the publisher waits.
+        assert not publisher.done()
+        release.set()
+        await publisher
+        await bus.stop()
+
+    asyncio.run(scenario())
+    assert len(handled) == 5
+    assert metrics.event_backpressure[("slow",)] >= 1
+
+
+def test_failing_consumer_keeps_running_and_others_are_unaffected():
+    metrics.reset()
+    bus = EventBus(batch_size=1, batch_seconds=0)
+    handled = []
+
+    async def failing(batch):
+        raise RuntimeError("boom")
+
+    async def handler(batch):
+        handled.extend(batch)
+
+    bus.subscribe("failing", failing, LearnerRegistered)
+    bus.subscribe("ok", handler, LearnerRegistered)
+
+    async def scenario():
+        await bus.start()
+        await bus.publish(*registered(2))
+        await bus.stop()
+
+    asyncio.run(scenario())
+    assert len(handled) == 2
+    assert metrics.events_handled[("failing", "error")] == 2
+    assert metrics.events_handled[("ok", "ok")] == 2
+
+
+def test_events_are_delivered_inline_while_stopped():
+    bus = EventBus()
+    handled = []
+
+    async def handler(batch):
+        handled.extend(batch)
+
+    bus.subscribe("collector", handler, LearnerRegistered)
+    asyncio.run(bus.publish(*registered(1)))
+    assert handled == registered(1)
@@ -0,0 +1,146 @@
+import errno
+import os
+
+import pytest
+
+from app.domain.enrollment import Enrollment, EnrollmentStatus
+from app.domain.user import Learner
+from app.repository.compact import EnrollmentRecord
+from app.repository.journal import Journal, JournalError
+from app.repository.memory import MemoryRepository, snapshot_source
+
+
+def open_repositories(directory, **options):
+    collections = {
+        "learners": ({}, Learner, "learner_id", None),
+        "enrollments": ({}, Enrollment, "enrollment_id", EnrollmentRecord),
+    }
+    journal = Journal(str(directory), **options)
+    recovered = Journal.recover(str(directory), collections)
+    repositories = {
+        name: MemoryRepository(data, model, key_field, journal=journal, name=name, record=record)
+        for name, (data, model, key_field, record) in collections.items()
+    }
+    journal.start_snapshots(lambda: snapshot_source(journal, repositories))
+    return journal, repositories, recovered
+
+
+def test_writes_survive_restart(tmp_path):
+    journal, repos, recovered = open_repositories(tmp_path)
+    assert recovered == (False, 0)
+    learner = Learner(name="Durable", email="durable@example.com", password_hash="x")
+    repos["learners"].save(learner)
+    repos["enrollments"].save_many([
+        Enrollment(enrollment_id=f"e-{i}", learner_id=learner.learner_id, course_id="course-001")
+        for i in range(3)
+    ])
+    repos["enrollments"].delete("e-1")
+    current = repos["enrollments"].get("e-2")
+    repos["enrollments"].compare_and_set(
+        current, current.model_copy(update={"status": EnrollmentStatus.COMPLETED})
+    )
+    journal.close()
+
+    journal, repos, recovered = open_repositories(tmp_path)
+    assert recovered == (False, 6)
+    assert repos["learners"].get(learner.learner_id) == learner
+    assert {e.enrollment_id: e.status for e in repos["enrollments"].list()} == {
+        "e-0": EnrollmentStatus.ACTIVE, "e-2": EnrollmentStatus.COMPLETED,
+    }
+    assert repos["enrollments"].find_by("status", EnrollmentStatus.COMPLETED)[0].enrollment_id == "e-2"
+    journal.close()
+
+
+def test_snapshot_compacts_and_tail_replays(tmp_path):
+    journal, repos, _ = open_repositories(tmp_path)
+    for i in range(5):
+        repos["enrollments"].save(Enrollment(enrollment_id=f"e-{i}", learner_id="l-1", course_id="c"))
+    assert journal.snapshot() == 1
+    repos["enrollments"].save(Enrollment(enrollment_id="e-5", learner_id="l-1", course_id="c"))
+    repos["enrollments"].clear()
+    repos["enrollments"].save(Enrollment(enrollment_id="e-6", learner_id="l-1", course_id="c"))
+    journal.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["LOCK", "journal-00000001.log", "snapshot-00000001.bin"]
+    journal, repos, recovered = open_repositories(tmp_path)
+    assert recovered == (True, 3)
+    assert [e.enrollment_id for e in repos["enrollments"].list()] == ["e-6"]
+    journal.close()
+
+
+def test_torn_last_line_is_cut_off_before_new_writes(tmp_path):
+    journal, repos, _ = open_repositories(tmp_path)
+    repos["enrollments"].save(Enrollment(enrollment_id="e-0", learner_id="l-1", course_id="c"))
+    journal.close()
+    with open(tmp_path / "journal-00000000.log", "ab") as f:
+        f.write(b'enrollments P {"enrollment_id":"e-1","lear')
+
+    journal, repos, recovered = open_repositories(tmp_path)
+    assert recovered == (False, 1)
+    assert [e.enrollment_id for e in repos["enrollments"].list()] == ["e-0"]
+    repos["enrollments"].save(Enrollment(enrollment_id="e-2", learner_id="l-1", course_id="c"))
+    journal.close()
+
+    journal, repos, recovered = open_repositories(tmp_path)
+    assert recovered == (False, 2)
+    assert [e.enrollment_id for e in repos["enrollments"].list()] == ["e-0", "e-2"]
+    journal.close()
+
+
+def test_snapshot_after_record_threshold(tmp_path):
+    journal, repos, _ = open_repositories(tmp_path, snapshot_seconds=0.05, snapshot_records=3)
+    for i in range(3):
+        repos["enrollments"].save(Enrollment(enrollment_id=f"e-{i}", learner_id="l-1", course_id="c"))
+    journal._stop.wait(0.5)
+    journal.close()
+
+    assert "snapshot-00000001.bin" in os.listdir(tmp_path)
+
+
+def test_snapshot_restores_compact_records_and_models(tmp_path):
+    journal, repos, _ = open_repositories(tmp_path)
+    learner = Learner(name="Snap", email="snap@example.com", password_hash="x")
+    repos["learners"].save(learner)
+    enrollment = Enrollment(
+        enrollment_id="e-0", learner_id=learner.learner_id, course_id="c",
+        status=EnrollmentStatus.COMPLETED,
+    )
+    repos["enrollments"].save(enrollment)
+    journal.snapshot()
+    journal.close()
+
+    journal, repos, recovered = open_repositories(tmp_path)
+    assert recovered == (True, 0)
+    assert repos["learners"].get(learner.learner_id) == learner
+    assert isinstance(repos["enrollments"]._data["e-0"], EnrollmentRecord)
+    restored = repos["enrollments"].get("e-0")
+    assert restored == enrollment
+    assert restored.status is EnrollmentStatus.COMPLETED
+    journal.close()
+
+
+def test_failed_fsync_fails_writers_instead_of_hanging(tmp_path, monkeypatch):
+    journal, repos, _ = open_repositories(tmp_path)
+
+    def disk_full(fd):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(os, "fsync", disk_full)
+    with pytest.raises(JournalError):
+        repos["enrollments"].save(Enrollment(enrollment_id="e-0", learner_id="l-1", course_id="c"))
+    assert not journal._flusher.is_alive()
+    with pytest.raises(JournalError):
+        repos["enrollments"].save(Enrollment(enrollment_id="e-1", learner_id="l-1", course_id="c"))
+    with pytest.raises(JournalError):
+        journal.snapshot()
+    journal.close()
+
+
+def test_directory_is_locked_while_a_journal_is_open(tmp_path):
+    journal, _, _ = open_repositories(tmp_path)
+    with pytest.raises(JournalError, match="in use"):
+        Journal(str(tmp_path))
+    journal.close()
+
+    journal, _, _ = open_repositories(tmp_path)
+    journal.close()
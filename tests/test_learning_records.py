@@ -0,0 +1,72 @@
+from app.domain.enrollment import Enrollment, EnrollmentStatus
+from app.domain.learning_progress import LearningProgress, ProgressStatus
+from app.learning_records import LearningRecordProjection
+from app.repository import store
+
+
+def enrollment(course_id, status=EnrollmentStatus.ACTIVE, learner_id="l-1"):
+    return Enrollment(
+        enrollment_id=f"{learner_id}-{course_id}", learner_id=learner_id,
+        course_id=course_id, status=status,
+    )
+
+
+def progress(course_id, status=ProgressStatus.IN_PROGRESS, learner_id="l-1"):
+    return LearningProgress(
+        progress_id=f"{learner_id}-{course_id}", learner_id=learner_id,
+        course_id=course_id, status=status,
+    )
+
+
+def test_writes_update_the_learners_record():
+    projection = LearningRecordProjection(store)
+    projection.insert_if_absent(enrollment("course-001"))
+    projection.save_many([enrollment("course-002"), enrollment("course-003", learner_id="l-2")])
+    projection.insert_if_absent(progress("course-001", ProgressStatus.COMPLETED))
+
+    record = projection.get("l-1")
+    assert record.record_id == "record-l-1"
+    assert record.enrollment_ids == ["l-1-course-001", "l-1-course-002"]
+    assert record.ongoing_course_ids == ["course-002"]
+    assert record.completed_course_ids == ["course-001"]
+    assert projection.get("l-2").ongoing_course_ids == ["course-003"]
+    assert projection.get("l-3").enrollment_ids == []
+
+
+def test_cancellation_drops_enrollment_and_ongoing_course():
+    projection = LearningRecordProjection(store)
+    active = enrollment("course-001")
+    projection.insert_if_absent(active)
+    cancelled = active.model_copy(update={"status": EnrollmentStatus.CANCELLED})
+    assert projection.compare_and_set(active, cancelled)
+    assert not projection.compare_and_set(active, cancelled)
+
+    record = projection.get("l-1")
+    assert (record.enrollment_ids, record.ongoing_course_ids) == ([], [])
+
+
+def test_rebuild_matches_incremental_records():
+    projection = LearningRecordProjection(store)
+    projection.save_many([enrollment("course-001"), enrollment("course-002", learner_id="l-2")])
+    projection.insert_if_absent(progress("course-003", ProgressStatus.COMPLETED))
+    expected = [projection.get("l-1"), projection.get("l-2")]
+
+    store.records.clear()
+    store.records.save(projection.get("l-9").model_copy(update={"ongoing_course_ids": ["x"]}))
+    assert projection.rebuild() == 2
+    assert [projection.get("l-1"), projection.get("l-2")] == expected
+    assert "record-l-9" not in store.records
+
+
+def test_rebuild_agrees_with_progress_after_cancellation():
+    projection = LearningRecordProjection(store)
+    active = enrollment("course-001")
+    projection.insert_if_absent(active)
+    projection.compare_and_set(active, active.model_copy(update={"status": EnrollmentStatus.CANCELLED}))
+    projection.insert_if_absent(progress("course-001"))
+    projection.insert_if_absent(progress("course-002"))
+    incremental = projection.get("l-1")
+
+    projection.rebuild()
+    assert projection.get("l-1") == incremental
+    assert incremental.ongoing_course_ids == ["course-002"]
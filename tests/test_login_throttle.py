@@ -0,0 +1,38 @@
+from app import login_throttle as module
+from app.login_throttle import LoginThrottle, TokenBuckets
+
+
+def test_bucket_refills_at_rate_up_to_burst():
+    buckets = TokenBuckets(rate_per_minute=60, burst=2, maxsize=10)
+    buckets.take("k", 0.0)
+    buckets.take("k", 0.0)
+    assert buckets.wait("k", 0.0) == 1.0
+    assert buckets.wait("k", 0.5) == 0.5
+    assert buckets.wait("k", 1.0) == 0.0
+    assert buckets.tokens("k", 100.0) == 2
+
+
+def test_least_recently_seen_key_is_evicted():
+    buckets = TokenBuckets(rate_per_minute=1, burst=1, maxsize=2)
+    for key in ("a", "b", "c"):
+        buckets.take(key, 0.0)
+    assert len(buckets) == 2
+    assert buckets.wait("a", 0.0) == 0.0
+    assert buckets.wait("c", 0.0) > 0
+
+
+def test_refused_attempt_charges_neither_bucket(monkeypatch):
+    monkeypatch.setattr(module.time, "monotonic", lambda: 0.0)
+    throttle = LoginThrottle(email_rate=60, email_burst=1, ip_rate=60, ip_burst=2)
+
+    assert throttle.attempt("a@example.com", "10.0.0.1") == 0
+    assert throttle.attempt("A@example.com", "10.0.0.1") == 1
+    # The IP kept its second token because the email refusal charged nothing.
+    assert throttle.attempt("b@example.com", "10.0.0.1") == 0
+    assert throttle.attempt("c@example.com", "10.0.0.1") == 1
+    assert throttle.attempt("c@example.com", "10.0.0.2") == 0
+
+
+def test_zero_rate_disables_a_limit():
+    throttle = LoginThrottle(email_rate=0, email_burst=1, ip_rate=0, ip_burst=1)
+    assert all(throttle.attempt("a@example.com", "10.0.0.1") == 0 for _ in range(10))
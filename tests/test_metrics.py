@@ -0,0 +1,32 @@
+from app.metrics import Exposition, Histogram, Metrics
+
+
+def test_histogram_buckets_are_cumulative_in_exposition():
+    metrics = Metrics()
+    metrics.request_started()
+    metrics.request_finished("GET", "/x", 200, 0.003)
+    metrics.request_started()
+    metrics.request_finished("GET", "/x", 200, 0.2)
+
+    out = Exposition()
+    metrics.expose(out)
+    lines = out.render().splitlines()
+
+    assert 'lernex_http_request_duration_seconds_bucket{method="GET",route="/x",le="0.0025"} 0' in lines
+    assert 'lernex_http_request_duration_seconds_bucket{method="GET",route="/x",le="0.005"} 1' in lines
+    assert 'lernex_http_request_duration_seconds_bucket{method="GET",route="/x",le="+Inf"} 2' in lines
+    assert 'lernex_http_requests_total{method="GET",route="/x",status="200"} 2' in lines
+    assert "lernex_http_requests_in_flight 0" in lines
+
+
+def test_histogram_bucket_bounds_are_inclusive():
+    histogram = Histogram((0.1, 1.0))
+    histogram.observe(0.1)
+    histogram.observe(5)
+    assert histogram.counts == [1, 0, 1]
+
+
+def test_label_values_are_escaped():
+    out = Exposition()
+    out.sample("m", 1, ("route",), ('a"b\\c',))
+    assert out.render() == 'm{route="a\\"b\\\\c"} 1\n'
@@ -0,0 +1,80 @@
+from app.domain.feedback import Feedback, Rating
+from app.ratings import RatingsIndex
+from app.repository import store
+from app.repository.sqlite import create_sqlite_store
+
+
+def feedback(feedback_id, value, course_id="course-001", category="general"):
+    return Feedback(
+        feedback_id=feedback_id,
+        learner_id="l-1",
+        course_id=course_id,
+        comment="",
+        rating=Rating(value=value, comment_category=category),
+    )
+
+
+def test_writes_are_applied_as_deltas():
+    ratings = RatingsIndex(store)
+    ratings.sync()
+    ratings.save(feedback("f-1", 5, category="content"))
+    ratings.save_many([feedback("f-2", 3), feedback("f-3", 1, course_id="course-002")])
+
+    aggregate = ratings.get("course-001")
+    assert (aggregate.count, aggregate.total) == (2, 8)
+    assert aggregate.histogram == [0, 0, 1, 0, 1]
+    assert set(aggregate.categories) == {"content", "general"}
+    assert ratings.get("course-002").average == 1.0
+    assert ratings.get("course-003").count == 0
+
+
+def test_overwrite_replaces_previous_rating():
+    ratings = RatingsIndex(store)
+    ratings.sync()
+    ratings.save(feedback("f-1", 5, category="content"))
+    ratings.save(feedback("f-1", 2))
+
+    aggregate = ratings.get("course-001")
+    assert (aggregate.count, aggregate.average) == (1, 2.0)
+    assert set(aggregate.categories) == {"general"}
+
+
+def test_outside_writes_trigger_rebuild():
+    ratings = RatingsIndex(store)
+    ratings.save(feedback("f-1", 4))
+    store.feedback.save(feedback("f-2", 2))
+    assert ratings.get("course-001").count == 2
+
+    version = ratings.version
+    store.feedback.clear()
+    assert ratings.get("course-001").count == 0
+    assert ratings.version > version
+
+
+def test_insert_many_applies_only_inserted_feedback():
+    ratings = RatingsIndex(store)
+    ratings.sync()
+    ratings.save(feedback("f-1", 5))
+
+    assert ratings.insert_many_if_absent([feedback("f-1", 1), feedback("f-2", 3)], atomic=True) == [0]
+    assert ratings.get("course-001").count == 1
+    assert ratings.insert_many_if_absent([feedback("f-1", 1), feedback("f-2", 3)]) == [0]
+    aggregate = ratings.get("course-001")
+    assert (aggregate.count, aggregate.total) == (2, 8)
+
+
+def test_foreign_write_between_check_and_write_forces_rebuild(tmp_path):
+    path = str(tmp_path / "lernex.db")
+    worker_a, worker_b = create_sqlite_store(path), create_sqlite_store(path)
+    ratings = RatingsIndex(worker_a)
+    ratings.sync()
+    insert = worker_a.feedback.insert_if_absent
+
+    def racing_insert(item):
+        worker_b.feedback.save(feedback("f-other", 1))
+        return insert(item)
+
+    worker_a.feedback.insert_if_absent = racing_insert
+    ratings.insert_if_absent(feedback("f-1", 5))
+
+    assert ratings.get("course-001").count == 2
@@ -0,0 +1,79 @@
+from app.domain.course import Course
+from app.domain.user import Learner, PreferenceProfile, Profile
+from app.recommender import RecommendationEngine
+from app.repository import store
+
+CATALOG = [
+    Course(course_id=f"c-{i}", title=title, description=description, instructor_id="i-1")
+    for i, (title, description) in enumerate([
+        ("Python", "Programming basics"),
+        ("FastAPI", "Web APIs in Python"),
+        ("Statistics", "Data analysis"),
+        ("Machine Learning", "Models for data"),
+    ])
+]
+
+
+def learner(learner_id, **preferences):
+    profile = Profile(preferences=PreferenceProfile(**preferences)) if preferences else None
+    return Learner(learner_id=learner_id, name=learner_id, email=f"{learner_id}@example.com",
+                   password_hash="x", profile=profile)
+
+
+def fitted_engine():
+    engine = RecommendationEngine(store, neighbors=10)
+    interactions = [
+        ("a", "c-0"), ("a", "c-1"),
+        ("b", "c-0"), ("b", "c-1"),
+        ("c", "c-2"), ("c", "c-3"),
+        ("d", "c-0"),
+    ]
+    engine.fit(
+        [l for l, _ in interactions],
+        [c for _, c in interactions],
+        [1.0] * len(interactions),
+        CATALOG,
+    )
+    return engine
+
+
+def test_recommends_co_enrolled_courses_first():
+    engine = fitted_engine()
+
+    recommended = engine.recommend(learner("d"), k=3)
+
+    assert recommended[0] == "c-1"
+    assert "c-0" not in recommended
+
+
+def test_cold_start_uses_profile_interests():
+    engine = fitted_engine()
+
+    recommended = engine.recommend(learner("new", interests=["data"]), k=2)
+
+    assert set(recommended) == {"c-2", "c-3"}
+
+
+def test_never_recommends_courses_outside_catalog():
+    engine = RecommendationEngine(store)
+    engine.fit(["a", "b", "b"], ["c-0", "c-0", "ghost"], [1.0, 1.0, 1.0], CATALOG)
+
+    assert "ghost" not in engine.recommend(learner("a"), k=10)
+
+
+def test_popularity_does_not_outrank_similar_courses():
+    engine = RecommendationEngine(store, neighbors=10)
+    catalog = CATALOG + [Course(course_id="popular", title="Popular", description="", instructor_id="i-1")]
+    interactions = [("a", "c-0"), ("a", "c-1"), ("b", "c-0"), ("b", "c-1"), ("me", "c-0")]
+    interactions += [(f"p-{i}", "popular") for i in range(50)]
+    engine.fit(
+        [l for l, _ in interactions],
+        [c for _, c in interactions],
+        [1.0] * len(interactions),
+        catalog,
+    )
+
+    recommended = engine.recommend(learner("me"), k=3)
+
+    assert recommended[0] == "c-1"
+    assert recommended[1] == "popular"
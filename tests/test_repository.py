@@ -0,0 +1,318 @@
+import asyncio
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domain.enrollment import Enrollment, EnrollmentStatus
+from app.domain.feedback import Feedback, Rating
+from app.domain.learning_progress import LearningProgress
+from app.domain.user import Learner
+from app.repository import create_store, store
+from app.repository.base import DuplicateKeyError
+from app.repository.compact import EnrollmentRecord, FeedbackRecord, ProgressRecord
+from app.repository.memory import MemoryRepository
+from app.repository.sqlite import create_sqlite_store
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repo_store(request, tmp_path):
+    if request.param == "sqlite":
+        return create_sqlite_store(str(tmp_path / "lernex.db"))
+    return store
+
+
+def test_save_and_get(repo_store):
+    learner = Learner(name="Repo User", email="repo@example.com", password_hash="x")
+    repo_store.learners.save(learner)
+
+    loaded = repo_store.learners.get(learner.learner_id)
+    assert loaded == learner
+    assert learner.learner_id in repo_store.learners
+    assert repo_store.learners.get("missing") is None
+
+
+def test_email_index_is_case_insensitive_and_unique(repo_store):
+    learner = Learner(name="Repo User", email="Repo@Example.com", password_hash="x")
+    repo_store.learners.save(learner)
+
+    assert repo_store.learners.get_by("email", "repo@example.com") == learner
+    with pytest.raises(DuplicateKeyError):
+        repo_store.learners.save(
+            Learner(name="Other", email="repo@example.COM", password_hash="y")
+        )
+
+    # Re-saving the same learner under a new email moves its index entry.
+    repo_store.learners.save(learner.model_copy(update={"email": "moved@example.com"}))
+    assert repo_store.learners.get_by("email", "repo@example.com") is None
+    assert repo_store.learners.get_by("email", "moved@example.com").learner_id == learner.learner_id
+
+
+def test_find_by_indexed_field(repo_store):
+    repo_store.enrollments.save(Enrollment(learner_id="l-1", course_id="course-001"))
+    repo_store.enrollments.save(Enrollment(learner_id="l-1", course_id="course-002"))
+    repo_store.enrollments.save(
+        Enrollment(learner_id="l-2", course_id="course-001", status=EnrollmentStatus.CANCELLED)
+    )
+
+    assert len(repo_store.enrollments.find_by("learner_id", "l-1")) == 2
+    assert len(repo_store.enrollments.find_by("status", EnrollmentStatus.CANCELLED)) == 1
+
+
+def test_index_follows_updates(repo_store):
+    enrollment = Enrollment(learner_id="l-1", course_id="course-001")
+    repo_store.enrollments.save(enrollment)
+    repo_store.enrollments.save(
+        enrollment.model_copy(update={"status": EnrollmentStatus.COMPLETED})
+    )
+
+    assert repo_store.enrollments.find_by("status", EnrollmentStatus.ACTIVE) == []
+    assert len(repo_store.enrollments.find_by("status", EnrollmentStatus.COMPLETED)) == 1
+    assert len(repo_store.enrollments.find_by("course_id", "course-001")) == 1
+
+
+def test_delete(repo_store):
+    enrollment = Enrollment(learner_id="l-1", course_id="course-001")
+    repo_store.enrollments.save(enrollment)
+
+    assert repo_store.enrollments.delete(enrollment.enrollment_id)
+    assert not repo_store.enrollments.delete(enrollment.enrollment_id)
+    assert repo_store.enrollments.count() == 0
+
+
+def test_insert_if_absent(repo_store):
+    enrollment = Enrollment(enrollment_id="e-1", learner_id="l-1", course_id="course-001")
+    assert repo_store.enrollments.insert_if_absent(enrollment) is True
+    assert repo_store.enrollments.insert_if_absent(
+        enrollment.model_copy(update={"course_id": "course-002"})
+    ) is False
+    assert repo_store.enrollments.get("e-1").course_id == "course-001"
+
+    repo_store.learners.save(Learner(name="A", email="a@example.com", password_hash="x"))
+    with pytest.raises(DuplicateKeyError):
+        repo_store.learners.insert_if_absent(
+            Learner(name="B", email="A@example.com", password_hash="y")
+        )
+
+
+def test_insert_many_if_absent_never_overwrites(repo_store):
+    repo = repo_store.enrollments
+    repo.insert_if_absent(Enrollment(enrollment_id="e-2", learner_id="l-1", course_id="course-001"))
+    batch = [
+        Enrollment(enrollment_id=f"e-{i}", learner_id="l-2", course_id="course-002")
+        for i in range(1, 4)
+    ]
+
+    assert repo.insert_many_if_absent(batch, atomic=True) == [1]
+    assert repo.count() == 1
+    assert repo.insert_many_if_absent(batch) == [1]
+    assert sorted(e.enrollment_id for e in repo.list()) == ["e-1", "e-2", "e-3"]
+    assert repo.get("e-2").learner_id == "l-1"
+
+
+def test_compare_and_set(repo_store):
+    enrollment = Enrollment(enrollment_id="e-1", learner_id="l-1", course_id="course-001")
+    assert repo_store.enrollments.compare_and_set(None, enrollment) is True
+    assert repo_store.enrollments.compare_and_set(None, enrollment) is False
+
+    current = repo_store.enrollments.get("e-1")
+    completed = current.model_copy(update={"status": EnrollmentStatus.COMPLETED})
+    assert repo_store.enrollments.compare_and_set(current, completed) is True
+    # current is now stale, so a second writer basing on it must lose.
+    cancelled = current.model_copy(update={"status": EnrollmentStatus.CANCELLED})
+    assert repo_store.enrollments.compare_and_set(current, cancelled) is False
+    assert repo_store.enrollments.get("e-1").status == EnrollmentStatus.COMPLETED
+    assert [e.enrollment_id for e in repo_store.enrollments.find_by("status", "COMPLETED")] == ["e-1"]
+
+
+def test_async_interface(repo_store):
+    enrollment = Enrollment(enrollment_id="e-a", learner_id="l-1", course_id="course-001")
+
+    async def scenario():
+        repo = repo_store.enrollments
+        assert await repo.ainsert_if_absent(enrollment) is True
+        assert await repo.ainsert_if_absent(enrollment) is False
+        current = await repo.aget("e-a")
+        completed = current.model_copy(update={"status": EnrollmentStatus.COMPLETED})
+        assert await repo.acompare_and_set(current, completed) is True
+        assert await repo.apage(10, learner_id="l-1") == ([completed], None)
+        assert await repo.afind_by("status", EnrollmentStatus.COMPLETED) == [completed]
+        assert await repo.acount() == 1
+        assert await repo.adelete("e-a") is True
+        assert await repo.acontains("e-a") is False
+        assert await repo_store.learners.aget_by("email", "nobody@example.com") is None
+
+    asyncio.run(scenario())
+
+
+def test_sqlite_seeds_catalog_and_persists(tmp_path):
+    path = str(tmp_path / "lernex.db")
+    first = create_sqlite_store(path)
+    assert first.courses.get("course-001").title == "Python Fundamentals"
+
+    learner = Learner(name="Durable", email="durable@example.com", password_hash="x")
+    first.learners.save(learner)
+
+    reopened = create_sqlite_store(path)
+    assert reopened.learners.get(learner.learner_id).email == "durable@example.com"
+    assert reopened.courses.count() == 3
+
+
+def test_sqlite_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "lernex.db")
+    shared = create_sqlite_store(path)
+    version = shared.enrollments.version
+
+    writer = (
+        "import sys\n"
+        "from app.domain.enrollment import Enrollment\n"
+        "from app.repository.sqlite import create_sqlite_store\n"
+        "repo = create_sqlite_store(sys.argv[1]).enrollments\n"
+        "print(repo.insert_if_absent(Enrollment(enrollment_id='e-x', learner_id='l-1', course_id='course-001')))\n"
+    )
+    runs = [
+        subprocess.run([sys.executable, "-c", writer, path], capture_output=True, text=True, check=True)
+        for _ in range(2)
+    ]
+
+    assert [run.stdout.strip() for run in runs] == ["True", "False"]
+    assert shared.enrollments.get("e-x").learner_id == "l-1"
+    assert shared.enrollments.version == version + 1
+
+
+def test_memory_backend_refuses_multiple_workers():
+    with pytest.raises(RuntimeError):
+        create_store("memory", workers=4)
+
+
+def test_page_is_stable_and_filtered(repo_store):
+    for i in range(5):
+        repo_store.enrollments.save(
+            Enrollment(enrollment_id=f"e-{i}", learner_id=f"l-{i % 2}", course_id="course-001")
+        )
+
+    first, after = repo_store.enrollments.page(2)
+    assert [e.enrollment_id for e in first] == ["e-0", "e-1"]
+
+    # Updating a row that was already served must not shift later pages.
+    repo_store.enrollments.save(first[0].model_copy(update={"status": EnrollmentStatus.COMPLETED}))
+    second, after = repo_store.enrollments.page(2, after)
+    assert [e.enrollment_id for e in second] == ["e-2", "e-3"]
+    third, after = repo_store.enrollments.page(2, after)
+    assert [e.enrollment_id for e in third] == ["e-4"]
+    assert after is None
+
+    mine, after = repo_store.enrollments.page(10, learner_id="l-0", status=EnrollmentStatus.ACTIVE)
+    assert [e.enrollment_id for e in mine] == ["e-2", "e-4"]
+    assert after is None
+
+    either = (EnrollmentStatus.ACTIVE, EnrollmentStatus.COMPLETED)
+    mine, after = repo_store.enrollments.page(1, learner_id="l-0", status=either)
+    assert [e.enrollment_id for e in mine] == ["e-0"]
+    mine, after = repo_store.enrollments.page(10, after, learner_id="l-0", status=either)
+    assert [e.enrollment_id for e in mine] == ["e-2", "e-4"]
+
+def test_timestamps_round_trip_the_same_on_every_backend(repo_store):
+    naive = datetime(2024, 1, 1)
+    shifted = datetime(2024, 1, 1, 7, tzinfo=timezone(timedelta(hours=7)))
+    for i, when in enumerate([naive, shifted]):
+        enrollment = Enrollment(
+            enrollment_id=f"e-{i}", learner_id="l-1", course_id="course-001", enrollment_date=when
+        )
+        assert enrollment.enrollment_date == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert enrollment.enrollment_date.utcoffset() == timedelta(0)
+        repo_store.enrollments.save(enrollment)
+        assert repo_store.enrollments.get(f"e-{i}").model_dump_json() == enrollment.model_dump_json()
+
+def test_compact_records_round_trip():
+    when = datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone(timedelta(hours=7)))
+    for item, key_field, record in [
+        (Enrollment(learner_id="l-1", course_id="course-001", enrollment_date=when),
+         "enrollment_id", EnrollmentRecord),
+        (LearningProgress(learner_id="l-1", course_id="course-001", completion_rate=0.25,
+                          last_accessed=when, completed_topics=b"\x05"),
+         "progress_id", ProgressRecord),
+        (Feedback(learner_id="l-1", course_id="course-001", comment="ok",
+                  rating=Rating(value=4, comment_category="pace")),
+         "feedback_id", FeedbackRecord),
+    ]:
+        repo = MemoryRepository({}, type(item), key_field, ("learner_id",), record=record)
+        repo.save(item)
+        key = getattr(item, key_field)
+
+        assert isinstance(repo._data[key], record)
+        assert repo.get(key) == item
+        assert repo.find_by("learner_id", "l-1") == [item]
+        assert repo.page(10, learner_id="l-1") == ([item], None)
+        assert repo.compare_and_set(repo.get(key), item) is True
+
+
+class CountingLock:
+    def __init__(self, lock):
+        self.lock = lock
+        self.acquired = 0
+
+    def __enter__(self):
+        self.acquired += 1
+        return self.lock.__enter__()
+
+    def __exit__(self, *exc):
+        return self.lock.__exit__(*exc)
+
+
+def test_memory_batches_release_the_lock_between_chunks():
+    repo = MemoryRepository({}, Enrollment, "enrollment_id", ("learner_id",), record=EnrollmentRecord)
+    repo.chunk_size = 2
+    repo._lock = CountingLock(repo._lock)
+    repo.save_many([
+        Enrollment(enrollment_id=f"e-{i}", learner_id="l-1", course_id="c") for i in range(5)
+    ])
+
+    assert repo._lock.acquired == 3
+    assert repo.version == 5
+    assert len(repo.find_by("learner_id", "l-1")) == 5
+
+
+def test_memory_atomic_insert_many_writes_nothing_when_a_key_is_taken():
+    repo = MemoryRepository({}, Enrollment, "enrollment_id", ("learner_id",), record=EnrollmentRecord)
+    repo.chunk_size = 2
+    repo.save(Enrollment(enrollment_id="e-3", learner_id="l-0", course_id="c"))
+    batch = [
+        Enrollment(enrollment_id=f"e-{i}", learner_id="l-1", course_id="c") for i in range(6)
+    ]
+
+    assert repo.insert_many_if_absent(batch, atomic=True) == [3]
+    assert [e.enrollment_id for e in repo.list()] == ["e-3"]
+    assert repo.find_by("learner_id", "l-1") == []
+    assert repo.version == 1
+    assert repo._reserved == set()
+
+
+def test_memory_atomic_insert_many_reserves_keys_between_chunks():
+    repo = MemoryRepository({}, Enrollment, "enrollment_id", ("learner_id",), record=EnrollmentRecord)
+    repo.chunk_size = 2
+    batch = [
+        Enrollment(enrollment_id=f"e-{i}", learner_id="l-1", course_id="c") for i in range(4)
+    ]
+    chunks = repo._chunks
+    raced = []
+
+    def racing_chunks(count):
+        for chunk in chunks(count):
+            yield chunk
+            if not raced:
+                # Between chunks, a racing insert of a reserved key loses and
+                # a plain save of one is kept, as if it came after the batch.
+                raced.append(repo.insert_if_absent(
+                    Enrollment(enrollment_id="e-2", learner_id="l-2", course_id="c")
+                ))
+                repo.save(Enrollment(enrollment_id="e-3", learner_id="l-3", course_id="c"))
+
+    repo._chunks = racing_chunks
+    assert repo.insert_many_if_absent(batch, atomic=True) == []
+    assert raced == [False]
+    assert sorted(e.enrollment_id for e in repo.list()) == ["e-0", "e-1", "e-2", "e-3"]
+    assert repo.get("e-2").learner_id == "l-1"
+    assert repo.get("e-3").learner_id == "l-3"
+    assert repo._reserved == set()
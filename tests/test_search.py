@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+from app.domain.course import Course, CourseLesson, CourseModule, CourseTopic
+from app.repository import store
+from app.search import CourseSearchIndex
+
+
+def make_course(course_id, title, topic_title="Intro", description="A course"):
+    return Course(
+        course_id=course_id,
+        title=title,
+        description=description,
+        instructor_id="i-1",
+        modules=[CourseModule(title="Module", order=1, lessons=[
+            CourseLesson(title="Lesson", order=1, topics=[
+                CourseTopic(title=topic_title, order=1),
+            ]),
+        ])],
+    )
+
+
+def test_title_match_outranks_topic_match():
+    index = CourseSearchIndex()
+    index.add(make_course("a", "Cooking", topic_title="Python snakes"))
+    index.add(make_course("b", "Python Programming"))
+    index.add(make_course("c", "Gardening"))
+
+    hits = [course_id for course_id, _ in index.search("python")]
+    assert hits == ["b", "a"]
+
+
+def test_prefix_matching():
+    index = CourseSearchIndex()
+    index.add(make_course("a", "Statistics"))
+
+    assert [c for c, _ in index.search("stat")] == ["a"]
+
+
+def test_reindex_replaces_old_terms():
+    index = CourseSearchIndex()
+    course = make_course("a", "Statistics")
+    index.add(course)
+    index.add(course.model_copy(update={"title": "Probability"}))
+
+    assert index.search("statistics") == []
+    assert [c for c, _ in index.search("probability")] == ["a"]
+
+
+def test_limit_and_removal_on_a_large_index():
+    index = CourseSearchIndex()
+    for i in range(1500):
+        index.add(make_course(f"c-{i}", f"Python {i}"))
+    index.remove("c-7")
+
+    hits = index.search("python", limit=10)
+    assert len(hits) == 10
+    assert all(course_id != "c-7" for course_id, _ in index.search("python", limit=1500))
+    assert [c for c, _ in index.search("1499")] == ["c-1499"]
+
+
+def test_sync_follows_repository_changes():
+    index = CourseSearchIndex(store)
+    assert [c for c, _ in index.search("pandas")] == ["course-003"]
+
+    original = store.courses.get("course-002")
+    try:
+        store.courses.save(original.model_copy(update={
+            "title": "FastAPI with Pandas",
+            "updated_at": datetime.now(timezone.utc),
+        }))
+        assert {c for c, _ in index.search("pandas")} == {"course-002", "course-003"}
+    finally:
+        store.courses.save(original)
@@ -0,0 +1,37 @@
+import time
+
+from app.token_cache import TokenCache
+
+
+def test_evicts_least_recently_used():
+    cache = TokenCache(maxsize=2, ttl=60)
+    far = time.time() + 3600
+    cache.put("a", "l-1", far)
+    cache.put("b", "l-2", far)
+    cache.get("a")
+    cache.put("c", "l-3", far)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "l-1"
+    assert cache.get("c") == "l-3"
+
+
+def test_entry_expires_with_token():
+    cache = TokenCache(maxsize=10, ttl=60)
+    cache.put("a", "l-1", time.time() - 1)
+
+    assert cache.get("a") is None
+    assert cache.misses == 1
+
+
+def test_invalidate_learner_drops_all_their_tokens():
+    cache = TokenCache(maxsize=10, ttl=60)
+    far = time.time() + 3600
+    cache.put("a", "l-1", far)
+    cache.put("b", "l-1", far)
+    cache.put("c", "l-2", far)
+
+    cache.invalidate_learner("l-1")
+
+    assert len(cache) == 1
+    assert cache.get("c") == "l-2"
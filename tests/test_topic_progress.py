@@ -0,0 +1,91 @@
+import pytest
+
+from app.domain.course import Course, CourseLesson, CourseModule, CourseTopic
+from app.domain.learning_progress import LearningProgress, ProgressStatus
+from app.repository import store
+from app.topic_progress import CourseOutline, TopicProgressTracker
+
+
+def make_course(durations):
+    return Course(
+        course_id="big",
+        title="Big",
+        description="",
+        instructor_id="i-1",
+        modules=[CourseModule(title="M", order=1, lessons=[
+            CourseLesson(title="L", order=1, topics=[
+                CourseTopic(topic_id=f"t-{i}", title=f"T{i}", order=i,
+                            estimated_duration_minutes=minutes)
+                for i, minutes in enumerate(durations)
+            ]),
+        ])],
+    )
+
+
+def test_outline_weights_by_duration():
+    outline = CourseOutline(make_course([10, 30, None]))
+    assert outline.ordinals == {"t-0": 0, "t-1": 1, "t-2": 2}
+    assert (outline.weights, outline.total) == ([10, 30, 0], 40)
+    assert outline.full == b"\x07"
+
+    assert CourseOutline(make_course([None, None])).weights == [1, 1]
+
+
+def test_bitset_stays_compact_for_large_courses():
+    course = make_course([1] * 3000)
+    tracker = TopicProgressTracker(store)
+    for i in range(0, 3000, 2):
+        progress = tracker.complete("l-1", course, f"t-{i}")
+
+    assert len(progress.completed_topics) == 375
+    assert progress.completion_rate == pytest.approx(0.5)
+    for i in range(1, 3000, 2):
+        progress = tracker.complete("l-1", course, f"t-{i}")
+    assert progress.status == ProgressStatus.COMPLETED
+    assert progress.completion_rate == 1.0
+    assert len(store.progress.find_by("learner_id", "l-1")) == 1
+
+
+def test_completion_rate_is_derived_from_the_bitset():
+    course = make_course([10, 30, None, 60])
+    outline = CourseOutline(course)
+    assert outline.rate(b"") == 0.0
+    assert outline.rate(b"\x03") == pytest.approx(0.4)
+    # Bits past the end of the outline (topics since removed) do not count.
+    assert CourseOutline(make_course([None] * 3)).rate(b"\xff") == 1.0
+
+    tracker = TopicProgressTracker(store)
+    store.progress.save(LearningProgress(
+        progress_id="l-1-big", learner_id="l-1", course_id="big", completion_rate=0.9,
+    ))
+    progress = tracker.complete("l-1", course, "t-1")
+    assert progress.completion_rate == pytest.approx(0.3)
+
+    store.progress.save(progress.model_copy(update={"completion_rate": 0.05}))
+    progress = tracker.complete("l-1", course, "t-0")
+    assert progress.completion_rate == pytest.approx(0.4)
+    # Repeating a completion still repairs a rate that drifted from the bits.
+    store.progress.save(progress.model_copy(update={"completion_rate": 0.7}))
+    assert tracker.complete("l-1", course, "t-0").completion_rate == pytest.approx(0.4)
+
+
+def test_status_is_derived_from_the_bitset():
+    course = make_course([None, None])
+    tracker = TopicProgressTracker(store)
+    store.courses.save(course)
+    posted = tracker.derive(LearningProgress(
+        progress_id="l-1-big", learner_id="l-1", course_id="big",
+        completion_rate=1.0, status=ProgressStatus.COMPLETED,
+    ))
+    assert (posted.completion_rate, posted.status) == (0.0, ProgressStatus.IN_PROGRESS)
+
+    store.progress.save(posted.model_copy(update={"status": ProgressStatus.ON_HOLD}))
+    progress = tracker.complete("l-1", course, "t-0")
+    assert (progress.completion_rate, progress.status) == (0.5, ProgressStatus.ON_HOLD)
+    progress = tracker.complete("l-1", course, "t-1")
+    assert progress.status == ProgressStatus.COMPLETED
+    # An outline with no topics never counts as completed.
+    assert CourseOutline(make_course([])).settle(b"", ProgressStatus.IN_PROGRESS) == (
+        0.0, ProgressStatus.IN_PROGRESS,
+    )
+    store.courses.delete("big")